@@ -12,16 +12,22 @@ from views.runner_profile import render_runner_profile
 from views.fatigue_analysis import render_fatigue_analysis
 from views.pace_calculator import render_pace_calculator
 from views.statistics_modular import render_statistics
-import requests
 import json
-from utils.gist_helpers import load_gist_data, save_gist_data
+import copy
+from utils import http_client
+from utils.gist_helpers import pending_gist_sync_count
+from utils.gist_shards import read_user_domain, update_user_domain
 import io
 import certifi
 import urllib3
 from version import APP_VERSION, APP_VERSION_COLOR, APP_VERSION_STYLE
 import base64
 import os
-from utils.date_parser import safe_parse_date_series
+from utils.activity_store import read_activity_store
+from utils.activity_frame import build_activity_frame, format_memory_report
+from utils.workout_type_cache import get_workout_type_cache_stats
+from views.statistics_modules.figure_cache import get_figure_cache_stats
+from utils.sheet_sync import sync_activity_sheet
 
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -330,39 +336,10 @@ if not st.session_state.user_authenticated:
                         # Initialize user data
                         user_key = user_info["USER_KEY"]
                         gist_id = user_info["GIST_ID"]
-                        gist_filename = f"{user_key}.json"
                         github_token = st.secrets["GITHUB_TOKEN"]
-                        url = f"https://api.github.com/gists/{gist_id}"
-                        headers = {"Authorization": f"token {github_token}"}
-                        response = requests.get(url, headers=headers)
-                        if response.status_code == 200:
-                            gist = response.json()
-                            files = gist.get("files", {})
-                            file_obj = files.get(gist_filename)
-                            needs_init = False
-                            if not file_obj or not file_obj.get("content"):
-                                needs_init = True
-                            else:
-                                try:
-                                    content = json.loads(file_obj["content"])
-                                    if user_key not in content:
-                                        needs_init = True
-                                    else:
-                                        runner_profile = content[user_key].get("runner_profile", {})
-                                        st.session_state.user_info["runner_profile"] = runner_profile
-                                except Exception:
-                                    needs_init = True
-                            if needs_init:
-                                default_content = {
-                                    user_key: {
-                                        "races": [],
-                                        "training_plans": {},
-                                        "progress_feedback": {},
-                                        "runner_profile": {}
-                                    }
-                                }
-                                payload = {"files": {gist_filename: {"content": json.dumps(default_content, indent=2)}}}
-                                requests.patch(url, headers=headers, json=payload)
+                        # Reads the runner profile shard, splitting a legacy single-file document on first login
+                        runner_profile = read_user_domain(gist_id, github_token, user_key, "runner_profile", {})
+                        st.session_state.user_info["runner_profile"] = runner_profile
 
                     st.success("🎉 Welcome to your dashboard!")
                     st.balloons()
@@ -389,6 +366,9 @@ else:
     github_token = st.secrets["GITHUB_TOKEN"]
 
     st.sidebar.write(f"✅ Logged in as: **{user_info['name']}**")
+    pending_sync = pending_gist_sync_count(gist_id, github_token)
+    if pending_sync:
+        st.sidebar.caption(f"⏳ {pending_sync} change(s) pending sync")
     if st.sidebar.button("Logout"):
         # Clear all session state for clean logout
         for key in list(st.session_state.keys()):
@@ -402,21 +382,26 @@ else:
         st.rerun()
 
     @st.cache_data(ttl=600, show_spinner=False)
-    def load_data(sheet_url):
-        # TEMPORARY WORKAROUND: Disable SSL verification if needed
-        # WARNING: This is insecure and should only be used if you trust the data source/network
-        response = requests.get(sheet_url, verify=False)
-        response.raise_for_status()
-        df = pd.read_csv(io.StringIO(response.text))
-        df['Date'] = safe_parse_date_series(df['Date'], 'timestamp')
-        return df
+    def load_data(sheet_url, user_key, sync_token=None):
+        # sync_token is only part of the cache key: a new token re-syncs this user without dropping other users' frames
+        # Each cache miss is a delta check: only activities past the stored watermark are fetched and appended
+        df, _ = sync_activity_sheet(sheet_url)
+        # Typed once per data version; every view consumes this frame
+        return build_activity_frame(df, user_key)
 
     # Load data and define reference date
-    # Always reload data on login
+    # Always reload data on login; paint from the local store first when one exists
     if st.session_state.get('reload_data'):
-        df = load_data.__wrapped__(sheet_url)
+        df = read_activity_store(sheet_url)
+        if df is None:
+            # A fresh token is a cache miss, so the first sync always runs
+            st.session_state['data_sync_token'] = datetime.now().isoformat()
+            df, frame_report = load_data(sheet_url, user_key, st.session_state['data_sync_token'])
+        else:
+            df, frame_report = build_activity_frame(df, user_key)
+            st.session_state['pending_store_sync'] = True
     else:
-        df = load_data(sheet_url)
+        df, frame_report = load_data(sheet_url, user_key, st.session_state.get('data_sync_token'))
     st.session_state['reload_data'] = False
     today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
 
@@ -426,20 +411,37 @@ else:
 
     st.sidebar.markdown(f'<div style="position:fixed;bottom:1.5rem;left:0;width:100%;text-align:left;{APP_VERSION_STYLE}color:{APP_VERSION_COLOR};">v{APP_VERSION}</div>', unsafe_allow_html=True)
 
+    with st.sidebar.expander("⚙️ Diagnostics"):
+        st.caption(format_memory_report(frame_report))
+        type_cache = get_workout_type_cache_stats(user_key)
+        if type_cache:
+            lookups = type_cache['hits'] + type_cache['misses']
+            st.caption(f"Workout type cache: {type_cache['hit_rate']:.0%} hit rate "
+                       f"({type_cache['hits']:,} of {lookups:,} lookups, {type_cache['size']:,} activities)")
+        figure_cache = get_figure_cache_stats()
+        if figure_cache['hits'] + figure_cache['misses']:
+            st.caption(f"Chart cache: {figure_cache['hit_rate']:.0%} hit rate "
+                       f"({figure_cache['size']} of {figure_cache['maxsize']} figures)")
+        if 'race_planning_gist_reads' in st.session_state:
+            st.caption(f"Gist reads in the last race planning render: {st.session_state['race_planning_gist_reads']}")
+        latency_stats = http_client.get_latency_stats()
+        if not latency_stats.empty:
+            st.markdown("**🌐 Network latency**")
+            st.dataframe(latency_stats, hide_index=True, use_container_width=True)
+
 
     def save_user_profile_func(new_profile):
-        data = load_gist_data(gist_id, gist_filename, github_token)
-        if user_key not in data:
-            data[user_key] = {"races": [], "training_plans": {}, "progress_feedback": {}}
-        user_data = data[user_key]
-        user_data["runner_profile"] = new_profile
-        data[user_key] = user_data
-        save_gist_data(gist_id, gist_filename, github_token, data)
+        profile = copy.deepcopy(new_profile)
+
+        def mutation(shard):
+            shard["runner_profile"] = copy.deepcopy(profile)
+
+        update_user_domain(gist_id, github_token, user_key, "runner_profile", mutation)
         st.session_state.user_info["runner_profile"] = new_profile
 
     # Render views based on selected section
     if view == "📈 Statistics":
-        render_statistics(df, today)
+        render_statistics(df, today, frame_report.get('data_version'))
 
     elif view == "📂 Activities":
         render_activities(df, user_info, gist_id, gist_filename, github_token)
@@ -460,3 +462,10 @@ else:
 
     elif view == "📊 Fatigue Analysis":
         render_fatigue_analysis(df, today, user_info, gist_id, gist_filename, github_token)
+
+    # Refresh the local store after the first paint of a login, then rerun if the sheet changed
+    if st.session_state.pop('pending_store_sync', False):
+        st.session_state['data_sync_token'] = datetime.now().isoformat()
+        _, synced_report = load_data(sheet_url, user_key, st.session_state['data_sync_token'])
+        if synced_report['data_version'] != frame_report['data_version']:
+            st.rerun()
@@ -0,0 +1,117 @@
+"""
+Benchmark for utils.date_parser.safe_parse_date_series.
+
+Compares the vectorized parser against the previous per-element loop on
+synthetic activity date columns (mostly ISO dates with a sprinkling of
+European dates, blanks and junk, like a real sheet export).
+
+Run from the repository root:
+    python benchmarks/date_parser_benchmark.py
+    python benchmarks/date_parser_benchmark.py --sizes 10000 100000 1000000 --max-legacy-rows 100000
+
+The legacy loop is only timed up to --max-legacy-rows; larger sizes are
+extrapolated linearly from the largest measured run and marked with '~'.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.date_parser import safe_parse_date, safe_parse_date_series
+
+
+def legacy_safe_parse_date_series(series, return_type='timestamp'):
+    """The previous implementation: one safe_parse_date call per value."""
+    result = pd.Series(index=series.index, dtype='object')
+    for idx, value in series.items():
+        result.iloc[idx] = safe_parse_date(value, return_type)
+    if return_type == 'timestamp':
+        return pd.to_datetime(result, errors='coerce')
+    return result
+
+
+def make_date_column(n_rows, seed=42):
+    """Build a date column resembling a sheet export."""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp('2019-01-01') + pd.to_timedelta(rng.integers(0, 6 * 365, n_rows), unit='D')
+    values = pd.Series(dates.strftime('%Y-%m-%d'), dtype='object')
+
+    kinds = rng.random(n_rows)
+    european = kinds < 0.02
+    values[european] = dates[european].strftime('%d/%m/%Y')
+    values[(kinds >= 0.02) & (kinds < 0.03)] = np.nan
+    values[(kinds >= 0.03) & (kinds < 0.035)] = 'n/a'
+    return values
+
+
+# Small columns the vectorized parser must parse like the legacy loop, as (name, values, return_type)
+EQUIVALENCE_CASES = [
+    ('iso with blanks', ['2024-01-01', None, '', '2024-02-29', 'n/a'], 'timestamp'),
+    ('iso and european', ['2024-01-01', '2024-01-02', '15/01/2024', '2024-01-04'], 'date'),
+    # Timezone-aware ISO values among naive dates keep their wall-clock date
+    ('iso with tz-aware values', [
+        '2024-01-01', '2024-01-02', '2024-01-03T10:00:00Z', '2024-01-04',
+        '2024-01-05T08:30:00+02:00', None, 'junk',
+    ], 'date'),
+]
+
+
+def check_equivalence():
+    """Assert that both implementations agree on EQUIVALENCE_CASES."""
+    for name, values, return_type in EQUIVALENCE_CASES:
+        column = pd.Series(values, dtype='object')
+        result = safe_parse_date_series(column, return_type)
+        expected = legacy_safe_parse_date_series(column, return_type)
+        assert result.tolist() == expected.tolist(), f"{name}: {result.tolist()} != {expected.tolist()}"
+        # The timestamp form must stay a datetime column
+        assert pd.api.types.is_datetime64_dtype(safe_parse_date_series(column, 'timestamp')), name
+    print(f"{len(EQUIVALENCE_CASES)} equivalence cases match the legacy loop")
+
+
+def time_call(func, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--max-legacy-rows', type=int, default=100_000)
+    args = parser.parse_args()
+
+    check_equivalence()
+    print(f"{'rows':>10} {'legacy (s)':>12} {'vectorized (s)':>15} {'speedup':>9}")
+    legacy_rate = None
+    for n_rows in args.sizes:
+        column = make_date_column(n_rows)
+
+        vectorized = time_call(safe_parse_date_series, column)
+        if n_rows <= args.max_legacy_rows:
+            legacy = time_call(legacy_safe_parse_date_series, column, repeat=1)
+            legacy_rate = legacy / n_rows
+            legacy_label = f"{legacy:12.3f}"
+            # Sanity check: both implementations agree
+            pd.testing.assert_series_equal(
+                safe_parse_date_series(column), legacy_safe_parse_date_series(column), check_names=False
+            )
+        elif legacy_rate is not None:
+            legacy = legacy_rate * n_rows
+            legacy_label = f"{'~' + format(legacy, '.3f'):>12}"
+        else:
+            legacy = float('nan')
+            legacy_label = f"{'-':>12}"
+
+        print(f"{n_rows:>10} {legacy_label} {vectorized:15.3f} {legacy / vectorized:8.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark and equivalence check for the vectorized time/pace parsers in
+utils.duration_parser.
+
+Before timing anything, the script checks that the vectorized parsers agree
+with the scalar reference parsers (None == NaN) on randomly generated values.
+The values mix well-formed times and paces with signs, padding, non-ASCII
+digits, extra colons, blanks, numbers and junk. Then it times both on
+synthetic 'Moving Time' and 'Pace (min/km)' columns.
+
+Run from the repository root:
+    python benchmarks/duration_parser_benchmark.py
+    python benchmarks/duration_parser_benchmark.py --sizes 10000 100000 --check-samples 200000 --seed 7
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.duration_parser import (
+    parse_time_to_minutes,
+    parse_pace_to_minutes,
+    parse_time_series_to_minutes,
+    parse_pace_series_to_minutes,
+)
+
+PARSERS = {
+    'time': (parse_time_to_minutes, parse_time_series_to_minutes),
+    'pace': (parse_pace_to_minutes, parse_pace_series_to_minutes),
+}
+
+# Building blocks for random values: boundary numbers for the > 24 heuristic,
+# signs and padding that int() accepts, and shapes it rejects
+ATOMS = ['0', '5', '24', '25', '59', '07', '120', '+3', '-2', ' 4', '4 ', '٣', '1_0',
+         'x', '', '1.5', '.5', '7.', '1e3', 'nan', 'inf']
+SPECIAL_VALUES = [None, np.nan, '', '-', ' - ', '  ', 45, 5.5, True]
+
+
+def random_value(rng):
+    if rng.random() < 0.1:
+        return rng.choice(SPECIAL_VALUES)
+    return ':'.join(rng.choice(ATOMS) for _ in range(rng.randint(1, 4)))
+
+
+def check_equivalence(n_samples, seed):
+    """Compare vectorized and scalar parsers on random values; raise on the first mismatch."""
+    rng = random.Random(seed)
+    values = [random_value(rng) for _ in range(n_samples)]
+    # Duplicate index labels on purpose: results must stay aligned
+    series = pd.Series(values, index=[i % 7 for i in range(n_samples)], dtype=object)
+
+    for name, (scalar, vectorized) in PARSERS.items():
+        expected = np.array([np.nan if (v := scalar(value)) is None else v for value in values], dtype='float64')
+        actual = vectorized(series).to_numpy()
+        same = (actual == expected) | (np.isnan(actual) & np.isnan(expected))
+        if not same.all():
+            i = int(np.flatnonzero(~same)[0])
+            raise AssertionError(f"{name}: {values[i]!r} -> {actual[i]!r}, scalar gives {expected[i]!r}")
+        print(f"{name}: {n_samples:,} random values identical to the scalar parser")
+
+
+def make_columns(n_rows, seed=42):
+    """Moving Time (mostly MM:SS:00, some HH:MM:SS) and Pace (M:SS) columns like a sheet export."""
+    rng = np.random.default_rng(seed)
+    minutes = rng.integers(15, 200, n_rows)
+    seconds = rng.integers(0, 60, n_rows)
+    hours_style = rng.random(n_rows) < 0.1
+    moving = np.where(
+        hours_style,
+        [f"{m // 60}:{m % 60:02d}:{s:02d}" for m, s in zip(minutes, seconds)],
+        [f"{m}:{s:02d}:00" for m, s in zip(minutes, seconds)],
+    )
+    pace = [f"{m}:{s:02d}" for m, s in zip(rng.integers(4, 8, n_rows), rng.integers(0, 60, n_rows))]
+    moving = pd.Series(moving, dtype=object)
+    pace = pd.Series(pace, dtype=object)
+    blanks = rng.random(n_rows) < 0.02
+    moving[blanks] = '-'
+    pace[blanks] = np.nan
+    return moving, pace
+
+
+def time_call(func, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--check-samples', type=int, default=50_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    check_equivalence(args.check_samples, args.seed)
+    print()
+
+    print(f"{'column':>8} {'rows':>10} {'apply (s)':>10} {'vectorized (s)':>15} {'speedup':>8} {'rows/s':>12}")
+    for n_rows in args.sizes:
+        moving, pace = make_columns(n_rows)
+        for name, column in (('time', moving), ('pace', pace)):
+            scalar, vectorized = PARSERS[name]
+            legacy = time_call(column.apply, scalar, repeat=1)
+            fast = time_call(vectorized, column)
+            print(f"{name:>8} {n_rows:>10} {legacy:10.3f} {fast:15.3f} {legacy / fast:7.1f}x {n_rows / fast:12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+Check utils.gist_client against a local stand-in for the GitHub gist API.
+
+The stand-in is an http.server on localhost that serves one gist with ETags
+(answering If-None-Match with 304) and applies PATCHes to its files. The
+script runs the client through:
+
+- a first read (200) and a revalidation of the unchanged gist (304)
+- several updates inside the debounce window, sent as a single PATCH
+- a revalidation whose GET is answered after a PATCH from the same client
+  landed; the edit must survive the stale response
+- a change made on the server by someone else, picked up by the next read
+
+Run from the repository root:
+    python benchmarks/gist_client_standin.py
+
+Exits with status 1 when a check fails.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.gist_client import GistClient
+
+GIST_ID = "standin"
+FILENAME = "user.json"
+
+
+class GistStandIn:
+    """In-memory gist with request counters and an optional delay on GET responses."""
+
+    def __init__(self):
+        self.files = {FILENAME: json.dumps({"races": []})}
+        self.lock = threading.Lock()
+        self.counts = {"get_200": 0, "get_304": 0, "patch": 0}
+        self.get_delay = 0.0
+
+    def etag(self):
+        return '"' + hashlib.sha1(json.dumps(self.files, sort_keys=True).encode("utf-8")).hexdigest() + '"'
+
+    def snapshot(self):
+        with self.lock:
+            return self.etag(), {"files": {name: {"content": content} for name, content in self.files.items()}}
+
+    def handler(self):
+        gist = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, status, body=None, etag=None):
+                payload = json.dumps(body).encode("utf-8") if body is not None else b""
+                self.send_response(status)
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                # The response is the state when the request arrived, however late it is sent
+                etag, body = gist.snapshot()
+                time.sleep(gist.get_delay)
+                if self.headers.get("If-None-Match") == etag:
+                    gist.counts["get_304"] += 1
+                    self._send(304, etag=etag)
+                    return
+                gist.counts["get_200"] += 1
+                self._send(200, body, etag)
+
+            def do_PATCH(self):
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with gist.lock:
+                    for name, file_obj in request.get("files", {}).items():
+                        gist.files[name] = file_obj["content"]
+                    gist.counts["patch"] += 1
+                etag, body = gist.snapshot()
+                self._send(200, body, etag)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def wait_for_flush(client, timeout=5.0):
+    deadline = time.time() + timeout
+    while client.pending_count and time.time() < deadline:
+        time.sleep(0.02)
+
+
+def run_checks(debounce):
+    gist = GistStandIn()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), gist.handler())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_base = f"http://127.0.0.1:{server.server_address[1]}"
+    client = GistClient(GIST_ID, "token", api_base=api_base, debounce_seconds=debounce)
+    results = []
+
+    def check(name, ok):
+        results.append(ok)
+        print(f"{'PASS' if ok else 'FAIL'}  {name}")
+
+    try:
+        client.read(FILENAME)
+        client.read(FILENAME)
+        check("first read downloads, revalidation is a 304", gist.counts["get_200"] == 1 and gist.counts["get_304"] == 1)
+
+        for race in ("10k", "half", "marathon"):
+            client.update(FILENAME, lambda doc, race=race: doc.setdefault("races", []).append(race))
+        wait_for_flush(client)
+        stored = json.loads(gist.files[FILENAME])["races"]
+        check("three updates sent in one PATCH", gist.counts["patch"] == 1 and stored == ["10k", "half", "marathon"])
+
+        # Another writer adds a file, so the GET below gets a full response; it reads the
+        # server before the PATCH of "ultra" lands and answers after it
+        with gist.lock:
+            gist.files["other.json"] = json.dumps({"note": "added elsewhere"})
+        gist.get_delay = debounce * 4
+        client.update(FILENAME, lambda doc: doc.setdefault("races", []).append("ultra"))
+        reader = threading.Thread(target=client.refresh)
+        reader.start()
+        wait_for_flush(client)
+        reader.join()
+        gist.get_delay = 0.0
+        in_memory = client.read(FILENAME, revalidate=False)["races"]
+        check("edit survives a GET that started before its PATCH", in_memory[-1:] == ["ultra"])
+        check("files only on the server are still loaded", client.read("other.json", revalidate=False) == {"note": "added elsewhere"})
+
+        with gist.lock:
+            gist.files[FILENAME] = json.dumps({"races": ["edited elsewhere"]})
+        check("server-side change is picked up", client.read(FILENAME)["races"] == ["edited elsewhere"])
+    finally:
+        server.shutdown()
+
+    print(f"Requests: {gist.counts['get_200']} full GET, {gist.counts['get_304']} 304, {gist.counts['patch']} PATCH")
+    return all(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--debounce", type=float, default=0.2, help="Client debounce window in seconds")
+    args = parser.parse_args()
+    sys.exit(0 if run_checks(args.debounce) else 1)
+
+
+if __name__ == "__main__":
+    main()
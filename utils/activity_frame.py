@@ -0,0 +1,134 @@
+"""
+Canonical typed activity frame, built once per data version.
+
+The raw sheet frame is mostly object columns. Every view used to re-derive
+the same numeric columns from it on each rerun. build_activity_frame() does
+that once at ingest:
+
+- Date                                      datetime64
+- Distance (km), Elevation Gain, HR, ...    float64 (shown as-is in tables and cards,
+                                            where float32 would print as 10.300000190734863)
+- Type, Sport Type, Workout Type            category
+- moving_time_minutes, pace_minutes         float32, parsed (vectorized) from
+                                            the 'Moving Time' / 'Pace (min/km)' text;
+                                            only aggregated or formatted, never shown raw
+- detected_workout_type                     category (utils.workout_classifier; with a
+                                            user_key, only activities not in that user's
+                                            utils.workout_type_cache are classified)
+
+The original text columns are kept untouched for display. The returned
+report has the memory footprint before and after, and a content hash of the
+frame ('data_version') that downstream caches can key on.
+
+Usage:
+    from utils.activity_frame import build_activity_frame, is_activity_frame
+
+    df, report = build_activity_frame(raw_df, user_key)
+    report["bytes_before"], report["bytes_after"]
+"""
+
+import hashlib
+
+import pandas as pd
+
+from utils.date_parser import safe_parse_date_series
+from utils.duration_parser import parse_time_series_to_minutes, parse_pace_series_to_minutes
+from utils.workout_classifier import classify_workout_types
+from utils.workout_type_cache import cached_workout_types
+
+# Always coerced to numbers, as the views already did with pd.to_numeric(errors='coerce')
+CORE_NUMERIC_COLUMNS = ['Distance (km)', 'Elevation Gain', 'Avg HR', 'Max HR']
+# Downcast only when every non-empty value is numeric
+OPTIONAL_NUMERIC_COLUMNS = [
+    'Cadence', 'Calories', 'Power (W)', 'Weighted Power', 'Elev Low', 'Elev High',
+    'Elapsed Time (min)', 'Duration (hrs)', 'IF', 'TSS',
+]
+CATEGORICAL_COLUMNS = ['Type', 'Sport Type', 'Workout Type']
+DERIVED_COLUMNS = {
+    'moving_time_minutes': ('Moving Time', parse_time_series_to_minutes),
+    'pace_minutes': ('Pace (min/km)', parse_pace_series_to_minutes),
+}
+EMPTY_MARKERS = ('', '-')
+
+
+def is_activity_frame(df):
+    """True if `df` already went through build_activity_frame()."""
+    return all(col in df.columns for col in DERIVED_COLUMNS) and pd.api.types.is_float_dtype(df['pace_minutes'])
+
+
+def data_version(df, columns=None):
+    """
+    Content hash of a frame, or of the given columns of it (the ones missing from df are skipped).
+
+    Row order counts: caches keyed on it may hold per-row arrays, so only
+    frames with equal rows in the same order get equal versions.
+    """
+    if columns is not None:
+        df = df[[col for col in columns if col in df.columns]]
+    digest = hashlib.sha1('\x1f'.join(map(str, df.columns)).encode('utf-8'))
+    if len(df.columns):
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return f"{len(df)}-{digest.hexdigest()[:24]}"
+
+
+def _to_float(series, strict):
+    numeric = pd.to_numeric(series, errors='coerce')
+    if strict:
+        lost = numeric.isna() & series.notna() & ~series.astype(str).str.strip().isin(EMPTY_MARKERS)
+        if lost.any():
+            return series
+    return numeric.astype('float64')
+
+
+def build_activity_frame(df, user_key=None):
+    """
+    Build the canonical typed activity frame.
+
+    Args:
+        df: Raw activity DataFrame as read from the sheet or the local store
+        user_key: Owner of the workout type cache to reuse labels from (None classifies every row)
+
+    Returns:
+        Tuple of (typed DataFrame, report dict with rows, bytes_before, bytes_after, data_version)
+    """
+    bytes_before = int(df.memory_usage(deep=True).sum())
+    frame = df.copy()
+
+    if 'Date' in frame.columns and not pd.api.types.is_datetime64_any_dtype(frame['Date']):
+        frame['Date'] = safe_parse_date_series(frame['Date'], 'timestamp')
+
+    for col in CORE_NUMERIC_COLUMNS:
+        if col in frame.columns:
+            frame[col] = _to_float(frame[col], strict=False)
+    for col in OPTIONAL_NUMERIC_COLUMNS:
+        if col in frame.columns:
+            frame[col] = _to_float(frame[col], strict=True)
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in frame.columns:
+            frame[col] = frame[col].astype('category')
+
+    for target, (source, parser) in DERIVED_COLUMNS.items():
+        if source in frame.columns:
+            frame[target] = parser(frame[source]).astype('float32')
+
+    if user_key is None:
+        frame['detected_workout_type'] = classify_workout_types(frame)
+    else:
+        frame['detected_workout_type'] = cached_workout_types(frame, user_key)
+
+    report = {
+        'rows': int(len(frame)),
+        'bytes_before': bytes_before,
+        'bytes_after': int(frame.memory_usage(deep=True).sum()),
+        'data_version': data_version(frame),
+    }
+    return frame, report
+
+
+def format_memory_report(report):
+    """One-line summary of a build_activity_frame() report."""
+    before, after = report['bytes_before'], report['bytes_after']
+    ratio = after / before * 100 if before else 100.0
+    return (f"Activity frame: {report['rows']:,} rows, "
+            f"{before / 1024 / 1024:.2f} MB → {after / 1024 / 1024:.2f} MB ({ratio:.0f}% of raw)")
@@ -0,0 +1,210 @@
+"""
+Local columnar store for the activity log.
+
+The published Google Sheet is downloaded as CSV, parsed once and persisted as
+uncompressed Arrow IPC (Feather v2) segments under a directory keyed by the
+sheet URL. Reads memory-map the segments, so the dashboard can paint from
+disk without re-downloading and re-parsing the whole sheet. New activities are
+written as additional segments; once too many segments accumulate the store
+is compacted back into a single file.
+
+Layout:
+    <STORE_ROOT>/<sha1(sheet_url)[:16]>/
+        manifest.json
+        segment-00000.arrow
+        segment-00001.arrow
+        ...
+
+Syncing with the sheet lives in utils.sheet_sync; this module only stores.
+
+Usage:
+    from utils.activity_store import read_activity_store, append_to_activity_store
+
+    df = read_activity_store(sheet_url)            # None if nothing stored yet
+    append_to_activity_store(sheet_url, df_new)    # persist newly ingested rows
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+STORE_ROOT = os.environ.get(
+    "RUNTRACKER_STORE_DIR",
+    os.path.join(os.path.expanduser("~"), ".runtracker", "activity_store"),
+)
+MAX_SEGMENTS = 16
+MANIFEST_NAME = "manifest.json"
+
+_store_lock = threading.Lock()
+
+
+def get_store_dir(sheet_url, root=None):
+    """Return the directory holding the store for a sheet URL."""
+    key = hashlib.sha1(sheet_url.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(root or STORE_ROOT, key)
+
+
+def _read_manifest(store_dir):
+    path = os.path.join(store_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError) as e:
+        print(f"[activity_store] Ignoring unreadable manifest {path}: {e}")
+        return None
+
+
+def _write_manifest(store_dir, manifest):
+    path = os.path.join(store_dir, MANIFEST_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2)
+    os.replace(tmp_path, path)
+
+
+def read_store_manifest(sheet_url, root=None):
+    """Return the manifest for a sheet's store, or None if nothing is stored yet."""
+    return _read_manifest(get_store_dir(sheet_url, root))
+
+
+def _to_arrow_table(df):
+    """Convert a frame to an Arrow table, stringifying mixed object columns."""
+    df = df.reset_index(drop=True)
+    for col in df.columns:
+        if df[col].dtype == object:
+            values = df[col]
+            df[col] = values.where(values.isna(), values.astype(str))
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def _from_arrow_table(table):
+    """Convert an Arrow table back to the frame shape `pd.read_csv` produces."""
+    df = table.to_pandas()
+    for col in df.columns:
+        if df[col].dtype == object:
+            # Arrow nulls come back as None; the rest of the app expects NaN
+            df[col] = df[col].where(df[col].notna(), np.nan)
+    return df
+
+
+def _write_segment(store_dir, index, df):
+    name = f"segment-{index:05d}.arrow"
+    path = os.path.join(store_dir, name)
+    tmp_path = path + ".tmp"
+    # Uncompressed so that reads can memory-map the buffers directly
+    feather.write_feather(_to_arrow_table(df), tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+    return name
+
+
+def _remove_segments(store_dir, names):
+    for name in names:
+        try:
+            os.remove(os.path.join(store_dir, name))
+        except OSError:
+            pass
+
+
+def read_activity_store(sheet_url, root=None):
+    """
+    Read the stored activity log for a sheet.
+
+    Args:
+        sheet_url: Published CSV URL of the activity sheet
+        root: Optional store root directory (defaults to STORE_ROOT)
+
+    Returns:
+        DataFrame with all stored activities, or None if nothing is stored
+    """
+    store_dir = get_store_dir(sheet_url, root)
+    manifest = _read_manifest(store_dir)
+    if not manifest or not manifest.get("segments"):
+        return None
+
+    frames = []
+    try:
+        for name in manifest["segments"]:
+            table = feather.read_table(os.path.join(store_dir, name), memory_map=True)
+            frames.append(_from_arrow_table(table))
+    except (OSError, pa.ArrowInvalid) as e:
+        print(f"[activity_store] Failed to read store for {sheet_url}: {e}")
+        return None
+
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
+
+
+def write_activity_store(sheet_url, df, root=None, sync_state=None):
+    """
+    Replace the stored activity log with `df` as a single segment.
+
+    `sync_state` is an optional dict kept in the manifest for the sync engine
+    (watermarks, validators); the previous value is kept when omitted.
+    """
+    store_dir = get_store_dir(sheet_url, root)
+    with _store_lock:
+        os.makedirs(store_dir, exist_ok=True)
+        old_manifest = _read_manifest(store_dir) or {}
+        old_segments = old_manifest.get("segments", [])
+        next_index = old_manifest.get("next_segment", 0)
+
+        name = _write_segment(store_dir, next_index, df)
+        manifest = {
+            "sheet_url": sheet_url,
+            "columns": list(df.columns),
+            "segments": [name],
+            "next_segment": next_index + 1,
+            "row_count": int(len(df)),
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+            "sync": sync_state if sync_state is not None else old_manifest.get("sync", {}),
+        }
+        _write_manifest(store_dir, manifest)
+        _remove_segments(store_dir, old_segments)
+    return manifest
+
+
+def append_to_activity_store(sheet_url, df_new, root=None, sync_state=None):
+    """
+    Append new activities to the store as a new segment.
+
+    Compacts the store into a single segment once it holds more than
+    MAX_SEGMENTS segments.
+    """
+    store_dir = get_store_dir(sheet_url, root)
+    with _store_lock:
+        manifest = _read_manifest(store_dir)
+    if not manifest:
+        return write_activity_store(sheet_url, df_new, root, sync_state)
+
+    if df_new is None or df_new.empty:
+        if sync_state is not None:
+            with _store_lock:
+                manifest["sync"] = sync_state
+                _write_manifest(store_dir, manifest)
+        return manifest
+
+    if len(manifest["segments"]) >= MAX_SEGMENTS:
+        existing = read_activity_store(sheet_url, root)
+        combined = pd.concat([existing, df_new], ignore_index=True)
+        return write_activity_store(sheet_url, combined, root, sync_state)
+
+    with _store_lock:
+        name = _write_segment(store_dir, manifest["next_segment"], df_new)
+        manifest["segments"].append(name)
+        manifest["next_segment"] += 1
+        manifest["row_count"] += int(len(df_new))
+        manifest["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        if sync_state is not None:
+            manifest["sync"] = sync_state
+        _write_manifest(store_dir, manifest)
+    return manifest
@@ -16,6 +16,10 @@ Usage:
     
     # Parse pandas series/column
     df['Date'] = safe_parse_date_series(df['Date'])
+
+String inputs are memoized in a process-wide bounded LRU keyed by
+(string, return_type), so each distinct date string is parsed once per
+process; see get_date_parse_cache_stats().
 """
 
 import pandas as pd
@@ -23,6 +27,11 @@ from datetime import datetime, date
 import warnings
 from typing import Union, Optional
 import re
+from utils.lru_cache import BoundedLRUCache
+
+# Parsed results for date strings, shared by every caller in the process
+DATE_PARSE_CACHE_SIZE = 4096
+_date_parse_cache = BoundedLRUCache(maxsize=DATE_PARSE_CACHE_SIZE)
 
 def detect_date_format(date_str: str) -> Optional[str]:
     """
@@ -113,6 +122,14 @@ def safe_parse_date(date_input: Union[str, date, datetime, pd.Timestamp, None],
     if not date_input:
         return None
     
+    # Parsed values (date, datetime, Timestamp) are immutable, so they can be shared safely
+    return _date_parse_cache.get_or_compute(
+        (date_input, return_type),
+        lambda: _parse_date_string(date_input, return_type)
+    )
+
+def _parse_date_string(date_input: str, return_type: str) -> Optional[Union[date, datetime, pd.Timestamp]]:
+    """Parse a stripped, non-empty date string (uncached; use safe_parse_date)."""
     # Try detecting format first
     detected_format = detect_date_format(date_input)
     if detected_format:
@@ -173,10 +190,65 @@ def safe_parse_date(date_input: Union[str, date, datetime, pd.Timestamp, None],
     
     return None
 
+def get_date_parse_cache_stats() -> dict:
+    """Return size and hit/miss counters of the shared date parse cache."""
+    return _date_parse_cache.stats()
+
+def clear_date_parse_cache() -> None:
+    """Empty the shared date parse cache and reset its counters."""
+    _date_parse_cache.clear()
+
+def detect_dominant_format(series: pd.Series, sample_size: int = 200) -> Optional[str]:
+    """
+    Detect the most common date format in a Series from a sample of its values.
+    
+    Args:
+        series: Pandas Series of date strings
+        sample_size: Maximum number of non-null values to inspect
+        
+    Returns:
+        Format string for strptime or None if no sampled value is recognized
+    """
+    sample = series.dropna()
+    if sample.empty:
+        return None
+    if len(sample) > sample_size:
+        # Spread the sample over the whole column so a format change part-way through is seen
+        step = len(sample) // sample_size
+        sample = sample.iloc[::step]
+    
+    formats = sample.astype(str).map(detect_date_format).dropna()
+    if formats.empty:
+        return None
+    return formats.value_counts().index[0]
+
+def _to_naive(ts: Optional[pd.Timestamp]) -> Optional[pd.Timestamp]:
+    """Drop the timezone of a parsed timestamp, keeping its wall-clock time."""
+    if ts is None or pd.isna(ts) or ts.tzinfo is None:
+        return ts
+    return ts.tz_localize(None)
+
+def _timestamps_to_return_type(parsed: pd.Series, return_type: str) -> pd.Series:
+    """Convert a datetime64 Series to the representation safe_parse_date would return."""
+    if return_type == 'timestamp':
+        return parsed
+    if return_type == 'date':
+        return parsed.dt.date.where(parsed.notna(), None)
+    # 'datetime': plain Python datetimes, None where parsing failed
+    return pd.Series(
+        [ts.to_pydatetime() if not pd.isna(ts) else None for ts in parsed],
+        index=parsed.index,
+        dtype='object'
+    )
+
 def safe_parse_date_series(series: pd.Series, return_type: str = 'timestamp') -> pd.Series:
     """
     Safely parse a pandas Series of dates.
     
+    The dominant format is detected once from a sample and the whole column is
+    parsed with a single vectorized `pd.to_datetime` call. Only values that do
+    not match that format fall back to `safe_parse_date`, once per distinct value.
+    
     Args:
         series: Pandas Series containing dates in various formats
         return_type: 'date', 'datetime', or 'timestamp'
@@ -187,21 +259,31 @@ def safe_parse_date_series(series: pd.Series, return_type: str = 'timestamp') ->
     if series is None or series.empty:
         return series
     
-    # Create result series
-    result = pd.Series(index=series.index, dtype='object')
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return _timestamps_to_return_type(series, return_type)
     
-    for idx, value in series.items():
-        parsed = safe_parse_date(value, return_type)
-        result.iloc[idx] = parsed
+    present = series.notna()
+    strings = series.where(~present, series.astype(str).str.strip())
     
-    # Convert to appropriate pandas dtype if possible
-    if return_type == 'timestamp':
-        try:
-            return pd.to_datetime(result, errors='coerce')
-        except Exception:
-            return result
+    dominant_format = detect_dominant_format(strings[present])
+    if dominant_format:
+        parsed = pd.to_datetime(strings, format=dominant_format, errors='coerce')
+    else:
+        parsed = pd.Series(pd.NaT, index=series.index, dtype='datetime64[ns]')
+    
+    # Per-element fallback only for values the dominant format could not parse
+    failed = parsed.isna() & present & (strings != '')
+    if failed.any():
+        # Timezone-aware values (e.g. '2024-01-03T10:00:00Z') keep their wall-clock time, so they fit the naive column
+        fallback = {
+            value: _to_naive(safe_parse_date(value, 'timestamp'))
+            for value in pd.unique(series[failed])
+        }
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            parsed[failed] = pd.to_datetime(series[failed].map(fallback), errors='coerce')
     
-    return result
+    return _timestamps_to_return_type(parsed, return_type)
 
 def format_date_for_display(date_obj: Union[date, datetime, pd.Timestamp, str, None], 
                            format_type: str = 'iso') -> str:
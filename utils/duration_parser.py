@@ -0,0 +1,191 @@
+"""
+Duration and pace parsing for activity data.
+
+The scalar parsers are the reference behaviour. The *_series variants parse
+a whole column and give identical results (None becomes NaN). They parse
+each distinct value once: plain ASCII shapes with Arrow string kernels, and
+anything else with the scalar parser.
+
+Usage:
+    from utils.duration_parser import parse_time_to_minutes, parse_pace_to_minutes
+
+    parse_time_to_minutes("45:30:00")  # 45.5 (MM:SS:00 when the first part > 24)
+    parse_pace_to_minutes("5:30")      # 5.5
+
+    df['moving_time_minutes'] = parse_time_series_to_minutes(df['Moving Time'])
+    df['pace_minutes'] = parse_pace_series_to_minutes(df['Pace (min/km)'])
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Shapes the vectorized path handles itself; everything else (signs, non-ASCII
+# digits, exponents, huge numbers...) goes to the scalar parser. Patterns are
+# RE2 (Arrow) syntax and anchored on the whole string.
+def _int_group(name):
+    return rf'\s*(?P<{name}>[0-9]{{1,9}})\s*'
+
+
+_TIME_HMS_PATTERN = rf'^{_int_group("a")}:{_int_group("b")}:{_int_group("c")}$'
+_TIME_MS_PATTERN = rf'^{_int_group("a")}:{_int_group("b")}$'
+_PACE_MS_PATTERN = rf'^{_int_group("a")}:{_int_group("b")}(?::.*)?$'
+_DECIMAL_PATTERN = r'^\s*(?P<a>[0-9]{1,15}\.?[0-9]*|\.[0-9]+)\s*$'
+
+
+def parse_time_to_minutes(time_str):
+    """Convert time string to minutes
+    
+    Handles multiple formats:
+    - MM:SS:00 (minutes:seconds:centiseconds) - common in running data
+    - HH:MM:SS (hours:minutes:seconds) - for very long activities
+    - MM:SS (minutes:seconds)
+    - Numeric values (already in minutes)
+    """
+    if pd.isna(time_str) or time_str == '' or time_str == '-':
+        return None
+    try:
+        if isinstance(time_str, str):
+            parts = time_str.split(':')
+            if len(parts) == 3:
+                # Check if this looks like MM:SS:00 format (common in running data)
+                # If first part > 24, it's likely minutes, not hours
+                first_part = int(parts[0])
+                if first_part > 24:  # Likely MM:SS:00 format
+                    return first_part + int(parts[1]) / 60 + int(parts[2]) / 3600
+                else:  # Traditional HH:MM:SS format
+                    return first_part * 60 + int(parts[1]) + int(parts[2]) / 60
+            elif len(parts) == 2:  # MM:SS
+                return int(parts[0]) + int(parts[1]) / 60
+        return float(time_str)
+    except:
+        return None
+
+
+def parse_pace_to_minutes(pace_input):
+    """Convert pace input to minutes per km (handles both min:sec and decimal formats)
+    
+    Input formats supported:
+    - "5:30" -> 5.5 minutes
+    - "6:15" -> 6.25 minutes  
+    - 5.5 -> 5.5 minutes (decimal)
+    - 6.25 -> 6.25 minutes (decimal)
+    """
+    if pd.isna(pace_input) or pace_input == '' or pace_input == '-':
+        return None
+    try:
+        if isinstance(pace_input, str) and ':' in pace_input:
+            # Handle min:sec format (e.g., "5:30")
+            parts = pace_input.split(':')
+            minutes = int(parts[0])
+            seconds = int(parts[1])
+            return minutes + seconds / 60.0
+        else:
+            # Handle decimal format (e.g., 5.5) or numeric input
+            return float(pace_input)
+    except:
+        return None
+
+
+def _extract(strings, pattern):
+    """Match `pattern` against an Arrow string array; return (mask, matched groups as a struct array)."""
+    matched = pc.extract_regex(strings, pattern)
+    mask = matched.is_valid().to_numpy(zero_copy_only=False)
+    return mask, matched.filter(pa.array(mask))
+
+
+def _group(matched, name, type_=pa.int64()):
+    return pc.cast(pc.struct_field(matched, [name]), type_).to_numpy()
+
+
+def _fill_decimals(strings, parsed):
+    """Parse plain decimal numbers (what float() would accept) into the still-unset slots."""
+    mask, matched = _extract(strings, _DECIMAL_PATTERN)
+    mask &= np.isnan(parsed)
+    if mask.any():
+        _, matched = _extract(strings.filter(pa.array(mask)), _DECIMAL_PATTERN)
+        parsed[mask] = _group(matched, 'a', pa.float64())
+
+
+def _time_fast_path(strings):
+    parsed = np.full(len(strings), np.nan)
+
+    mask, matched = _extract(strings, _TIME_HMS_PATTERN)
+    if mask.any():
+        first, second, third = (_group(matched, name) for name in 'abc')
+        # Same heuristic as the scalar parser: a first part > 24 means MM:SS:00
+        parsed[mask] = np.where(
+            first > 24,
+            first + second / 60 + third / 3600,
+            first * 60 + second + third / 60,
+        )
+
+    mask, matched = _extract(strings, _TIME_MS_PATTERN)
+    if mask.any():
+        parsed[mask] = _group(matched, 'a') + _group(matched, 'b') / 60
+
+    _fill_decimals(strings, parsed)
+    return parsed
+
+
+def _pace_fast_path(strings):
+    parsed = np.full(len(strings), np.nan)
+
+    mask, matched = _extract(strings, _PACE_MS_PATTERN)
+    if mask.any():
+        parsed[mask] = _group(matched, 'a') + _group(matched, 'b') / 60.0
+
+    _fill_decimals(strings, parsed)
+    return parsed
+
+
+def _parse_series(series, parser, fast_path):
+    """
+    Parse a column once per distinct value: plain shapes with Arrow string
+    kernels, anything else with the scalar `parser`.
+    """
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        # float(x) of a number is the number itself; missing values stay NaN
+        return series.astype('float64')
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    uniques = np.asarray(uniques, dtype=object)
+    parsed = np.full(len(uniques), np.nan)
+
+    is_str = np.fromiter((type(value) is str for value in uniques), dtype=bool, count=len(uniques))
+    # '' and '-' are "no value" for both parsers and stay NaN
+    no_value = is_str & np.isin(uniques, ['', '-'])
+    candidates = is_str & ~no_value
+    if candidates.any():
+        parsed[candidates] = fast_path(pa.array(uniques[candidates], type=pa.string()))
+
+    leftover = ~no_value & np.isnan(parsed)
+    for i in np.flatnonzero(leftover):
+        value = parser(uniques[i])
+        parsed[i] = np.nan if value is None else value
+
+    result = np.full(len(series), np.nan)
+    valid = codes >= 0
+    result[valid] = parsed[codes[valid]]
+    return pd.Series(result, index=series.index)
+
+
+def parse_time_series_to_minutes(series):
+    """
+    Vectorized parse_time_to_minutes over a Series.
+
+    Returns:
+        float64 Series of minutes, NaN where the scalar parser returns None
+    """
+    return _parse_series(series, parse_time_to_minutes, _time_fast_path)
+
+
+def parse_pace_series_to_minutes(series):
+    """
+    Vectorized parse_pace_to_minutes over a Series.
+
+    Returns:
+        float64 Series of minutes per km, NaN where the scalar parser returns None
+    """
+    return _parse_series(series, parse_pace_to_minutes, _pace_fast_path)
@@ -1,6 +1,7 @@
-import requests
 import streamlit as st
 
+from utils import http_client
+
 def fetch_elevations(coords):
     """
     Given a list of (lat, lon) tuples, return a list of elevations (meters) using Open-Elevation API.
@@ -12,7 +13,7 @@ def fetch_elevations(coords):
     url = "https://api.open-elevation.com/api/v1/lookup"
     locations = [{"latitude": lat, "longitude": lon} for lat, lon in coords]
     try:
-        response = requests.post(url, json={"locations": locations}, timeout=10)
+        response = http_client.post(url, json={"locations": locations}, timeout=10, endpoint="elevation lookup")
         if response.status_code == 200:
             data = response.json()
             return [result["elevation"] for result in data["results"]]
@@ -0,0 +1,252 @@
+"""
+Daily fitness-fatigue (ATL/CTL/TSB) engine.
+
+The model runs on a dense daily TSS series: the TSS of all activities of a
+day summed, and 0 on rest days. That way fatigue decays through rest days
+instead of jumping from one activity to the next. ATL and CTL are
+exponentially weighted averages of that series:
+
+    ATL[d] = ATL[d-1] + (TSS[d] - ATL[d-1]) * 2 / (atl_days + 1)
+
+and the same for CTL with ctl_days. This is ewm(span=..., adjust=False),
+seeded with the first day's TSS. TSB = CTL - ATL.
+
+The computed series is kept per user. When the activities change, only the
+days from the first changed day on are recomputed, starting from the stored
+state of the day before it. Appending new activities, or a new day passing,
+therefore only advances the recurrence over the new days. Date ranges are
+slices of the stored arrays.
+
+The personal intensity factor (IF) of the runner's recent training is also
+here. It is worked back from the TSS and distance of the runs in the last
+weeks, and feeds the projections of planned training. personal_if_series()
+evaluates it once per week over the whole history.
+
+Usage:
+    from utils.fitness_fatigue import update_fitness_state, fitness_series
+
+    state = update_fitness_state(df, user_key, through=today)
+    fitness_series(state, start=today - timedelta(days=90))   # Date, TSS, ATL, CTL, TSB
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.lru_cache import BoundedLRUCache
+
+ATL_DAYS = 7
+CTL_DAYS = 42
+MAX_CACHED_STATES = 64
+
+DEFAULT_PERSONAL_IF = 0.80
+TSS_PER_KM_FACTOR = 6               # estimated TSS = distance x IF^2 x 6 (~6 min/km base pace)
+MIN_IF_RUNS = 3
+
+_states = BoundedLRUCache(maxsize=MAX_CACHED_STATES)
+
+
+def ewm_alpha(days):
+    """Smoothing factor of an exponentially weighted average over `days` days."""
+    return 2 / (days + 1)
+
+
+def daily_tss_series(df, through=None):
+    """
+    Dense daily TSS of an activity frame.
+
+    Args:
+        df: Activities with 'Date' and 'TSS' columns
+        through: Optional last day; rest days up to it are added
+
+    Returns:
+        Series indexed by every day from the first activity day on (TSS summed per day, 0 on rest days)
+    """
+    dates = pd.to_datetime(df['Date']).dt.normalize()
+    tss = pd.to_numeric(df['TSS'], errors='coerce').fillna(0)
+    daily = tss[dates.notna()].groupby(dates[dates.notna()]).sum()
+    if daily.empty:
+        return daily.astype('float64')
+    last = daily.index[-1] if through is None else max(daily.index[-1], pd.Timestamp(through).normalize())
+    return daily.reindex(pd.date_range(daily.index[0], last, freq='D'), fill_value=0.0).astype('float64')
+
+
+def advance_load(tss, previous, days):
+    """Run the recurrence over `tss`, starting from the value of the day before (None seeds with tss[0])."""
+    if previous is None:
+        values = tss
+    else:
+        values = np.concatenate(([previous], tss))
+    smoothed = pd.Series(values).ewm(alpha=ewm_alpha(days), adjust=False).mean().to_numpy()
+    return smoothed if previous is None else smoothed[1:]
+
+
+def update_fitness_state(df, user_key=None, through=None, atl_days=ATL_DAYS, ctl_days=CTL_DAYS):
+    """
+    Bring a user's fitness-fatigue series up to date with `df`.
+
+    Args:
+        df: Activities with 'Date' and 'TSS' columns
+        user_key: Owner of the stored series
+        through: Last day of the series (e.g. today); defaults to the last activity day
+        atl_days: ATL time constant in days
+        ctl_days: CTL time constant in days
+
+    Returns:
+        State dict with the first day 'start' and the daily 'tss', 'atl' and
+        'ctl' arrays ('start' is None without dated activities)
+    """
+    tss_series = daily_tss_series(df, through)
+    tss = tss_series.to_numpy()
+    start = tss_series.index[0] if len(tss) else None
+
+    key = (user_key, atl_days, ctl_days)
+    state = _states.get(key)
+    # Days before the first changed day keep their stored values
+    first = 0
+    if state is not None and state['start'] == start:
+        overlap = min(len(state['tss']), len(tss))
+        changed = np.flatnonzero(state['tss'][:overlap] != tss[:overlap])
+        first = int(changed[0]) if len(changed) else overlap
+    if state is not None and first == len(tss) == len(state['tss']):
+        return state
+
+    if first:
+        atl = np.concatenate((state['atl'][:first], advance_load(tss[first:], state['atl'][first - 1], atl_days)))
+        ctl = np.concatenate((state['ctl'][:first], advance_load(tss[first:], state['ctl'][first - 1], ctl_days)))
+    else:
+        atl = advance_load(tss, None, atl_days)
+        ctl = advance_load(tss, None, ctl_days)
+
+    state = {'start': start, 'tss': tss, 'atl': atl, 'ctl': ctl, 'recomputed_days': len(tss) - first}
+    _states.put(key, state)
+    return state
+
+
+def latest_fitness(state):
+    """Last day of the series with its ATL, CTL and TSB (None without dated activities)."""
+    if state['start'] is None:
+        return None
+    atl, ctl = state['atl'][-1], state['ctl'][-1]
+    return {'Date': state['start'] + pd.Timedelta(days=len(state['tss']) - 1), 'ATL': atl, 'CTL': ctl, 'TSB': ctl - atl}
+
+
+def _day_positions(state, dates):
+    days = pd.to_datetime(pd.Series(dates)).dt.normalize()
+    return ((days - state['start']) // pd.Timedelta(days=1)).to_numpy(dtype='float64')
+
+
+def fitness_series(state, start=None, end=None):
+    """
+    Daily Date, TSS, ATL, CTL and TSB between two dates (both included).
+
+    Args:
+        state: Result of update_fitness_state()
+        start: First day (None for the first activity day)
+        end: Last day (None for the end of the series)
+
+    Returns:
+        DataFrame with one row per day
+    """
+    size = len(state['tss'])
+    if state['start'] is None:
+        return pd.DataFrame(columns=['Date', 'TSS', 'ATL', 'CTL', 'TSB'])
+    lo = 0 if start is None else int(np.clip(_day_positions(state, [start])[0], 0, size))
+    hi = size if end is None else int(np.clip(_day_positions(state, [end])[0] + 1, lo, size))
+    atl, ctl = state['atl'][lo:hi], state['ctl'][lo:hi]
+    return pd.DataFrame({
+        'Date': pd.date_range(state['start'] + pd.Timedelta(days=lo), periods=hi - lo, freq='D'),
+        'TSS': state['tss'][lo:hi],
+        'ATL': atl,
+        'CTL': ctl,
+        'TSB': ctl - atl,
+    })
+
+
+def fitness_at(state, dates):
+    """
+    End-of-day ATL, CTL and TSB on the given dates.
+
+    Args:
+        state: Result of update_fitness_state()
+        dates: Array-like of dates
+
+    Returns:
+        Dict of 'ATL', 'CTL' and 'TSB' arrays aligned with dates (NaN outside the series)
+    """
+    if state['start'] is None:
+        missing = np.full(len(dates), np.nan)
+        return {'ATL': missing, 'CTL': missing, 'TSB': missing}
+    positions = _day_positions(state, dates)
+    inside = (positions >= 0) & (positions < len(state['tss']))
+    index = np.where(inside, positions, 0).astype(int)
+    atl = np.where(inside, state['atl'][index], np.nan)
+    ctl = np.where(inside, state['ctl'][index], np.nan)
+    return {'ATL': atl, 'CTL': ctl, 'TSB': ctl - atl}
+
+
+def run_intensity_factors(df):
+    """
+    Intensity factor worked back from every run's TSS and distance.
+
+    Args:
+        df: Activities with 'TSS' and 'Distance (km)' columns
+
+    Returns:
+        Float array aligned with df: sqrt(TSS / (distance x 6)) for runs with
+        TSS > 5, distance > 1 km and an IF between 0.5 and 1.2; NaN otherwise
+    """
+    tss = pd.to_numeric(df['TSS'], errors='coerce').to_numpy(dtype='float64')
+    if 'Distance (km)' not in df.columns:
+        return np.full(len(df), np.nan)
+    distance = pd.to_numeric(df['Distance (km)'], errors='coerce').to_numpy(dtype='float64')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        intensity = np.sqrt(tss / (distance * TSS_PER_KM_FACTOR))
+        valid = (tss > 5) & (distance > 1) & (intensity >= 0.5) & (intensity <= 1.2)
+    return np.where(valid, intensity, np.nan)
+
+
+def personal_if_series(df, weeks_back=4, periods=None):
+    """
+    Personal IF once per week, counting back from the last activity.
+
+    Args:
+        df: Activities with 'Date', 'TSS' and 'Distance (km)' columns
+        weeks_back: Weeks of runs averaged for every value
+        periods: Number of weekly values (None for the whole history)
+
+    Returns:
+        Series indexed by evaluation time (ascending): the mean IF of the runs
+        in the `weeks_back` weeks up to it, clamped to 0.65-1.05, or 0.80 with
+        fewer than 3 usable runs
+    """
+    if df.empty or 'TSS' not in df.columns:
+        return pd.Series(dtype='float64')
+    dates = pd.to_datetime(df['Date']).to_numpy(dtype='datetime64[ns]')
+    dated = ~np.isnat(dates)
+    if not dated.any():
+        return pd.Series(dtype='float64')
+    order = np.argsort(dates[dated], kind='stable')
+    dates = dates[dated][order]
+    intensity = run_intensity_factors(df)[dated][order]
+
+    total = np.concatenate(([0.0], np.cumsum(np.nan_to_num(intensity))))
+    count = np.concatenate(([0], np.cumsum(~np.isnan(intensity))))
+    weeks = int((dates[-1] - dates[0]) // np.timedelta64(7, 'D')) + 1
+    if periods is not None:
+        weeks = min(weeks, periods)
+    ends = dates[-1] - np.arange(weeks)[::-1] * np.timedelta64(7, 'D')
+    lo = dates.searchsorted(ends - np.timedelta64(weeks_back * 7, 'D'), side='left')
+    hi = dates.searchsorted(ends, side='right')
+
+    runs = count[hi] - count[lo]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.clip((total[hi] - total[lo]) / runs, 0.65, 1.05)
+    return pd.Series(np.where(runs >= MIN_IF_RUNS, mean, DEFAULT_PERSONAL_IF), index=pd.DatetimeIndex(ends))
+
+
+def personal_if_at(series, when):
+    """Personal IF in effect at `when`: the latest weekly value up to it (the default before the first)."""
+    if series.empty:
+        return DEFAULT_PERSONAL_IF
+    position = series.index.searchsorted(pd.Timestamp(when), side='right')
+    return float(series.iloc[position - 1]) if position else DEFAULT_PERSONAL_IF
@@ -0,0 +1,294 @@
+"""
+Write-coalescing GitHub Gist client with ETag-aware reads.
+
+One client per gist keeps the parsed JSON documents in memory. Reads are
+revalidated with a conditional `If-None-Match` request, so an unchanged gist
+costs a 304 instead of a full download. Writes are applied to the in-memory
+document immediately and queued; mutations arriving within
+`debounce_seconds` of each other are sent together in a single PATCH.
+
+With a journal (the default for shared clients), every queued change is
+first written to a local write-ahead journal. The PATCH runs on a background
+timer thread and failed flushes are retried with exponential backoff;
+changes still in the journal when the app restarts are replayed.
+
+The API base URL can be pointed at a local stand-in for the GitHub API with
+the GITHUB_API_BASE environment variable or the `api_base` argument.
+
+Usage:
+    from utils.gist_client import get_gist_client
+
+    client = get_gist_client(gist_id, token)
+    data = client.read("user.json")
+    client.update("user.json", lambda doc: doc.setdefault("races", []).append(race))
+    client.flush()  # optional: send queued mutations now
+"""
+
+import copy
+import json
+import os
+import threading
+
+import requests
+
+from utils import http_client
+from utils.gist_journal import GistJournal
+
+GITHUB_API_BASE = os.environ.get("GITHUB_API_BASE", "https://api.github.com")
+DEFAULT_DEBOUNCE_SECONDS = 1.0
+MAX_RETRY_DELAY_SECONDS = 60.0
+REQUEST_TIMEOUT = 15
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+class GistClient:
+    """In-memory view of one gist with conditional reads and debounced writes."""
+
+    def __init__(self, gist_id, token, api_base=None, debounce_seconds=DEFAULT_DEBOUNCE_SECONDS, journal=None):
+        self.gist_id = gist_id
+        self.token = token
+        self.api_base = (api_base or GITHUB_API_BASE).rstrip("/")
+        self.debounce_seconds = debounce_seconds
+        self.network_reads = 0
+        self.network_writes = 0
+
+        self._documents = {}      # filename -> parsed JSON document
+        self._etag = None         # ETag of the last full gist response
+        self._loaded = False      # a copy of the gist has been downloaded
+        self._pending = {}        # filename -> list of mutations not yet PATCHed
+        self._flush_generation = 0  # successful PATCHes so far
+        self._timer = None
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()  # one PATCH in flight at a time
+        self._failed_flushes = 0
+
+        self.journal = journal
+        self._journal_seq = 0
+        if journal is not None:
+            self._replay_journal()
+
+    @property
+    def loaded(self):
+        """True once a copy of the gist has been downloaded (documents of a client that never loaded may be partial)."""
+        return self._loaded
+
+    @property
+    def url(self):
+        return f"{self.api_base}/gists/{self.gist_id}"
+
+    def _headers(self):
+        return {
+            "Authorization": f"token {self.token}",
+            "Accept": "application/vnd.github+json",
+        }
+
+    # --- Reads -------------------------------------------------------------
+
+    def _fetch_file_content(self, file_obj):
+        """Return a gist file's content, following raw_url when the API truncated it."""
+        if file_obj.get("truncated") and file_obj.get("raw_url"):
+            response = http_client.get(
+                file_obj["raw_url"], headers=self._headers(), timeout=REQUEST_TIMEOUT, endpoint="gist raw file"
+            )
+            self.network_reads += 1
+            response.raise_for_status()
+            return response.text
+        return file_obj.get("content")
+
+    def refresh(self):
+        """
+        Revalidate the cached documents against GitHub.
+
+        Returns:
+            True if the gist was reachable (200 or 304), False otherwise
+        """
+        headers = self._headers()
+        with self._lock:
+            # A PATCH also sets the ETag; a 304 only means something once the gist has been downloaded
+            if self._etag and self._loaded:
+                headers["If-None-Match"] = self._etag
+            generation = self._flush_generation
+        response = http_client.get(self.url, headers=headers, timeout=REQUEST_TIMEOUT, endpoint="gist read")
+        self.network_reads += 1
+
+        if response.status_code == 304:
+            return True
+        if response.status_code != 200:
+            print(f"Failed to load gist: {response.status_code} {response.text}")
+            return False
+
+        documents = {}
+        for filename, file_obj in response.json().get("files", {}).items():
+            content = self._fetch_file_content(file_obj)
+            if not content:
+                continue
+            try:
+                documents[filename] = json.loads(content)
+            except Exception as e:
+                print("Failed to parse Gist file content as JSON:", e)
+                print("Raw content:", content)
+
+        with self._lock:
+            if self._flush_generation != generation:
+                # A PATCH landed while this GET was in flight: the response may predate it, and the
+                # mutations it sent are no longer pending, so only files missing from memory are taken
+                for filename, document in documents.items():
+                    self._documents.setdefault(filename, document)
+                self._loaded = True
+                return True
+            self._etag = response.headers.get("ETag")
+            # Re-apply mutations that have not reached GitHub yet on top of the fresh copy
+            for filename, mutations in self._pending.items():
+                document = documents.setdefault(filename, {})
+                for mutation in mutations:
+                    mutation(document)
+            self._documents = documents
+            self._loaded = True
+        return True
+
+    def read(self, filename, revalidate=True):
+        """
+        Return a copy of a JSON document from the gist.
+
+        Args:
+            filename: Gist file name
+            revalidate: Send a conditional request before answering from memory
+
+        Returns:
+            Parsed document, or {} if the file does not exist or cannot be parsed
+        """
+        if revalidate or not self._loaded:
+            self.refresh()
+        with self._lock:
+            return copy.deepcopy(self._documents.get(filename, {}))
+
+    # --- Writes ------------------------------------------------------------
+
+    def update(self, filename, mutation):
+        """
+        Apply `mutation(document)` in memory and queue it for the next PATCH.
+
+        The mutation must modify the document in place; it may be re-applied
+        if a newer copy of the gist is fetched before the PATCH is sent.
+        """
+        with self._lock:
+            document = self._documents.setdefault(filename, {})
+            mutation(document)
+            if self.journal is not None:
+                self._journal_seq = self.journal.append(filename, document)
+            self._pending.setdefault(filename, []).append(mutation)
+            self._schedule_flush()
+        return True
+
+    def _replay_journal(self):
+        """Queue documents left in the journal by a previous run that never reached GitHub."""
+        documents = self.journal.pending_documents()
+        if not documents:
+            return
+        print(f"[gist_client] Replaying {len(documents)} unsynced file(s) for gist {self.gist_id}")
+        with self._lock:
+            for filename, content in documents.items():
+                def replace(document, content=content):
+                    document.clear()
+                    document.update(copy.deepcopy(content))
+
+                replace(self._documents.setdefault(filename, {}))
+                self._pending.setdefault(filename, []).append(replace)
+            self._journal_seq = self.journal.last_seq
+            self._schedule_flush()
+
+    def write(self, filename, data):
+        """Replace a whole document (queued like any other mutation)."""
+        snapshot = copy.deepcopy(data)
+
+        def replace(document):
+            document.clear()
+            document.update(copy.deepcopy(snapshot))
+
+        return self.update(filename, replace)
+
+    def _schedule_flush(self, delay=None):
+        # Always flush from a timer thread: flush() must never run while the caller holds the client lock
+        if delay is None:
+            delay = self.debounce_seconds
+        if self._timer is None:
+            self._timer = threading.Timer(max(delay, 0.0), self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    @property
+    def pending_count(self):
+        """Number of queued mutations not yet sent to GitHub."""
+        with self._lock:
+            return sum(len(mutations) for mutations in self._pending.values())
+
+    def flush(self):
+        """
+        Send all queued mutations in one PATCH.
+
+        Returns:
+            True if there was nothing to send or the PATCH succeeded
+        """
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._pending:
+                    return True
+                sent = {filename: len(mutations) for filename, mutations in self._pending.items()}
+                files = {
+                    filename: {"content": json.dumps(self._documents.get(filename, {}), indent=2)}
+                    for filename in sent
+                }
+                journal_seq = self._journal_seq
+
+            # The network call runs without the client lock so the UI can keep reading and queueing
+            try:
+                response = http_client.patch(
+                    self.url, headers=self._headers(), json={"files": files}, timeout=REQUEST_TIMEOUT,
+                    endpoint="gist write",
+                )
+                self.network_writes += 1
+                if response.status_code != 200:
+                    print(f"Failed to save gist: {response.status_code} {response.text}")
+                    response = None
+            except requests.RequestException as e:
+                print(f"Failed to save gist: {e}")
+                response = None
+
+            with self._lock:
+                if response is None:
+                    self._failed_flushes += 1
+                    delay = min(MAX_RETRY_DELAY_SECONDS, max(self.debounce_seconds, 1.0) * 2 ** self._failed_flushes)
+                    self._schedule_flush(delay)
+                    return False
+
+                self._failed_flushes = 0
+                self._flush_generation += 1
+                for filename, count in sent.items():
+                    remaining = self._pending.get(filename, [])[count:]
+                    if remaining:
+                        self._pending[filename] = remaining
+                    else:
+                        self._pending.pop(filename, None)
+                # The PATCH changed the gist; its response carries the new validator
+                self._etag = response.headers.get("ETag")
+                if self.journal is not None:
+                    self.journal.mark_flushed(journal_seq)
+                if self._pending:
+                    self._schedule_flush()
+            return True
+
+
+def get_gist_client(gist_id, token, api_base=None):
+    """Return the shared client for a gist, creating it on first use."""
+    key = (api_base or GITHUB_API_BASE, gist_id, token)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = GistClient(gist_id, token, api_base=api_base, journal=GistJournal(gist_id))
+            _clients[key] = client
+        return client
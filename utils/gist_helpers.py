@@ -1,27 +1,26 @@
-import requests
-import json
+from utils.gist_client import get_gist_client
+
 
 def load_gist_data(gist_id, filename, token):
-    url = f"https://api.github.com/gists/{gist_id}"
-    headers = {"Authorization": f"token {token}"}
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        gist = response.json()
-        files = gist.get("files", {})
-        file_obj = files.get(filename)
-        if file_obj and "content" in file_obj:
-            try:
-                return json.loads(file_obj["content"])
-            except Exception as e:
-                print("Failed to parse Gist file content as JSON:", e)
-                print("Raw content:", file_obj["content"])
-                return {}
-    print(f"Failed to load gist: {response.status_code} {response.text}")
-    return {}
+    """Return a copy of a gist JSON file, revalidated with a conditional request."""
+    return get_gist_client(gist_id, token).read(filename)
+
 
 def save_gist_data(gist_id, filename, token, data):
-    url = f"https://api.github.com/gists/{gist_id}"
-    headers = {"Authorization": f"token {token}"}
-    payload = {"files": {filename: {"content": json.dumps(data, indent=2)}}}
-    response = requests.patch(url, headers=headers, json=payload)
-    return response.status_code == 200
+    """Replace a gist JSON file; the write is coalesced with others into one PATCH."""
+    return get_gist_client(gist_id, token).write(filename, data)
+
+
+def update_gist_data(gist_id, filename, token, mutation):
+    """Apply `mutation(document)` to a gist JSON file in place and queue it for the next PATCH."""
+    return get_gist_client(gist_id, token).update(filename, mutation)
+
+
+def flush_gist_data(gist_id, token):
+    """Send any queued gist mutations now."""
+    return get_gist_client(gist_id, token).flush()
+
+
+def pending_gist_sync_count(gist_id, token):
+    """Number of saved changes that have not reached the gist yet."""
+    return get_gist_client(gist_id, token).pending_count
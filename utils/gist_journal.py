@@ -0,0 +1,111 @@
+"""
+Local write-ahead journal for gist mutations.
+
+Before a queued gist mutation is acknowledged, the resulting document is
+appended to a JSON-lines journal on local disk. Entries are dropped once a
+PATCH containing them succeeds, so the journal only ever holds changes that
+have not reached GitHub yet. When the app restarts, the gist client replays
+whatever is left.
+
+Layout:
+    <JOURNAL_ROOT>/<sha1(gist_id)[:16]>.jsonl
+        {"seq": 1, "filename": "user.races.json", "content": {...}, "written_at": "..."}
+        ...
+
+Usage:
+    from utils.gist_journal import GistJournal
+
+    journal = GistJournal(gist_id)
+    seq = journal.append("user.races.json", document)
+    journal.pending_documents()   # {"user.races.json": {...}} latest unflushed copy per file
+    journal.mark_flushed(seq)     # drop entries up to seq after a successful PATCH
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+JOURNAL_ROOT = os.environ.get(
+    "RUNTRACKER_JOURNAL_DIR",
+    os.path.join(os.path.expanduser("~"), ".runtracker", "gist_journal"),
+)
+
+
+class GistJournal:
+    """Append-only file of unflushed gist documents for one gist."""
+
+    def __init__(self, gist_id, root=None):
+        key = hashlib.sha1(str(gist_id).encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(root or JOURNAL_ROOT, f"{key}.jsonl")
+        self._lock = threading.Lock()
+        entries = self._read_entries()
+        self._last_seq = entries[-1]["seq"] if entries else 0
+
+    @property
+    def last_seq(self):
+        """Sequence number of the most recent entry (0 if none)."""
+        return self._last_seq
+
+    def _read_entries(self):
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        # A crash mid-append leaves at most one torn line at the end
+                        print(f"[gist_journal] Skipping unreadable entry in {self.path}")
+        except OSError as e:
+            print(f"[gist_journal] Failed to read {self.path}: {e}")
+        return entries
+
+    def append(self, filename, content):
+        """
+        Durably record the current content of a gist file.
+
+        Returns:
+            Sequence number of the new entry
+        """
+        with self._lock:
+            self._last_seq += 1
+            entry = {
+                "seq": self._last_seq,
+                "filename": filename,
+                "content": content,
+                "written_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(entry) + "\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+            return self._last_seq
+
+    def pending_documents(self):
+        """Return the latest unflushed content per filename."""
+        with self._lock:
+            documents = {}
+            for entry in self._read_entries():
+                documents[entry["filename"]] = entry["content"]
+            return documents
+
+    def mark_flushed(self, seq):
+        """Drop all entries with a sequence number up to and including `seq`."""
+        with self._lock:
+            remaining = [entry for entry in self._read_entries() if entry["seq"] > seq]
+            if not remaining:
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+                return
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                for entry in remaining:
+                    fh.write(json.dumps(entry) + "\n")
+            os.replace(tmp_path, self.path)
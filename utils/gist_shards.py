@@ -0,0 +1,155 @@
+"""
+Sharded per-user storage in the user's gist.
+
+Each data domain of a user lives in its own gist file, so a save only
+transmits the shard it touches:
+
+    {user_key}.races.json               {"races": [...]}
+    {user_key}.training_plans.json      {"training_plans": {...}}
+    {user_key}.progress_feedback.json   {"progress_feedback": {...}}
+    {user_key}.runner_profile.json      {"runner_profile": {...}}
+    {user_key}.activity_analyses.json   {"activity_analyses": {...}}
+    {user_key}.fatigue_analyses.json    {"fatigue_analyses": {...}}
+
+A shard document has the same shape as the matching slice of the old
+`{user_key: {...}}` document, so mutations written against the user's
+section work unchanged against a shard.
+
+The legacy single file `{user_key}.json` is migrated the first time it is
+seen: every domain is merged into its shard and the file gets a small
+marker. The user's section stays in the legacy file as a backup, so an
+older version of the app still finds its data. Nothing is migrated or
+written before the gist has been downloaded, so a failed read can never
+be mistaken for an empty legacy file. All of it is queued on the gist
+client and therefore sent in a single PATCH.
+
+Usage:
+    from utils.gist_shards import read_user_domain, update_user_domain
+
+    races = read_user_domain(gist_id, token, user_key, "races", [])
+    update_user_domain(gist_id, token, user_key, "races", lambda shard: shard.update(races=races))
+"""
+
+import copy
+
+from utils.gist_client import get_gist_client
+
+USER_DOMAINS = (
+    "races",
+    "training_plans",
+    "progress_feedback",
+    "runner_profile",
+    "activity_analyses",
+    "fatigue_analyses",
+)
+SHARD_LAYOUT_VERSION = 1
+LEGACY_MARKER_KEY = "sharded_storage_version"
+
+
+def legacy_filename(user_key):
+    """Name of the pre-sharding single file for a user."""
+    return f"{user_key}.json"
+
+
+def shard_filename(user_key, domain):
+    """Name of the gist file holding one domain of a user's data."""
+    return f"{user_key}.{domain}.json"
+
+
+def _ensure_loaded(client):
+    """True once the client holds a downloaded copy of the gist (one download attempt if not)."""
+    return client.loaded or (client.refresh() and client.loaded)
+
+
+def merge_legacy_value(current, legacy):
+    """
+    Merge a legacy domain value into the shard's value.
+
+    Dicts gain the legacy keys they lack, lists gain the legacy items they
+    lack, and any other value in the shard is kept. Merging twice gives the
+    same result, so a replayed mutation is harmless.
+    """
+    if isinstance(current, dict) and isinstance(legacy, dict):
+        merged = copy.deepcopy(legacy)
+        merged.update(current)
+        return merged
+    if isinstance(current, list) and isinstance(legacy, list):
+        return current + [copy.deepcopy(item) for item in legacy if item not in current]
+    return current
+
+
+def migrate_legacy_document(client, user_key):
+    """
+    Merge a legacy `{user_key}.json` document into per-domain shards.
+
+    Args:
+        client: GistClient for the user's gist (must be loaded, see GistClient.loaded)
+        user_key: User key
+
+    Returns:
+        True if a migration was queued, False if there was nothing to migrate
+    """
+    legacy = client.read(legacy_filename(user_key), revalidate=False)
+    user_data = legacy.get(user_key)
+    if legacy.get(LEGACY_MARKER_KEY) == SHARD_LAYOUT_VERSION or not isinstance(user_data, dict):
+        return False
+
+    for domain, value in user_data.items():
+        def merge_domain(shard, domain=domain, value=value):
+            if domain in shard:
+                shard[domain] = merge_legacy_value(shard[domain], value)
+            else:
+                shard[domain] = copy.deepcopy(value)
+
+        client.update(shard_filename(user_key, domain), merge_domain)
+
+    def mark_migrated(document):
+        # The user's section is kept as a backup for a rollback
+        document[LEGACY_MARKER_KEY] = SHARD_LAYOUT_VERSION
+
+    client.update(legacy_filename(user_key), mark_migrated)
+    return True
+
+
+def read_user_domain(gist_id, token, user_key, domain, default=None, revalidate=True):
+    """
+    Read one domain of a user's data, migrating the legacy file if needed.
+
+    Args:
+        gist_id: Gist ID
+        token: GitHub token
+        user_key: User key
+        domain: One of USER_DOMAINS (any key of the legacy document works)
+        default: Value returned when the domain has no data yet
+        revalidate: Send a conditional request before answering from memory
+
+    Returns:
+        A copy of the domain value, or `default`
+    """
+    client = get_gist_client(gist_id, token)
+    shard = client.read(shard_filename(user_key, domain), revalidate=revalidate)
+    if not client.loaded:
+        return default
+    if migrate_legacy_document(client, user_key):
+        shard = client.read(shard_filename(user_key, domain), revalidate=False)
+    return shard.get(domain, default)
+
+
+def update_user_domain(gist_id, token, user_key, domain, mutation):
+    """
+    Apply `mutation(shard)` to one domain shard and queue only that file for saving.
+
+    The shard is a dict shaped like the user's section of the legacy document
+    restricted to `domain`, e.g. {"races": [...]}. The mutation must modify it
+    in place and be safe to re-apply.
+
+    Returns:
+        True if the change was queued, False if the gist could not be loaded
+    """
+    client = get_gist_client(gist_id, token)
+    # Make sure the legacy data is merged before the first write lands on a shard
+    if not _ensure_loaded(client):
+        print(f"Not saving {domain}: the gist could not be loaded")
+        return False
+    migrate_legacy_document(client, user_key)
+    return client.update(shard_filename(user_key, domain), mutation)
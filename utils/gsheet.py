@@ -1,10 +1,16 @@
+import io
+
 import pandas as pd
 import streamlit as st
-import requests
+
+from utils import http_client
 
 def fetch_gsheet_plan(url):
     try:
-        df = pd.read_csv(url)
+        response = http_client.get(url, endpoint="plan sheet")
+        response.raise_for_status()
+        # Bytes, not response.text: the export often has no charset and requests would guess ISO-8859-1
+        df = pd.read_csv(io.BytesIO(response.content))
         # Expect columns: Week, Start Date, Status, Monday, ..., Sunday, Comment
         required_cols = {"Week", "Start Date", "Status", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday", "Comment"}
         if not required_cols.issubset(set(df.columns)):
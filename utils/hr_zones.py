@@ -0,0 +1,181 @@
+"""
+Heart rate zone binning shared by the dashboard views.
+
+The zones come from the runner profile: the z1-z5 ranges ("100–120") when all
+five are filled in, otherwise fractions of the profile max HR (50/60/70/80/90%).
+Every activity is put in the zone of its average HR with np.digitize on the
+zone lower bounds. Zone 5 is open-ended, and runs below zone 1 or without HR
+are in no zone.
+
+A zone index sorts the activities by date once and keeps cumulative run counts
+and moving minutes per zone. The totals of any period ending today are then a
+binary search and a subtraction. The index is cached per data version and
+zone set.
+
+Usage:
+    from utils.hr_zones import profile_zones, get_zone_index, zone_totals
+
+    zones = profile_zones(st.session_state.user_info.get('runner_profile', {}))
+    totals = zone_totals(get_zone_index(df, zones), start=period_start)
+    totals['runs'], totals['minutes']   # arrays with one value per zone
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from utils.activity_frame import data_version
+from utils.lru_cache import BoundedLRUCache
+
+ZONE_NAMES = ['Zone 1 (Recovery)', 'Zone 2 (Aerobic)', 'Zone 3 (Tempo)', 'Zone 4 (Threshold)', 'Zone 5 (VO2 Max)']
+ZONE_COLORS = ['#22c55e', '#84cc16', '#eab308', '#f97316', '#ef4444']
+PROFILE_ZONE_KEYS = ['z1', 'z2', 'z3', 'z4', 'z5']
+ZONE_FRACTIONS = [0.5, 0.6, 0.7, 0.8, 0.9]     # zone lower bounds as a fraction of max HR
+DEFAULT_MAX_HR = 220 - 30                       # age-based estimate when the profile has no max HR
+ZONE_INDEX_CACHE_SIZE = 8
+INDEX_COLUMNS = ['Date', 'Avg HR', 'moving_time_minutes']
+
+_RANGE_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(?:-|–|—|to)\s*(\d+(?:\.\d+)?)')
+_zone_index_cache = BoundedLRUCache(maxsize=ZONE_INDEX_CACHE_SIZE)
+
+
+def parse_zone_range(text):
+    """
+    Parse a profile zone range such as "100–120" or "100-120".
+
+    Args:
+        text: Zone range as typed in the runner profile
+
+    Returns:
+        (low, high) in bpm, or None when the text is not a range
+    """
+    match = _RANGE_PATTERN.search(str(text or ''))
+    if not match:
+        return None
+    low, high = float(match.group(1)), float(match.group(2))
+    return (low, high) if low < high else None
+
+
+def _profile_max_hr(profile):
+    try:
+        max_hr = float(profile.get('max_hr'))
+    except (TypeError, ValueError):
+        return DEFAULT_MAX_HR
+    return max_hr if max_hr > 0 else DEFAULT_MAX_HR
+
+
+def profile_zones(profile=None):
+    """
+    Heart rate zones of a runner profile.
+
+    Args:
+        profile: Runner profile dict (may be empty or None)
+
+    Returns:
+        Tuple of five (name, low, high) zones with increasing lower bounds
+        (high is None for an open-ended zone 5)
+    """
+    profile = profile or {}
+    ranges = [parse_zone_range(profile.get(key)) for key in PROFILE_ZONE_KEYS]
+    if all(ranges) and all(a[0] < b[0] for a, b in zip(ranges, ranges[1:])):
+        return tuple((name, low, high) for name, (low, high) in zip(ZONE_NAMES, ranges))
+
+    max_hr = _profile_max_hr(profile)
+    lows = [max_hr * fraction for fraction in ZONE_FRACTIONS]
+    highs = lows[1:] + [None]
+    return tuple(zip(ZONE_NAMES, lows, highs))
+
+
+def zone_label(zone):
+    """Chart label of a zone, e.g. 'Zone 2 (Aerobic)\\n121-135 bpm'."""
+    name, low, high = zone
+    if high is None:
+        return f"{name}\n{low:.0f}+ bpm"
+    return f"{name}\n{low:.0f}-{high:.0f} bpm"
+
+
+def assign_zones(hr, zones):
+    """
+    Zone of every HR value.
+
+    Args:
+        hr: Array-like of average HR values
+        zones: Result of profile_zones()
+
+    Returns:
+        Integer array of zone positions (0-4), -1 below zone 1 or without HR
+    """
+    hr = np.asarray(hr, dtype='float64')
+    lows = np.array([low for _, low, _ in zones])
+    codes = np.digitize(hr, lows) - 1
+    codes[np.isnan(hr)] = -1
+    return codes
+
+
+def build_zone_index(df, zones):
+    """
+    Build the zone index of an activity frame.
+
+    Args:
+        df: Activity frame with 'Date', 'Avg HR' and optionally 'moving_time_minutes'
+        zones: Result of profile_zones()
+
+    Returns:
+        Dict with the sorted dates and cumulative run, minute and HR run counts
+    """
+    dates = pd.to_datetime(df['Date']).to_numpy(dtype='datetime64[ns]')
+    # NaT sorts last; undated activities only count towards all-time totals
+    order = np.argsort(dates, kind='stable')
+    dates = dates[order]
+    dated = int((~np.isnat(dates)).sum())
+
+    hr = pd.to_numeric(df['Avg HR'], errors='coerce').to_numpy(dtype='float64')[order]
+    minutes = np.zeros(len(order))
+    if 'moving_time_minutes' in df.columns:
+        minutes = np.nan_to_num(pd.to_numeric(df['moving_time_minutes'], errors='coerce').to_numpy(dtype='float64')[order])
+
+    codes = assign_zones(hr, zones)
+    in_zone = (codes[:, None] == np.arange(len(zones))).astype('float64')
+    return {
+        'dates': dates[:dated],
+        'size': len(order),
+        'runs': np.vstack([np.zeros(len(zones)), in_zone.cumsum(axis=0)]),
+        'minutes': np.vstack([np.zeros(len(zones)), (in_zone * minutes[:, None]).cumsum(axis=0)]),
+        'hr_runs': np.concatenate(([0], np.cumsum(~np.isnan(hr)))),
+        'zones': zones,
+    }
+
+
+def get_zone_index(df, zones):
+    """Zone index of `df`, built once per data version and zone set."""
+    key = (data_version(df, INDEX_COLUMNS), zones)
+    return _zone_index_cache.get_or_compute(key, lambda: build_zone_index(df, zones))
+
+
+def zone_totals(index, start=None):
+    """
+    Zone totals of the activities dated on or after `start`.
+
+    Args:
+        index: Result of build_zone_index()
+        start: First date included (None for all activities, undated ones included)
+
+    Returns:
+        Dict with 'runs' and 'minutes' per zone and 'hr_runs' (activities with an HR)
+    """
+    if start is None:
+        lo, hi = 0, index['size']
+    else:
+        lo = int(index['dates'].searchsorted(np.datetime64(pd.Timestamp(start), 'ns')))
+        hi = max(lo, len(index['dates']))
+    return {
+        'runs': (index['runs'][hi] - index['runs'][lo]).astype(int),
+        'minutes': index['minutes'][hi] - index['minutes'][lo],
+        'hr_runs': int(index['hr_runs'][hi] - index['hr_runs'][lo]),
+    }
+
+
+def zone_totals_by_period(index, starts):
+    """zone_totals() of several periods, e.g. every time period button."""
+    return [zone_totals(index, start) for start in starts]
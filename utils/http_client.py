@@ -0,0 +1,165 @@
+"""
+Shared HTTP transport for every outbound call the app makes.
+
+All gist, sheet, Google Sheet plan and elevation requests go through one
+keep-alive `requests.Session`, so connections (and their TLS handshakes) are
+reused across calls and reruns. The session mounts an adapter with a bounded
+connection pool per host, a default timeout, and retries with exponential
+backoff for connection errors and transient HTTP statuses.
+
+Every request is timed and recorded in a per-endpoint latency histogram that
+the app can display.
+
+Usage:
+    from utils import http_client
+
+    response = http_client.get(url, endpoint="sheet csv")
+    http_client.get_latency_stats()   # DataFrame, one row per endpoint
+"""
+
+import threading
+import time
+from urllib.parse import urlparse
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = 15
+POOL_CONNECTIONS = 8     # number of hosts whose pools are kept
+POOL_MAXSIZE = 4         # connections kept per host
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Gist PATCHes replace whole files and elevation POSTs are lookups, so all of these are safe to retry
+RETRY_METHODS = frozenset(["GET", "HEAD", "POST", "PATCH"])
+
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_session = None
+_session_lock = threading.Lock()
+_histograms = {}
+_histograms_lock = threading.Lock()
+
+
+def _build_session():
+    retry = Retry(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=RETRY_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _build_session()
+        return _session
+
+
+def _record_latency(endpoint, elapsed_ms, ok):
+    with _histograms_lock:
+        hist = _histograms.get(endpoint)
+        if hist is None:
+            hist = {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0,
+                    "buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1)}
+            _histograms[endpoint] = hist
+        hist["count"] += 1
+        hist["errors"] += 0 if ok else 1
+        hist["total_ms"] += elapsed_ms
+        hist["max_ms"] = max(hist["max_ms"], elapsed_ms)
+        index = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if elapsed_ms <= bound), len(LATENCY_BUCKETS_MS))
+        hist["buckets"][index] += 1
+
+
+def request(method, url, endpoint=None, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """
+    Send a request through the shared session and record its latency.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        endpoint: Label for the latency histogram (defaults to "METHOD host")
+        timeout: Timeout in seconds (connect and read)
+        **kwargs: Passed on to `requests.Session.request`
+
+    Returns:
+        requests.Response; connection errors are raised after retries are exhausted
+    """
+    endpoint = endpoint or f"{method.upper()} {urlparse(url).netloc}"
+    start = time.perf_counter()
+    ok = False
+    try:
+        response = get_session().request(method, url, timeout=timeout, **kwargs)
+        ok = response.status_code < 400
+        return response
+    finally:
+        _record_latency(endpoint, (time.perf_counter() - start) * 1000, ok)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def patch(url, **kwargs):
+    return request("PATCH", url, **kwargs)
+
+
+def _bucket_percentile(buckets, count, fraction):
+    """Upper bound of the bucket holding the given fraction of requests."""
+    target = fraction * count
+    seen = 0
+    for bound, n in zip(LATENCY_BUCKETS_MS + (float("inf"),), buckets):
+        seen += n
+        if seen >= target:
+            return bound
+    return float("inf")
+
+
+def get_latency_stats():
+    """
+    Summarize the latency histograms.
+
+    Returns:
+        DataFrame with one row per endpoint: request and error counts, mean and
+        max latency, bucketed p50/p95 and the per-bucket counts
+    """
+    with _histograms_lock:
+        snapshot = {endpoint: dict(hist, buckets=list(hist["buckets"])) for endpoint, hist in _histograms.items()}
+
+    bucket_labels = [f"≤{bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+    rows = []
+    for endpoint, hist in sorted(snapshot.items()):
+        row = {
+            "Endpoint": endpoint,
+            "Requests": hist["count"],
+            "Errors": hist["errors"],
+            "Mean (ms)": round(hist["total_ms"] / hist["count"], 1),
+            "p50 (ms)": _bucket_percentile(hist["buckets"], hist["count"], 0.50),
+            "p95 (ms)": _bucket_percentile(hist["buckets"], hist["count"], 0.95),
+            "Max (ms)": round(hist["max_ms"], 1),
+        }
+        row.update(zip(bucket_labels, hist["buckets"]))
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def reset_latency_stats():
+    """Clear all recorded latencies."""
+    with _histograms_lock:
+        _histograms.clear()
@@ -0,0 +1,84 @@
+"""
+Small thread-safe bounded LRU cache with hit/miss counters.
+
+Streamlit serves every session from the same process, so module-level caches
+are shared between reruns and users. This cache keeps them bounded and makes
+their effectiveness visible.
+
+Usage:
+    from utils.lru_cache import BoundedLRUCache
+
+    cache = BoundedLRUCache(maxsize=1024)
+    value = cache.get_or_compute(key, lambda: expensive(key))
+    cache.stats()  # {'size': ..., 'maxsize': ..., 'hits': ..., 'misses': ..., 'hit_rate': ...}
+"""
+
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class BoundedLRUCache:
+    """Least-recently-used cache holding at most `maxsize` entries."""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Return the cached value for `key` (marking it recently used), or `default`."""
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store `value` under `key`, evicting the least recently used entries if full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for `key`, computing and storing it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return size and hit/miss counters as a dict."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,183 @@
+"""
+Compiled training plan projection for the future fatigue prediction.
+
+A training plan (weeks of monday..sunday entries with a distance and a
+description) is compiled once per plan version into dense daily arrays: the
+planned distance of every day from the first week's Monday to the last week's
+Sunday, and whether the day is a workout (a distance and no rest/off in its
+description). A later week in the plan overrides an earlier one on the same
+dates.
+
+Projecting is then vectorized. The planned TSS is workout distance x IF^2 x 6.
+ATL and CTL advance over it as one recurrence, starting from the last known
+fitness state. Days without a plan entry are rest days.
+
+Usage:
+    from utils.plan_projection import get_compiled_plan, project_plan
+
+    compiled = get_compiled_plan(plan)
+    future = project_plan(compiled, personal_if, last_day, last_atl, last_ctl)
+"""
+
+import hashlib
+import json
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from utils.date_parser import parse_training_date
+from utils.fitness_fatigue import ATL_DAYS, CTL_DAYS, TSS_PER_KM_FACTOR, advance_load
+from utils.lru_cache import BoundedLRUCache
+
+PLAN_DAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+REST_KEYWORDS = ('rest', 'off')
+PLAN_CACHE_SIZE = 16
+
+_plan_cache = BoundedLRUCache(maxsize=PLAN_CACHE_SIZE)
+
+
+def plan_version(plan):
+    """Content hash of a training plan."""
+    return hashlib.sha1(json.dumps(plan, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _planned_distance(day_plan):
+    try:
+        return float(day_plan.get('distance', 0) or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def compile_plan(plan):
+    """
+    Compile a training plan into dense daily arrays.
+
+    Args:
+        plan: Training plan dict with a 'weeks' list
+
+    Returns:
+        Dict with 'start' (first day, None without dated weeks), daily
+        'distance' (NaN on days no week covers) and 'workout' arrays, and the
+        dated 'weeks' (week_number, start, raw_start, days) in plan order
+    """
+    weeks = []
+    for week in plan.get('weeks', []):
+        start = parse_training_date(week.get('start_date', ''))
+        if start is None:
+            continue
+        days = []
+        for day in PLAN_DAYS:
+            day_plan = week.get(day) or {}
+            days.append((day, _planned_distance(day_plan), str(day_plan.get('description', ''))))
+        weeks.append({
+            'week_number': week.get('week_number', '?'),
+            'start': start,
+            'raw_start': week.get('start_date', ''),
+            'days': days,
+        })
+
+    if not weeks:
+        return {'start': None, 'distance': np.array([]), 'workout': np.array([], dtype=bool), 'weeks': []}
+
+    first = min(week['start'] for week in weeks)
+    size = (max(week['start'] for week in weeks) - first).days + len(PLAN_DAYS)
+    distance = np.full(size, np.nan)
+    workout = np.zeros(size, dtype=bool)
+    for week in weeks:
+        offset = (week['start'] - first).days
+        for position, (_, km, description) in enumerate(week['days'], start=offset):
+            distance[position] = km
+            workout[position] = km > 0 and not any(keyword in description.lower() for keyword in REST_KEYWORDS)
+    return {'start': first, 'distance': distance, 'workout': workout, 'weeks': weeks}
+
+
+def get_compiled_plan(plan):
+    """compile_plan(), cached by plan version."""
+    return _plan_cache.get_or_compute(plan_version(plan), lambda: compile_plan(plan))
+
+
+def planned_tss(distance, workout, personal_if):
+    """Estimated TSS of planned days: distance x IF^2 x 6 on workout days, 0 otherwise."""
+    return np.where(workout, np.nan_to_num(distance) * personal_if ** 2 * TSS_PER_KM_FACTOR, 0.0)
+
+
+def project_plan(compiled, personal_if, last_day, last_atl, last_ctl, atl_days=ATL_DAYS, ctl_days=CTL_DAYS):
+    """
+    Project ATL, CTL and TSB over the plan days after the last known day.
+
+    Args:
+        compiled: Result of compile_plan()
+        personal_if: Intensity factor applied to planned workouts
+        last_day: Last day of the known fitness series
+        last_atl: ATL on last_day
+        last_ctl: CTL on last_day
+        atl_days: ATL time constant in days
+        ctl_days: CTL time constant in days
+
+    Returns:
+        DataFrame with one row per day up to the end of the plan: Date, TSS,
+        CTL, ATL, TSB, is_prediction and the planned distance (NaN on rest
+        days outside the plan); empty when the plan ends by last_day
+    """
+    if compiled['start'] is None:
+        return pd.DataFrame()
+    plan_start = pd.Timestamp(compiled['start'])
+    first_day = pd.Timestamp(last_day).normalize() + timedelta(days=1)
+    days = pd.date_range(first_day, plan_start + timedelta(days=len(compiled['distance']) - 1), freq='D')
+    if days.empty:
+        return pd.DataFrame()
+
+    positions = ((days - plan_start) // pd.Timedelta(days=1)).to_numpy()
+    in_plan = positions >= 0
+    index = np.where(in_plan, positions, 0)
+    distance = np.where(in_plan, compiled['distance'][index], np.nan)
+    workout = in_plan & compiled['workout'][index]
+
+    tss = planned_tss(distance, workout, personal_if)
+    atl = advance_load(tss, last_atl, atl_days)
+    ctl = advance_load(tss, last_ctl, ctl_days)
+    return pd.DataFrame({
+        'Date': days,
+        'TSS': tss,
+        'CTL': ctl,
+        'ATL': atl,
+        'TSB': ctl - atl,
+        'is_prediction': True,
+        'Distance (km)': distance,
+        'Planned_Distance': distance,
+    })
+
+
+def plan_week_breakdown(compiled, personal_if, after_day):
+    """
+    Planned TSS of every week with days after `after_day`.
+
+    Args:
+        compiled: Result of compile_plan()
+        personal_if: Intensity factor applied to planned workouts
+        after_day: Only days after this date count
+
+    Returns:
+        List of dicts with 'week', 'start_date', 'total_tss' and one 'details'
+        line per planned run
+    """
+    breakdown = []
+    for week in compiled['weeks']:
+        details = []
+        total = 0.0
+        for offset, (day, km, description) in enumerate(week['days']):
+            if week['start'] + timedelta(days=offset) <= after_day or km <= 0:
+                continue
+            is_workout = not any(keyword in description.lower() for keyword in REST_KEYWORDS)
+            tss = float(planned_tss(km, is_workout, personal_if))
+            total += tss
+            details.append(f"{day.title()}: {km}km ({description[:20]}...) = {tss:.0f} TSS")
+        if details:
+            breakdown.append({
+                'week': f"Week {week['week_number']}",
+                'start_date': week['start'].strftime('%b %d'),
+                'total_tss': total,
+                'details': details,
+            })
+    return breakdown
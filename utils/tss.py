@@ -0,0 +1,107 @@
+"""
+Columnar Training Stress Score (TSS) computation.
+
+TSS = duration (h) x IF^2 x 100, where the intensity factor IF compares an
+activity's effort with the athlete's threshold:
+
+    hrTSS     IF = Avg HR / LTHR
+    rTSS      IF = threshold pace / pace (min/km; a faster pace gives a higher IF)
+    power TSS IF = Weighted Power (or Power (W)) / FTP
+
+Every score is computed over whole columns at once. An activity gets the
+score of the first method in power > HR > pace order that has both its
+threshold and the activity's data; otherwise its TSS is 0. The result is
+cached per (data version, thresholds), so changing the LTHR only recomputes
+the arithmetic.
+
+Usage:
+    from utils.tss import get_tss
+
+    df['TSS'] = get_tss(df, lthr=165)
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.activity_frame import data_version
+from utils.lru_cache import BoundedLRUCache
+
+HR_COLUMN = 'Avg HR'
+DURATION_COLUMN = 'Elapsed Time (min)'
+PACE_COLUMN = 'pace_minutes'
+POWER_COLUMNS = ['Weighted Power', 'Power (W)']     # first present value wins
+TSS_CACHE_SIZE = 32
+
+_tss_cache = BoundedLRUCache(maxsize=TSS_CACHE_SIZE)
+
+
+def _numeric(df, col):
+    if col not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[col], errors='coerce').to_numpy(dtype='float64')
+
+
+def _stress(duration_min, intensity):
+    """TSS of every activity, NaN where the duration or intensity is missing or not positive."""
+    with np.errstate(invalid='ignore'):
+        valid = (duration_min > 0) & (intensity > 0)
+    return np.where(valid, duration_min / 60.0 * intensity ** 2 * 100, np.nan)
+
+
+def hr_tss(avg_hr, duration_min, lthr):
+    """hrTSS of every activity (NaN without HR, duration or LTHR)."""
+    if not lthr:
+        return np.full(len(avg_hr), np.nan)
+    return _stress(np.asarray(duration_min, dtype='float64'), np.asarray(avg_hr, dtype='float64') / float(lthr))
+
+
+def pace_tss(pace_minutes, duration_min, threshold_pace):
+    """rTSS of every activity from its pace in min/km (NaN without pace, duration or threshold pace)."""
+    pace = np.asarray(pace_minutes, dtype='float64')
+    if not threshold_pace:
+        return np.full(len(pace), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        intensity = np.where(pace > 0, float(threshold_pace) / pace, np.nan)
+    return _stress(np.asarray(duration_min, dtype='float64'), intensity)
+
+
+def power_tss(power, duration_min, ftp):
+    """Power-based TSS of every activity (NaN without power, duration or FTP)."""
+    if not ftp:
+        return np.full(len(power), np.nan)
+    return _stress(np.asarray(duration_min, dtype='float64'), np.asarray(power, dtype='float64') / float(ftp))
+
+
+def compute_tss(df, lthr=None, threshold_pace=None, ftp=None):
+    """
+    TSS of every activity in `df`.
+
+    Args:
+        df: Activity frame with 'Elapsed Time (min)' and 'Avg HR', and
+            optionally 'pace_minutes' and power columns
+        lthr: Lactate threshold heart rate (bpm) for hrTSS
+        threshold_pace: Threshold pace (min/km) for rTSS
+        ftp: Functional threshold power (W) for power TSS
+
+    Returns:
+        Float array aligned with df; 0 where no method applies
+    """
+    duration = _numeric(df, DURATION_COLUMN)
+    power = np.full(len(df), np.nan)
+    for col in reversed(POWER_COLUMNS):
+        values = _numeric(df, col)
+        power = np.where(np.isnan(values), power, values)
+
+    tss = power_tss(power, duration, ftp)
+    for fallback in (hr_tss(_numeric(df, HR_COLUMN), duration, lthr),
+                     pace_tss(_numeric(df, PACE_COLUMN), duration, threshold_pace)):
+        tss = np.where(np.isnan(tss), fallback, tss)
+    return np.nan_to_num(tss, nan=0.0)
+
+
+def get_tss(df, lthr=None, threshold_pace=None, ftp=None):
+    """compute_tss() as a Series aligned with df, cached per data version and thresholds."""
+    key = (data_version(df, [DURATION_COLUMN, HR_COLUMN, PACE_COLUMN] + POWER_COLUMNS), lthr, threshold_pace, ftp)
+    tss = _tss_cache.get_or_compute(key, lambda: compute_tss(df, lthr, threshold_pace, ftp))
+    # Copied so edits to the returned column never reach the cache
+    return pd.Series(tss.copy(), index=df.index)
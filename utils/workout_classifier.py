@@ -0,0 +1,185 @@
+"""
+Columnar workout type classifier.
+
+Vectorized equivalent of
+views.statistics_modules.data_processing.detect_workout_type: the same rules
+in the same priority order, but evaluated over whole columns. Each keyword
+list is compiled into one alternation regex applied with `str.contains`, and
+the pace/distance rules are boolean masks. Labels are identical to the
+row-by-row version.
+
+The activity frame (utils.activity_frame) stores the result once per data
+version as the categorical 'detected_workout_type' column. (It is deliberately
+not called 'workout_type': that name is one of the explicit type columns the
+rules read.)
+
+Usage:
+    from utils.workout_classifier import classify_workout_types
+
+    df['workout_type'] = classify_workout_types(df)
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+WORKOUT_TYPE_LABELS = ['Race', 'Workout', 'Long Run', 'Trail Run', 'Recovery', 'Commute', 'Default']
+
+# Explicit type columns, probed in order; a value that matches no rule falls through to the next column
+TYPE_COLUMNS = ['Workout Type', 'workout_type', 'WorkoutType', 'Type']
+IGNORED_TYPE_VALUES = ['', 'none', 'null', 'default']
+TYPE_RULES = [
+    ('Race', ['race', 'competition', 'event']),
+    ('Workout', ['workout', 'tempo', 'interval', 'speed', 'track', 'fartlek', 'threshold']),
+    ('Long Run', ['long', 'endurance', 'lsd']),
+    ('Commute', ['commute', 'work']),
+]
+TYPE_EXACT_LABELS = ['Race', 'Workout', 'Long Run', 'Commute', 'Default']
+TYPE_DEFAULT_KEYWORDS = ['easy', 'recovery', 'base', 'aerobic']
+
+# Fallback detection from the activity name and description
+NAME_COLUMNS = ['Name', 'Activity Name', 'Activity', 'name']
+RACE_KEYWORDS = [
+    'race', 'marathon', 'half marathon', '10k', '5k', 'parkrun', 'competition',
+    'event', 'championship', 'triathlon', 'ultra', 'trail race', 'road race',
+    'time trial', 'tt', 'fun run', 'charity run'
+]
+WORKOUT_KEYWORDS = [
+    'tempo', 'interval', 'track', 'speed', 'fartlek', 'threshold', 'workout',
+    'repeats', 'splits', 'vo2', 'lactate', 'hill repeats', 'progression',
+    'build', 'negative split', 'pyramid', 'ladder'
+]
+LONG_RUN_KEYWORDS = ['long', 'lsd', 'endurance', 'marathon pace', 'mp']
+COMMUTE_KEYWORDS = ['commute', 'work', 'office', 'home', 'to work', 'from work']
+RECOVERY_KEYWORDS = ['recovery', 'easy', 'shakeout', 'cool down', 'warm up']
+TRAIL_KEYWORDS = ['trail', 'hiking', 'mountain', 'hill', 'forest', 'nature']
+
+WORKOUT_PACE_THRESHOLD = 5.5     # min/km; faster runs over 3 km are workouts
+LONG_RUN_DISTANCE = 15           # km
+SLOW_LONG_RUN_DISTANCE = 12      # km, together with a pace slower than 6:00/km
+SLOW_LONG_RUN_PACE = 6.0
+
+
+def compile_keywords(keywords):
+    """One regex matching any of the keywords as a substring."""
+    return re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+
+
+_TYPE_PATTERNS = [(label, compile_keywords(keywords)) for label, keywords in TYPE_RULES]
+_TYPE_DEFAULT_PATTERN = compile_keywords(TYPE_DEFAULT_KEYWORDS)
+_RACE_PATTERN = compile_keywords(RACE_KEYWORDS)
+_WORKOUT_PATTERN = compile_keywords(WORKOUT_KEYWORDS)
+_LONG_RUN_PATTERN = compile_keywords(LONG_RUN_KEYWORDS)
+_COMMUTE_PATTERN = compile_keywords(COMMUTE_KEYWORDS)
+_RECOVERY_PATTERN = compile_keywords(RECOVERY_KEYWORDS)
+_TRAIL_PATTERN = compile_keywords(TRAIL_KEYWORDS)
+
+
+def _as_text(series):
+    """str(value) for every value, computed once per distinct value."""
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    texts = np.array([str(value) for value in uniques], dtype=object)
+    return pd.Series(texts[codes], index=series.index, dtype=object)
+
+
+def _contains(text_codes, unique_texts, pattern):
+    """Keyword match per row, evaluated once per distinct text."""
+    return unique_texts.str.contains(pattern, regex=True).to_numpy(dtype=bool)[text_codes]
+
+
+def _type_column_labels(unique_values):
+    """Label decided by each distinct value of an explicit type column (None where it decides nothing)."""
+    raw = pd.Series([str(value) for value in unique_values], dtype=object).str.strip()
+    lower = raw.str.lower()
+    usable = (raw != '') & ~lower.isin(IGNORED_TYPE_VALUES)
+
+    decided = pd.Series(None, index=raw.index, dtype=object)
+    for label, pattern in _TYPE_PATTERNS:
+        decided[decided.isna() & usable & lower.str.contains(pattern, regex=True)] = label
+    exact = decided.isna() & usable & raw.isin(TYPE_EXACT_LABELS)
+    decided[exact] = raw[exact]
+    decided[decided.isna() & usable & lower.str.contains(_TYPE_DEFAULT_PATTERN, regex=True)] = 'Default'
+    return decided.to_numpy()
+
+
+def _label_from_type_columns(df, labels):
+    """Apply the explicit type column rules; fill `labels` where a column decides."""
+    for col in TYPE_COLUMNS:
+        if col not in df.columns:
+            continue
+        codes, uniques = pd.factorize(df[col], use_na_sentinel=True)
+        if len(uniques) == 0:
+            continue
+        by_value = _type_column_labels(uniques)
+        # Missing values (code -1) never decide; a value that matches nothing falls through to the next column
+        decided = np.where(codes >= 0, by_value[codes], None)
+        take = pd.isna(labels) & ~pd.isna(decided)
+        labels[take] = decided[take]
+
+
+def _full_text(df):
+    """'<name> <description>' in lower case, as the row-by-row detector builds it."""
+    name = pd.Series('', index=df.index, dtype=object)
+    unset = np.ones(len(df), dtype=bool)
+    for col in NAME_COLUMNS:
+        if col not in df.columns:
+            continue
+        take = unset & df[col].notna().to_numpy()
+        if take.any():
+            name[take] = _as_text(df[col][take]).str.lower().to_numpy()
+            unset &= ~take
+    if 'Description' in df.columns:
+        description = _as_text(df['Description']).str.lower()
+    else:
+        description = pd.Series('', index=df.index, dtype=object)
+    return (name + ' ' + description).str.lower()
+
+
+def classify_workout_types(df):
+    """
+    Classify every activity in `df` into a workout type.
+
+    Args:
+        df: Activity DataFrame (uses the type, name, description,
+            'Distance (km)' and 'pace_minutes' columns when present)
+
+    Returns:
+        Categorical Series of labels from WORKOUT_TYPE_LABELS, aligned with df
+    """
+    labels = np.full(len(df), None, dtype=object)
+    if len(df) == 0:
+        return pd.Series(pd.Categorical([], categories=WORKOUT_TYPE_LABELS), index=df.index)
+
+    _label_from_type_columns(df, labels)
+
+    text_codes, unique_texts = pd.factorize(_full_text(df))
+    unique_texts = pd.Series(unique_texts, dtype=object)
+    if 'Distance (km)' in df.columns:
+        distance = pd.to_numeric(df['Distance (km)'], errors='coerce').to_numpy()
+    else:
+        distance = np.zeros(len(df))
+    if 'pace_minutes' in df.columns:
+        pace = pd.to_numeric(df['pace_minutes'], errors='coerce').to_numpy()
+    else:
+        pace = np.full(len(df), np.nan)
+    # The row-by-row rules skip a pace of 0 (falsy); NaN fails every comparison anyway
+    has_pace = (pace != 0) & ~np.isnan(pace)
+
+    rules = [
+        ('Race', _contains(text_codes, unique_texts, _RACE_PATTERN)),
+        ('Workout', _contains(text_codes, unique_texts, _WORKOUT_PATTERN)),
+        ('Workout', has_pace & (distance > 3) & (pace < WORKOUT_PACE_THRESHOLD)),
+        ('Long Run', _contains(text_codes, unique_texts, _LONG_RUN_PATTERN)),
+        ('Long Run', distance > LONG_RUN_DISTANCE),
+        ('Long Run', (distance > SLOW_LONG_RUN_DISTANCE) & has_pace & (pace > SLOW_LONG_RUN_PACE)),
+        ('Commute', _contains(text_codes, unique_texts, _COMMUTE_PATTERN)),
+        ('Recovery', _contains(text_codes, unique_texts, _RECOVERY_PATTERN)),
+        ('Trail Run', _contains(text_codes, unique_texts, _TRAIL_PATTERN)),
+    ]
+    undecided = pd.isna(labels)
+    fallback = np.select([mask for _, mask in rules], [label for label, _ in rules], default='Default')
+    labels[undecided] = fallback[undecided]
+
+    categories = WORKOUT_TYPE_LABELS + sorted(set(labels) - set(WORKOUT_TYPE_LABELS))
+    return pd.Series(pd.Categorical(labels, categories=categories), index=df.index)
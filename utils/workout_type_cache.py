@@ -0,0 +1,124 @@
+"""
+Per-user, content-addressed cache of workout type labels.
+
+Every activity is keyed by its identity ('Activity ID', or the date when the
+sheet has no ID column) plus a hash of the columns the classifier reads (type,
+name, description, distance and pace). An edited activity therefore gets a new
+key. A changed sheet needs no explicit invalidation: rows whose inputs changed
+simply miss the cache, and their stale entries age out of the LRU.
+
+Each user has their own bounded LRU, and the number of users kept is bounded
+too, so nothing is shared between sessions of different users.
+
+Usage:
+    from utils.workout_type_cache import cached_workout_types, get_workout_type_cache_stats
+
+    df['detected_workout_type'] = cached_workout_types(df, user_key)
+    get_workout_type_cache_stats(user_key)   # {'size': ..., 'hits': ..., 'hit_rate': ...}
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.lru_cache import BoundedLRUCache
+from utils.workout_classifier import (
+    WORKOUT_TYPE_LABELS,
+    TYPE_COLUMNS,
+    NAME_COLUMNS,
+    classify_workout_types,
+)
+
+WORKOUT_TYPE_CACHE_SIZE = 20000    # activities per user
+MAX_CACHED_USERS = 64
+
+ID_COLUMN = 'Activity ID'
+DATE_COLUMN = 'Date'
+INPUT_COLUMNS = TYPE_COLUMNS + NAME_COLUMNS + ['Description', 'Distance (km)', 'pace_minutes']
+
+_MISSING = object()
+_user_caches = BoundedLRUCache(maxsize=MAX_CACHED_USERS)
+_user_caches_lock = threading.Lock()
+
+
+def _cache_for(user_key):
+    with _user_caches_lock:
+        cache = _user_caches.get(user_key)
+        if cache is None:
+            cache = BoundedLRUCache(maxsize=WORKOUT_TYPE_CACHE_SIZE)
+            _user_caches.put(user_key, cache)
+        return cache
+
+
+def activity_cache_keys(df):
+    """
+    Cache key of every activity in `df`.
+
+    Args:
+        df: Activity DataFrame
+
+    Returns:
+        List of (identity, input hash) tuples, aligned with df
+    """
+    inputs = [col for col in INPUT_COLUMNS if col in df.columns]
+    # The column names are part of the content: adding a Description column changes every label input
+    schema = hash(tuple(inputs))
+    if inputs:
+        hashes = pd.util.hash_pandas_object(df[inputs], index=False).to_numpy()
+        row_hashes = (hashes ^ np.uint64(schema & 0xFFFFFFFFFFFFFFFF)).tolist()
+    else:
+        row_hashes = [schema] * len(df)
+
+    # NaN never equals itself, so activities without an ID fall back to their date, then to None
+    identity = pd.Series(None, index=df.index, dtype=object)
+    if ID_COLUMN in df.columns:
+        identity = df[ID_COLUMN].astype(object)
+    if DATE_COLUMN in df.columns:
+        identity = identity.where(identity.notna(), df[DATE_COLUMN].astype(object))
+    identities = identity.where(identity.notna(), None).tolist()
+    return list(zip(identities, row_hashes))
+
+
+def cached_workout_types(df, user_key):
+    """
+    Workout type of every activity, classifying only activities not seen before.
+
+    Args:
+        df: Activity DataFrame (with 'pace_minutes' when pace rules should apply)
+        user_key: Owner of the cache entries
+
+    Returns:
+        Categorical Series of labels, aligned with df (same labels as
+        utils.workout_classifier.classify_workout_types)
+    """
+    cache = _cache_for(user_key)
+    keys = activity_cache_keys(df)
+    labels = np.array([cache.get(key, _MISSING) for key in keys], dtype=object)
+
+    missing = np.flatnonzero([label is _MISSING for label in labels])
+    if len(missing):
+        fresh = classify_workout_types(df.iloc[missing]).to_numpy(dtype=object)
+        labels[missing] = fresh
+        for position, label in zip(missing.tolist(), fresh):
+            cache.put(keys[position], label)
+
+    categories = WORKOUT_TYPE_LABELS + sorted(set(labels) - set(WORKOUT_TYPE_LABELS))
+    return pd.Series(pd.Categorical(labels, categories=categories), index=df.index)
+
+
+def get_workout_type_cache_stats(user_key):
+    """Return size and hit/miss counters of a user's workout type cache (None if it has none)."""
+    cache = _user_caches.get(user_key)
+    return cache.stats() if cache is not None else None
+
+
+def clear_workout_type_cache(user_key=None):
+    """Drop one user's cached labels, or every user's when user_key is None."""
+    with _user_caches_lock:
+        if user_key is None:
+            _user_caches.clear()
+            return
+        cache = _user_caches.get(user_key)
+        if cache is not None:
+            cache.clear()
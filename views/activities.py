@@ -12,7 +12,8 @@ from streamlit_javascript import st_javascript
 import folium
 from streamlit_folium import st_folium
 import polyline
-from utils.gist_helpers import load_gist_data, save_gist_data
+from utils.gist_shards import read_user_domain, update_user_domain
+from utils.hr_zones import profile_zones, assign_zones
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
@@ -40,11 +41,7 @@ def format_pace(p):
 # Function to load saved analyses from Gist
 def load_saved_analyses(user_info, gist_id, filename, token):
     try:
-        data = load_gist_data(gist_id, filename, token)
-        user_key = user_info["USER_KEY"]
-        if user_key not in data:
-            data[user_key] = {"races": [], "training_plans": {}, "progress_feedback": {}, "activity_analyses": {}}
-        return data[user_key].get("activity_analyses", {})
+        return read_user_domain(gist_id, token, user_info["USER_KEY"], "activity_analyses", {})
     except Exception as e:
         st.error(f"Error loading analyses: {e}")
         return {}
@@ -52,15 +49,11 @@ def load_saved_analyses(user_info, gist_id, filename, token):
 # Function to save analyses to Gist
 def save_analysis(key, content, user_info, gist_id, filename, token):
     try:
-        data = load_gist_data(gist_id, filename, token)
-        user_key = user_info["USER_KEY"]
-        if user_key not in data:
-            data[user_key] = {"races": [], "training_plans": {}, "progress_feedback": {}, "activity_analyses": {}}
-        
-        data[user_key].setdefault("activity_analyses", {})
-        data[user_key]["activity_analyses"][key] = content
-        
-        save_gist_data(gist_id, filename, token, data)
+        def mutation(shard):
+            shard.setdefault("activity_analyses", {})[key] = content
+
+        # Only the activity_analyses shard is sent
+        update_user_domain(gist_id, token, user_info["USER_KEY"], "activity_analyses", mutation)
         return True
     except Exception as e:
         st.error(f"Error saving analysis: {e}")
@@ -69,11 +62,10 @@ def save_analysis(key, content, user_info, gist_id, filename, token):
 # Function to delete analysis from Gist
 def delete_analysis(key, user_info, gist_id, filename, token):
     try:
-        data = load_gist_data(gist_id, filename, token)
-        user_key = user_info["USER_KEY"]
-        if user_key in data and "activity_analyses" in data[user_key]:
-            data[user_key]["activity_analyses"].pop(key, None)
-            save_gist_data(gist_id, filename, token, data)
+        def mutation(shard):
+            shard.setdefault("activity_analyses", {}).pop(key, None)
+
+        update_user_domain(gist_id, token, user_info["USER_KEY"], "activity_analyses", mutation)
         return True
     except Exception as e:
         st.error(f"Error deleting analysis: {e}")
@@ -124,6 +116,15 @@ def get_selected_row(df, selected_rows):
             return df[match].iloc[0]
     return None
 
+def format_hr_with_zone(avg_hr):
+    """Avg HR with the runner profile zone it falls in, e.g. '152 · Z3'."""
+    hr = pd.to_numeric(pd.Series([avg_hr]), errors='coerce').to_numpy(dtype='float64')
+    if pd.isna(hr[0]):
+        return avg_hr
+    zones = profile_zones(st.session_state.get('user_info', {}).get('runner_profile', {}))
+    zone = assign_zones(hr, zones)[0]
+    return f"{avg_hr} · Z{zone + 1}" if zone >= 0 else avg_hr
+
 def render_summary_metrics(selected_row):
     day_str = selected_row['Date'].strftime('%A')
     date_str = selected_row['Date'].strftime('%Y-%m-%d')
@@ -259,7 +260,7 @@ def render_summary_metrics(selected_row):
             </div>
             <div class="metric-card">
                 <div class="metric-label">❤️ Avg HR</div>
-                <div class="metric-value">{selected_row.get('Avg HR', '-')}</div>
+                <div class="metric-value">{format_hr_with_zone(selected_row.get('Avg HR', '-'))}</div>
             </div>
             <div class="metric-card">
                 <div class="metric-label">💖 Max HR</div>
@@ -8,7 +8,15 @@ import json
 from openai import OpenAI
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from version import APP_VERSION, APP_VERSION_COLOR, APP_VERSION_STYLE
-from utils.gist_helpers import load_gist_data, save_gist_data
+from utils.gist_shards import read_user_domain, update_user_domain
+from utils.date_parser import parse_training_date
+from utils.tss import get_tss
+from utils.fitness_fatigue import (
+    ATL_DAYS, CTL_DAYS, update_fitness_state, fitness_series, fitness_at, latest_fitness,
+    personal_if_series, personal_if_at
+)
+from utils.plan_projection import get_compiled_plan, project_plan, plan_week_breakdown
+from utils.hr_zones import profile_zones, zone_label, get_zone_index, zone_totals_by_period
 
 # Initialize OpenAI client
 try:
@@ -18,19 +26,10 @@ except Exception:
 
 # Function to load saved fatigue analyses from user's gist
 def load_saved_fatigue_analyses(user_info, gist_id, filename, token):
-    data = load_gist_data(gist_id, filename, token)
     user_key = user_info["USER_KEY"]
     
-    # Ensure user data structure exists
-    if user_key not in data:
-        data[user_key] = {}
-    
-    # Ensure fatigue_analyses key exists
-    if "fatigue_analyses" not in data[user_key]:
-        data[user_key]["fatigue_analyses"] = {}
-    
-    # Get the analyses
-    analyses = data[user_key].get("fatigue_analyses", {})
+    # Get the analyses from the user's fatigue_analyses shard
+    analyses = read_user_domain(gist_id, token, user_key, "fatigue_analyses", {})
     
     # Convert old format to new format if needed
     updated = False
@@ -46,8 +45,13 @@ def load_saved_fatigue_analyses(user_info, gist_id, filename, token):
     
     # Save the updated structure if we made changes
     if updated:
+        converted = dict(analyses)
+
+        def mutation(shard):
+            shard["fatigue_analyses"] = dict(converted)
+
         try:
-            save_gist_data(gist_id, filename, token, data)
+            update_user_domain(gist_id, token, user_key, "fatigue_analyses", mutation)
         except Exception:
             pass  # Silently fail if we can't update the structure
         
@@ -56,11 +60,12 @@ def load_saved_fatigue_analyses(user_info, gist_id, filename, token):
 # Function to delete fatigue analysis from Gist
 def delete_fatigue_analysis(key, user_info, gist_id, filename, token):
     try:
-        data = load_gist_data(gist_id, filename, token)
         user_key = user_info["USER_KEY"]
-        if user_key in data and "fatigue_analyses" in data[user_key]:
-            data[user_key]["fatigue_analyses"].pop(key, None)
-            save_gist_data(gist_id, filename, token, data)
+
+        def mutation(shard):
+            shard.setdefault("fatigue_analyses", {}).pop(key, None)
+
+        update_user_domain(gist_id, token, user_key, "fatigue_analyses", mutation)
         return True
     except Exception as e:
         st.error(f"Error deleting fatigue analysis: {e}")
@@ -70,17 +75,7 @@ def delete_fatigue_analysis(key, user_info, gist_id, filename, token):
 def save_fatigue_analysis(key, content, user_info, gist_id, filename, token):
     try:
         from datetime import datetime
-        # Get the current data
-        data = load_gist_data(gist_id, filename, token)
         user_key = user_info["USER_KEY"]
-        
-        # Ensure user data structure exists
-        if user_key not in data:
-            data[user_key] = {}
-            
-        # Ensure fatigue_analyses key exists
-        if "fatigue_analyses" not in data[user_key]:
-            data[user_key]["fatigue_analyses"] = {}
             
         # Create analysis entry with metadata
         analysis_entry = {
@@ -89,132 +84,30 @@ def save_fatigue_analysis(key, content, user_info, gist_id, filename, token):
             'analysis_key': key
         }
         
-        # Update the fatigue analysis
-        data[user_key]["fatigue_analyses"][key] = analysis_entry
+        def mutation(shard):
+            # Update the fatigue analysis
+            shard.setdefault("fatigue_analyses", {})[key] = dict(analysis_entry)
         
-        # Save the updated data
-        success = save_gist_data(gist_id, filename, token, data)
+        # Queue the update; only the fatigue_analyses shard is sent
+        success = update_user_domain(gist_id, token, user_key, "fatigue_analyses", mutation)
         return success
     except Exception as e:
         st.error(f"Error saving fatigue analysis: {e}")
         return False
 
-def calculate_personal_if(df, weeks_back=4):
-    """
-    Calculate the user's personal average intensity factor from recent training data.
-    
-    Args:
-        df: DataFrame with Date, Distance, TSS columns
-        weeks_back: Number of weeks to look back for calculation
-        
-    Returns:
-        float: Average intensity factor, or 0.80 if insufficient data
-    """
-    if df.empty or 'TSS' not in df.columns:
-        return 0.80  # Default fallback
-    
-    # Get recent data
-    cutoff_date = df['Date'].max() - timedelta(days=weeks_back * 7)
-    recent_df = df[df['Date'] >= cutoff_date].copy()
-    
-    # Filter out rest days and very low TSS days
-    recent_df = recent_df[(recent_df['TSS'] > 5) & (recent_df.get('Distance (km)', 0) > 1)]
-    
-    if len(recent_df) < 3:  # Need at least 3 data points
-        return 0.80
-    
-    intensity_factors = []
-    base_factor = 6  # Same as used in estimation
-    
-    for _, row in recent_df.iterrows():
-        tss = row['TSS']
-        distance = row.get('Distance (km)', 0)
-        
-        if distance > 0 and tss > 0:
-            # Reverse engineer IF from actual data: IF = sqrt(TSS / (distance * base_factor))
-            calculated_if = (tss / (distance * base_factor)) ** 0.5
-            
-            # Only include reasonable IF values (0.5 to 1.2)
-            if 0.5 <= calculated_if <= 1.2:
-                intensity_factors.append(calculated_if)
-    
-    if len(intensity_factors) >= 3:
-        avg_if = sum(intensity_factors) / len(intensity_factors)
-        return min(max(avg_if, 0.65), 1.05)  # Clamp between reasonable bounds
-    else:
-        return 0.80  # Default fallback
-
-def estimate_tss_from_workout(distance, description):
-    """
-    Estimate TSS from workout distance and description using intensity factors.
-    
-    TSS = Duration (hours) × Intensity Factor² × 100
-    
-    For running without duration, we estimate based on typical paces:
-    TSS ≈ Distance (km) × Intensity Factor² × 6 (assuming ~6 min/km base pace)
-    """
-    if distance <= 0:
-        return 0
-    
-    description_lower = description.lower()
-    
-    # Determine intensity factor based on workout description
-    if any(keyword in description_lower for keyword in ['rest', 'off', 'recovery', 'easy recovery']):
-        intensity_factor = 0.0  # Rest day
-    elif any(keyword in description_lower for keyword in ['recovery run', 'very easy', 'zone 1']):
-        intensity_factor = 0.65  # Very easy recovery
-    elif any(keyword in description_lower for keyword in ['easy', 'zone 2', 'conversational', 'aerobic']):
-        intensity_factor = 0.75  # Easy/aerobic pace
-    elif any(keyword in description_lower for keyword in ['long run', 'long', 'endurance']):
-        # Long runs are typically easy but longer duration adds stress
-        intensity_factor = 0.78  # Slightly higher than easy due to duration
-    elif any(keyword in description_lower for keyword in ['tempo', 'threshold', 'comfortably hard', 'zone 4']):
-        intensity_factor = 0.90  # Tempo/threshold pace
-    elif any(keyword in description_lower for keyword in ['interval', 'repeat', 'vo2', 'zone 5', '5k pace', '10k pace']):
-        intensity_factor = 1.05  # VO2 max intervals
-    elif any(keyword in description_lower for keyword in ['fartlek', 'progression', 'build', 'moderate']):
-        intensity_factor = 0.85  # Mixed intensity
-    elif any(keyword in description_lower for keyword in ['race', 'time trial', 'test']):
-        intensity_factor = 1.0  # Race effort
-    elif any(keyword in description_lower for keyword in ['hill', 'climb', 'uphill']):
-        intensity_factor = 0.95  # Hill work is intense
-    elif any(keyword in description_lower for keyword in ['strides', 'pickup', 'surge']):
-        intensity_factor = 0.80  # Easy run with strides
-    else:
-        # Default to moderate effort if we can't determine intensity
-        intensity_factor = 0.80
-    
-    # Estimate TSS using: Distance × IF² × Base factor
-    # Base factor assumes ~6 min/km average pace → 0.1 hours per km
-    base_factor = 6  # Represents: 0.1 hours × 100 × 0.6 (time adjustment)
-    estimated_tss = distance * (intensity_factor ** 2) * base_factor
-    
-    return max(0, estimated_tss)
-
 def calculate_tss(duration_hrs, intensity_factor):
     return duration_hrs * (intensity_factor ** 2) * 100
 
-def calculate_tss_from_hr(row, lthr):
-    # Calculate Intensity Factor (IF) from Avg HR and LTHR
-    try:
-        avg_hr = float(row.get("Avg HR", 0))
-        elapsed_min = float(row.get("Elapsed Time (min)", 0))
-        if lthr and avg_hr > 0 and elapsed_min > 0:
-            IF = avg_hr / lthr
-            duration_hr = elapsed_min / 60.0
-            tss = duration_hr * (IF ** 2) * 100
-            return tss
-        else:
-            return 0.0
-    except Exception:
-        return 0.0
-
-def calculate_atl_ctl_tsb(df, atl_days=7, ctl_days=42):
+def calculate_atl_ctl_tsb(df, atl_days=ATL_DAYS, ctl_days=CTL_DAYS, state=None):
     # Assumes df has columns: Date, TSS
+    # Every activity gets the end-of-day values of the daily series (rest days included, see utils.fitness_fatigue)
     df = df.sort_values("Date").copy()
-    df["ATL"] = df["TSS"].ewm(span=atl_days, adjust=False).mean()
-    df["CTL"] = df["TSS"].ewm(span=ctl_days, adjust=False).mean()
-    df["TSB"] = df["CTL"] - df["ATL"]
+    if state is None:
+        state = update_fitness_state(df, atl_days=atl_days, ctl_days=ctl_days)
+    values = fitness_at(state, df["Date"])
+    df["ATL"] = values["ATL"]
+    df["CTL"] = values["CTL"]
+    df["TSB"] = values["TSB"]
     return df
 
 def generate_fatigue_prompt(df, runner_profile, fatigue_metrics, selected_range, today):
@@ -702,12 +595,17 @@ def render_fatigue_analysis(df, today, user_info, gist_id, gist_filename, github
     selected_range = st.radio("Time Range Selection", range_options, index=1, horizontal=True, label_visibility="collapsed")
     st.markdown('</div>', unsafe_allow_html=True)
 
+    # Zone totals of any period are two lookups in the zone index shared with the statistics view
+    zones = profile_zones(runner_profile)
+    zone_index = get_zone_index(df, zones) if "Avg HR" in df.columns else None
+
     # Data preparation (unchanged logic)
     df = df.copy()
     
     if "TSS" not in df.columns:
         if "Avg HR" in df.columns and "Elapsed Time (min)" in df.columns:
-            df["TSS"] = df.apply(lambda row: calculate_tss_from_hr(row, lthr), axis=1)
+            # Columnar hrTSS, cached per data version and LTHR
+            df["TSS"] = get_tss(df, lthr=lthr)
         elif "Duration (hrs)" in df.columns and "IF" in df.columns:
             df["TSS"] = calculate_tss(df["Duration (hrs)"], df["IF"])
         else:
@@ -723,7 +621,11 @@ def render_fatigue_analysis(df, today, user_info, gist_id, gist_filename, github
         st.warning("No valid TSS data found. Please check your activity data.")
         st.stop()
     
-    df = calculate_atl_ctl_tsb(df)
+    # The daily ATL/CTL series is kept per user and only advanced over new or changed days
+    fitness_state = update_fitness_state(df, user_info.get("USER_KEY"), through=today)
+    # Weekly personal IF over the whole history, for projections from any point in time
+    personal_if_weekly = personal_if_series(df)
+    df = calculate_atl_ctl_tsb(df, state=fitness_state)
     df = df.dropna(subset=["Date"]).sort_values("Date")
     
     # Verify fatigue metrics were calculated
@@ -731,9 +633,12 @@ def render_fatigue_analysis(df, today, user_info, gist_id, gist_filename, github
         st.error("Failed to calculate fatigue metrics (CTL, ATL, TSB). Please check your TSS data.")
         st.stop()
     
+    min_date = None
     if range_days[selected_range]:
         min_date = today - timedelta(days=range_days[selected_range])
         df = df[df["Date"] >= min_date]
+    # Dense daily lines for the chart, sliced from the stored series
+    daily_df = fitness_series(fitness_state, start=min_date)
     
     # Final check that we still have data after filtering
     if df.empty:
@@ -755,6 +660,15 @@ def render_fatigue_analysis(df, today, user_info, gist_id, gist_filename, github
         predict_future = st.checkbox("🔮 Predict future fatigue based on race plan", value=False, 
                                     help="Projects CTL, ATL, TSB into the future using your current race training plan")
 
+    if zone_index is not None:
+        with st.expander("❤️ Time in HR Zones", expanded=False):
+            zone_periods = {"Last 7 Days": today - timedelta(days=7), "Last 4 Weeks": today - timedelta(days=28), selected_range: min_date}
+            zone_table = pd.DataFrame({"Zone": [zone_label(zone).replace("\n", " ") for zone in zones]})
+            for label, totals in zip(zone_periods, zone_totals_by_period(zone_index, list(zone_periods.values()))):
+                zone_table[label] = [f"{minutes / 60:.1f} h ({runs} runs)" for minutes, runs in zip(totals['minutes'], totals['runs'])]
+            st.dataframe(zone_table, hide_index=True, use_container_width=True)
+            st.caption("Moving time per zone; zones come from your runner profile.")
+
     st.markdown('<div class="section-separator"></div>', unsafe_allow_html=True)
 
     # Future fatigue prediction logic
@@ -776,80 +690,32 @@ def render_fatigue_analysis(df, today, user_info, gist_id, gist_filename, github
                     if 'weeks' in plan and plan['weeks']:
                         # Find the race with the latest start date
                         first_week = plan['weeks'][0]
-                        raw_start_date = first_week.get('start_date', '')
-                        
-                        # Determine the date format for this plan
-                        detected_format = None
-                        start_date_ts = None
-                        for date_format in ['%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%Y/%m/%d']:
-                            try:
-                                start_date_ts = pd.to_datetime(raw_start_date, format=date_format, errors='raise')
-                                detected_format = date_format
-                                break
-                            except Exception:
-                                continue
+                        # Shared, memoized parser: each distinct start_date string is parsed once per process
+                        start_date = parse_training_date(first_week.get('start_date', ''))
                         
-                        # If no format worked, try general parsing
-                        if start_date_ts is None or pd.isna(start_date_ts):
-                            try:
-                                start_date_ts = pd.to_datetime(raw_start_date, errors='coerce')
-                                if not pd.isna(start_date_ts):
-                                    pass
-                            except Exception:
-                                pass
-                        
-                        # Skip if date is still invalid
-                        if start_date_ts is None or pd.isna(start_date_ts):
+                        # Skip if date is invalid
+                        if start_date is None:
                             continue
                         
-                        start_date = start_date_ts.date()
                         if latest_race_date is None or start_date > latest_race_date:
                             latest_race_date = start_date
                             active_plan = plan
-                            active_plan['_detected_format'] = detected_format  # Store the detected format
                 
                 if active_plan and 'weeks' in active_plan:
-                    # Initialize variables early to avoid scope issues
-                    last_date = df['Date'].max().date() if not df.empty else today
-                    last_ctl = df['CTL'].iloc[-1] if not df.empty else 0
-                    last_atl = df['ATL'].iloc[-1] if not df.empty else 0
+                    # Compiled once per plan version into daily planned distance and workout flags
+                    compiled_plan = get_compiled_plan(active_plan)
                     
-                    # Calculate user's personal average intensity factor from recent data
-                    personal_if = calculate_personal_if(df, weeks_back=4)
+                    # Project from the last day of the stored daily fitness series
+                    latest_state = latest_fitness(fitness_state)
+                    last_date = latest_state['Date'].date() if latest_state else today
+                    last_ctl = latest_state['CTL'] if latest_state else 0
+                    last_atl = latest_state['ATL'] if latest_state else 0
                     
-                    # Generate future fatigue data
-                    future_data = []
-                    weekly_breakdown = []  # For debugging
+                    # Calculate user's personal average intensity factor from recent data
+                    personal_if = personal_if_at(personal_if_weekly, df['Date'].max())
                     
                     # Validate training plan dates for sequential order
-                    plan_dates = []
-                    detected_format = active_plan.get('_detected_format')
-                    
-                    for week in active_plan['weeks']:
-                        raw_week_date = week.get('start_date', '')
-                        if raw_week_date:
-                            # Use the detected format first, then try others as fallback
-                            week_start_ts = None
-                            
-                            if detected_format:
-                                try:
-                                    week_start_ts = pd.to_datetime(raw_week_date, format=detected_format, errors='raise')
-                                except Exception:
-                                    pass
-                            
-                            # If detected format failed, try others
-                            if week_start_ts is None or pd.isna(week_start_ts):
-                                for date_format in ['%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%Y/%m/%d']:
-                                    if date_format == detected_format:
-                                        continue  # Already tried
-                                    try:
-                                        week_start_ts = pd.to_datetime(raw_week_date, format=date_format, errors='raise')
-                                        break
-                                    except Exception:
-                                        continue
-                            
-                            if week_start_ts and not pd.isna(week_start_ts):
-                                plan_dates.append((week.get('week_number', '?'), week_start_ts.date(), raw_week_date))
+                    plan_dates = [(week['week_number'], week['start'], week['raw_start']) for week in compiled_plan['weeks']]
                     
                     # Check for date inconsistencies
                     if len(plan_dates) > 1:
@@ -871,203 +737,19 @@ def render_fatigue_analysis(df, today, user_info, gist_id, gist_filename, github
                                 st.warning(f"• ... and {len(non_sequential) - 5} more issues")
                             st.warning("📝 **Recommendation:** Check your race planning data for incorrect dates. The prediction may be inaccurate.")
                     
-                    # First, fill any gap between last data and first training plan week
-                    first_plan_date = None
-                    for week in active_plan['weeks']:
-                        raw_week_date = week.get('start_date', '')
-                        
-                        # Use the detected format first, then try others as fallback
-                        week_start_ts = None
-                        
-                        if detected_format:
-                            try:
-                                week_start_ts = pd.to_datetime(raw_week_date, format=detected_format, errors='raise')
-                            except Exception:
-                                pass
-                        
-                        # If detected format failed, try others
-                        if week_start_ts is None or pd.isna(week_start_ts):
-                            for date_format in ['%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%Y/%m/%d']:
-                                if date_format == detected_format:
-                                    continue  # Already tried
-                                try:
-                                    week_start_ts = pd.to_datetime(raw_week_date, format=date_format, errors='raise')
-                                    break
-                                except Exception:
-                                    continue
-                        
-                        # If no format worked, try general parsing
-                        if week_start_ts is None or pd.isna(week_start_ts):
-                            try:
-                                week_start_ts = pd.to_datetime(raw_week_date, errors='coerce')
-                            except Exception:
-                                pass
-                        
-                        # Skip if date is invalid
-                        if week_start_ts is None or pd.isna(week_start_ts):
-                            continue
-                        
-                        week_start = week_start_ts.date()
-                        if week_start > last_date:
-                            first_plan_date = week_start
-                            break
-                    
-                    # Fill gap with low TSS rest days if there's a gap > 1 day
-                    if first_plan_date and (first_plan_date - last_date).days > 1:
-                        gap_days = (first_plan_date - last_date).days - 1
-                        for i in range(1, gap_days):  # Start from day after last_date
-                            gap_date = last_date + timedelta(days=i)
-                            # Assume rest days in the gap
-                            gap_tss = 0
-                            
-                            # Calculate projected CTL and ATL with rest days
-                            alpha_ctl = 2 / (42 + 1)
-                            alpha_atl = 2 / (7 + 1)
-                            
-                            new_ctl = last_ctl * (1 - alpha_ctl) + gap_tss * alpha_ctl
-                            new_atl = last_atl * (1 - alpha_atl) + gap_tss * alpha_atl
-                            new_tsb = new_ctl - new_atl
-                            
-                            future_data.append({
-                                'Date': pd.Timestamp(gap_date),
-                                'TSS': gap_tss,
-                                'CTL': new_ctl,
-                                'ATL': new_atl,
-                                'TSB': new_tsb,
-                                'is_prediction': True
-                            })
-                            
-                            last_ctl = new_ctl
-                            last_atl = new_atl
+                    # Days between the last known day and the plan are projected as rest days
+                    first_plan_date = compiled_plan['start'] if compiled_plan['start'] and compiled_plan['start'] > last_date else None
                     
-                    # Project each week from the training plan
-                    for week in active_plan['weeks']:
-                        raw_week_date = week.get('start_date', '')
-                        week_number = week.get('week_number', '?')
-                        
-                        # Use the detected format first, then try others as fallback
-                        week_start_ts = None
-                        
-                        if detected_format:
-                            try:
-                                week_start_ts = pd.to_datetime(raw_week_date, format=detected_format, errors='raise')
-                            except Exception:
-                                pass
-                        
-                        # If detected format failed, try others
-                        if week_start_ts is None or pd.isna(week_start_ts):
-                            for date_format in ['%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%Y/%m/%d']:
-                                if date_format == detected_format:
-                                    continue  # Already tried
-                                try:
-                                    week_start_ts = pd.to_datetime(raw_week_date, format=date_format, errors='raise')
-                                    break
-                                except Exception:
-                                    continue
-                        
-                        # If no format worked, try general parsing
-                        if week_start_ts is None or pd.isna(week_start_ts):
-                            try:
-                                week_start_ts = pd.to_datetime(raw_week_date, errors='coerce')
-                            except Exception:
-                                pass
-                        
-                        # Skip if date is invalid
-                        if week_start_ts is None or pd.isna(week_start_ts):
-                            continue
-                        
-                        week_start = week_start_ts.date()
-                        week_end_date = week_start + timedelta(days=6)
-                        
-                        # Include this week if it contains any future days
-                        if week_end_date > last_date:
-                            # Calculate weekly TSS from planned training using personal IF
-                            weekly_tss = 0
-                            week_details = []
-                            days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-                            
-                            for day_idx, day in enumerate(days):
-                                current_day_date = week_start + timedelta(days=day_idx)
-                                
-                                # Only include days that are in the future
-                                if current_day_date > last_date:
-                                    day_plan = week.get(day, {})
-                                    distance = float(day_plan.get('distance', 0))
-                                    description = day_plan.get('description', '')
-                                    
-                                    # Use personal IF for all non-rest workouts
-                                    if distance > 0:
-                                        # Still check for rest days
-                                        if any(keyword in description.lower() for keyword in ['rest', 'off']):
-                                            estimated_tss = 0
-                                        else:
-                                            # Use personal IF for all actual workouts
-                                            base_factor = 6
-                                            estimated_tss = distance * (personal_if ** 2) * base_factor
-                                        
-                                        weekly_tss += estimated_tss
-                                        week_details.append(f"{day.title()}: {distance}km ({description[:20]}...) = {estimated_tss:.0f} TSS")
-                            
-                            # Only add week to breakdown if it has future training
-                            if weekly_tss > 0 or week_details:
-                                weekly_breakdown.append({
-                                    'week': f"Week {week_number}",
-                                    'start_date': week_start.strftime('%b %d'),
-                                    'total_tss': weekly_tss,
-                                    'details': week_details
-                                })
-                            
-                            # Create daily projections for future days in this week
-                            for day_idx, day in enumerate(days):
-                                current_day_date = week_start + timedelta(days=day_idx)
-                                
-                                # Only create predictions for future days
-                                if current_day_date > last_date:
-                                    day_plan = week.get(day, {})
-                                    distance = float(day_plan.get('distance', 0))
-                                    description = day_plan.get('description', '')
-                                    
-                                    # Calculate daily TSS
-                                    if distance > 0:
-                                        if any(keyword in description.lower() for keyword in ['rest', 'off']):
-                                            daily_tss = 0
-                                        else:
-                                            base_factor = 6
-                                            daily_tss = distance * (personal_if ** 2) * base_factor
-                                    else:
-                                        daily_tss = 0
-                                    
-                                    # Calculate projected CTL and ATL
-                                    alpha_ctl = 2 / (42 + 1)
-                                    alpha_atl = 2 / (7 + 1)
-                                    
-                                    new_ctl = last_ctl * (1 - alpha_ctl) + daily_tss * alpha_ctl
-                                    new_atl = last_atl * (1 - alpha_atl) + daily_tss * alpha_atl
-                                    new_tsb = new_ctl - new_atl
-                                    
-                                    future_data.append({
-                                        'Date': pd.Timestamp(current_day_date),
-                                        'TSS': daily_tss,
-                                        'CTL': new_ctl,
-                                        'ATL': new_atl,
-                                        'TSB': new_tsb,
-                                        'is_prediction': True,
-                                        'Distance (km)': distance,  # Add planned distance for overlay
-                                        'Planned_Distance': distance  # Alternative column name
-                                    })
-                                    
-                                    last_ctl = new_ctl
-                                    last_atl = new_atl
-                        
-                        else:
-                            pass
+                    # ATL/CTL advance over the planned TSS as one recurrence
+                    df_future = project_plan(compiled_plan, personal_if, last_date, last_atl, last_ctl)
+                    future_data = df_future if not df_future.empty else None
+                    weekly_breakdown = plan_week_breakdown(compiled_plan, personal_if, last_date)
                     
-                    if future_data:
+                    if future_data is not None:
                         # Combine historical and future data
                         df_historical = df.copy()
                         df_historical['is_prediction'] = False
                         
-                        df_future = pd.DataFrame(future_data)
                         df_extended = pd.concat([df_historical, df_future], ignore_index=True)
                         df_extended = df_extended.sort_values('Date').reset_index(drop=True)
                         
@@ -1142,12 +824,13 @@ def render_fatigue_analysis(df, today, user_info, gist_id, gist_filename, github
     else:
         x_axis = alt.Axis(title="Date", format="%Y", labelAngle=0, labelOverlap=True, tickCount="year")
 
-    base = alt.Chart(chart_df).encode(x=alt.X("Date:T", axis=x_axis))
+    # Fitness lines are drawn from the dense daily series so rest-day decay shows
+    base = alt.Chart(daily_df).encode(x=alt.X("Date:T", axis=x_axis))
     
     # Main fatigue metrics as lines
-    if predict_future and future_data:
+    if predict_future and future_data is not None:
         # Historical data (solid lines)
-        base_historical = alt.Chart(chart_df[chart_df['is_prediction'] == False]).encode(x=alt.X("Date:T", axis=x_axis))
+        base_historical = base
         ctl_line_hist = base_historical.mark_line(color="#667eea", strokeWidth=3, strokeCap="round").encode(
             y=alt.Y("CTL:Q", title="Training Load Score"), 
             tooltip=["Date:T", "CTL:Q", "ATL:Q", "TSB:Q", "TSS:Q"]
@@ -1200,7 +883,7 @@ def render_fatigue_analysis(df, today, user_info, gist_id, gist_filename, github
     if selected_metric and selected_metric in df.columns:
         color = metric_colors.get(selected_metric, "#888")
         
-        if predict_future and future_data and selected_metric in ['Distance (km)', 'Planned_Distance']:
+        if predict_future and future_data is not None and selected_metric in ['Distance (km)', 'Planned_Distance']:
             # Show both historical and predicted data for distance
             historical_df = chart_df[chart_df['is_prediction'] == False]
             predicted_df = chart_df[chart_df['is_prediction'] == True]
@@ -1244,7 +927,7 @@ def render_fatigue_analysis(df, today, user_info, gist_id, gist_filename, github
             
         else:
             # Standard overlay for non-distance metrics or when prediction is off
-            overlay_df = chart_df[chart_df['is_prediction'] == False] if predict_future and future_data else chart_df
+            overlay_df = chart_df[chart_df['is_prediction'] == False] if predict_future and future_data is not None else chart_df
             base_overlay = alt.Chart(overlay_df).encode(x=alt.X("Date:T", axis=x_axis))
             
             # Create bars for the overlay metric with secondary y-axis
@@ -1270,9 +953,9 @@ def render_fatigue_analysis(df, today, user_info, gist_id, gist_filename, github
         )
     
     # Configure final chart properties
-    prediction_text = " (Dashed = Predicted)" if predict_future and future_data else ""
+    prediction_text = " (Dashed = Predicted)" if predict_future and future_data is not None else ""
     
-    if selected_metric and predict_future and future_data and selected_metric in ['Distance (km)', 'Planned_Distance']:
+    if selected_metric and predict_future and future_data is not None and selected_metric in ['Distance (km)', 'Planned_Distance']:
         overlay_text = f" • {selected_metric} (Solid = Actual, Faded = Planned)"
     elif selected_metric:
         overlay_text = f" • {selected_metric} (Bars)"
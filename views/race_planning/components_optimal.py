@@ -939,6 +939,17 @@ def render_weekly_comparison_chart(race, weeks, df):
     # Prepare chart data
     chart_data = []
     
+    # Resolve the log's date/distance columns and parse its dates once, not once per week
+    date_col = distance_col = df_dates = None
+    if df is not None and not df.empty:
+        date_col = next((col for col in df.columns if col.lower() == 'date'), None)
+        distance_col = next((col for col in df.columns if 'distance' in col.lower()), None)
+        if date_col and distance_col:
+            try:
+                df_dates = safe_parse_date_series(df[date_col], 'date')
+            except Exception as e:
+                st.warning(f"Error processing actual distances: {str(e)}")
+    
     for week in sorted(weeks, key=lambda w: w.get("week_number", 0)):
         week_num = week.get("week_number", 0)
         start_date = parse_training_date(week.get("start_date", ""))
@@ -958,16 +969,10 @@ def render_weekly_comparison_chart(race, weeks, df):
         actual_distance = 0
         try:
             if df is not None and not df.empty:
-                # Try to find date and distance columns with flexible naming
-                date_col = next((col for col in df.columns if col.lower() == 'date'), None)
-                distance_col = next((col for col in df.columns if 'distance' in col.lower()), None)
-                
-                if date_col and distance_col:
-                    # Use safe date parsing for the dataframe
-                    df_dates = safe_parse_date_series(df[date_col], 'date')
+                if df_dates is not None:
                     actual_df = df[(df_dates >= start_date) & (df_dates <= end_date)]
                     actual_distance = actual_df[distance_col].sum() if not actual_df.empty else 0
-                else:
+                elif not (date_col and distance_col):
                     if week_num == 1:  # Only show warning once
                         # Find available columns to help user troubleshoot
                         available_cols = ", ".join(df.columns.tolist())
@@ -2,69 +2,104 @@
 Data handling functions for race planning module.
 """
 
+import copy
+
 import streamlit as st
-from utils.gist_helpers import load_gist_data, save_gist_data
+from utils.gist_client import get_gist_client
+from utils.gist_shards import read_user_domain, update_user_domain
+
+_REQUEST_KEY = "race_data_request"
+
+
+def begin_race_data_request():
+    """
+    Start a request-scoped snapshot for one Streamlit run.
+
+    The first loader called afterwards revalidates the gist; every later loader
+    in the same run reads the in-memory copy, which already includes any saves
+    made during the run.
+    """
+    st.session_state[_REQUEST_KEY] = {"gists": set(), "network_reads": 0}
 
 
-def load_gist_race_data(user_info, gist_id, filename, token):
-    """Load race data from a gist."""
-    data = load_gist_data(gist_id, filename, token)
+def end_race_data_request():
+    """
+    Close the current request snapshot.
+
+    Returns:
+        Number of gist network reads made while the request was open
+    """
+    request = st.session_state.pop(_REQUEST_KEY, None)
+    return request["network_reads"] if request else 0
+
+
+def load_user_race_domain(domain, default, user_info, gist_id, token):
+    """Load one domain shard of the user's data, at most one network read per gist per request."""
     user_key = user_info["USER_KEY"]
-    if user_key not in data:
-        data[user_key] = {"races": [], "training_plans": {}, "progress_feedback": {}}
-    return data
+    request = st.session_state.get(_REQUEST_KEY)
+    if request is None:
+        return read_user_domain(gist_id, token, user_key, domain, default)
+
+    # All shards live in the same gist, so one revalidation covers every loader in the request
+    client = get_gist_client(gist_id, token)
+    reads_before = client.network_reads
+    value = read_user_domain(gist_id, token, user_key, domain, default, revalidate=gist_id not in request["gists"])
+    request["gists"].add(gist_id)
+    request["network_reads"] += client.network_reads - reads_before
+    return value
 
 
-def save_gist_race_data(data, user_info, gist_id, filename, token):
-    """Save race data to a gist."""
-    return save_gist_data(gist_id, filename, token, data)
+def update_user_race_data(domain, mutation, user_info, gist_id, token):
+    """Apply `mutation(shard)` to one domain shard of the user's data and queue only that file."""
+    return update_user_domain(gist_id, token, user_info["USER_KEY"], domain, mutation)
 
 
 def load_saved_races(user_info, gist_id, filename, token):
     """Load saved races for a user."""
-    data = load_gist_race_data(user_info, gist_id, filename, token)
-    user_key = user_info["USER_KEY"]
-    return data[user_key].get("races", [])
+    return load_user_race_domain("races", [], user_info, gist_id, token)
 
 
 def save_races(races, user_info, gist_id, filename, token):
     """Save races for a user."""
-    data = load_gist_race_data(user_info, gist_id, filename, token)
-    user_key = user_info["USER_KEY"]
-    data[user_key]["races"] = races
-    return save_gist_race_data(data, user_info, gist_id, filename, token)
+    races = copy.deepcopy(races)
+
+    def mutation(shard):
+        shard["races"] = copy.deepcopy(races)
+
+    return update_user_race_data("races", mutation, user_info, gist_id, token)
 
 
 def load_training_plans(user_info, gist_id, filename, token):
     """Load training plans for a user."""
-    data = load_gist_race_data(user_info, gist_id, filename, token)
-    user_key = user_info["USER_KEY"]
-    return data[user_key].get("training_plans", {})
+    return load_user_race_domain("training_plans", {}, user_info, gist_id, token)
 
 
 def save_training_plan(race_id, plan, user_info, gist_id, filename, token):
     """Save a training plan for a race."""
-    data = load_gist_race_data(user_info, gist_id, filename, token)
-    user_key = user_info["USER_KEY"]
-    data[user_key].setdefault("training_plans", {})
-    data[user_key]["training_plans"][race_id] = plan
-    return save_gist_race_data(data, user_info, gist_id, filename, token)
+    plan = copy.deepcopy(plan)
+
+    def mutation(shard):
+        shard.setdefault("training_plans", {})[race_id] = copy.deepcopy(plan)
+
+    return update_user_race_data("training_plans", mutation, user_info, gist_id, token)
 
 
 def load_progress_feedback(user_info, gist_id, filename, token):
     """Load progress feedback for a user."""
-    data = load_gist_race_data(user_info, gist_id, filename, token)
-    user_key = user_info["USER_KEY"]
-    return data[user_key].get("progress_feedback", {})
+    return load_user_race_domain("progress_feedback", {}, user_info, gist_id, token)
 
 
 def save_progress_feedback(race_id, entry, user_info, gist_id, filename, token):
     """Save progress feedback for a race."""
-    data = load_gist_race_data(user_info, gist_id, filename, token)
-    user_key = user_info["USER_KEY"]
-    data[user_key].setdefault("progress_feedback", {})
-    data[user_key]["progress_feedback"].setdefault(race_id, []).append(entry)
-    return save_gist_race_data(data, user_info, gist_id, filename, token)
+    entry = copy.deepcopy(entry)
+
+    def mutation(shard):
+        history = shard.setdefault("progress_feedback", {}).setdefault(race_id, [])
+        # Mutations can be replayed on a fresher copy of the gist, so appending must be idempotent
+        if entry not in history:
+            history.append(copy.deepcopy(entry))
+
+    return update_user_race_data("progress_feedback", mutation, user_info, gist_id, token)
 
 
 def render_feedback_history(race_id, user_info, gist_id, filename, token):
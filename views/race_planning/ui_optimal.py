@@ -11,7 +11,8 @@ from version import APP_VERSION, APP_VERSION_COLOR, APP_VERSION_STYLE
 
 from views.race_planning.data import (
     load_saved_races, save_races, load_training_plans, 
-    load_progress_feedback, save_progress_feedback, save_training_plan
+    load_progress_feedback, save_progress_feedback, save_training_plan,
+    begin_race_data_request, end_race_data_request
 )
 from views.race_planning.styles import load_app_css
 from views.race_planning.utils import prepare_training_plan_dataframe, initialize_week_selection, calculate_week_dates
@@ -28,6 +29,10 @@ from views.race_planning.components_optimal import (
 def render_race_planning_optimal(df, today, user_info, gist_id, gist_filename, github_token):
     """
     Optimized implementation of race planning view with table-based UI.
+
+    All loaders called during the render share one snapshot of the user's gist
+    document; the number of network reads it took is shown in the sidebar
+    Diagnostics on the next rerun.
     
     Args:
         df: Running log dataframe
@@ -37,6 +42,15 @@ def render_race_planning_optimal(df, today, user_info, gist_id, gist_filename, g
         gist_filename: Gist filename
         github_token: GitHub token
     """
+    begin_race_data_request()
+    try:
+        _render_race_planning_page(df, today, user_info, gist_id, gist_filename, github_token)
+    finally:
+        st.session_state['race_planning_gist_reads'] = end_race_data_request()
+
+
+def _render_race_planning_page(df, today, user_info, gist_id, gist_filename, github_token):
+    """Render the race planning page body."""
     # Load app CSS
     load_app_css()
     
@@ -10,13 +10,20 @@ from datetime import datetime, timedelta
 # Add the parent directory to the path for imports
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from version import APP_VERSION, APP_VERSION_COLOR, APP_VERSION_STYLE
+from utils.activity_frame import data_version
+from utils.hr_zones import profile_zones, get_zone_index, zone_totals
 
 # Import our modular components
 from .statistics_modules.data_processing import (
     preprocess_dataframe,
     filter_data_by_time_period,
+    get_period_start,
     calculate_key_metrics
 )
+from .statistics_modules.rollups import get_rollup_cube
+from .statistics_modules.period_index import get_period_index
+from .statistics_modules.figure_cache import cached_figure
+from .statistics_modules.downsampling import MAX_POINTS_PER_TRACE
 from .statistics_modules.metric_cards import create_all_metric_cards
 from .statistics_modules.styles import get_statistics_css
 from .statistics_modules.chart_creators import (
@@ -33,7 +40,7 @@ from .statistics_modules.chart_creators import (
     create_heart_rate_zones_chart,
     create_monthly_volume_chart
 )
-from .statistics_modules.insights import generate_insights, get_no_insights_message
+from .statistics_modules.insights import generate_insights, generate_period_insights, get_no_insights_message
 
 
 def render_header():
@@ -188,15 +195,39 @@ def render_metric_cards(metrics, time_period):
     st.markdown('</div>', unsafe_allow_html=True)
 
 
-def render_performance_trends(df_filtered, time_aggregation):
+def render_daily_zoom(df_filtered, cube=None, since=None):
+    """Date range control for daily charts that are downsampled; returns (start, end) or None"""
+    if cube is not None:
+        days = cube['daily']['keys']
+        days = days[days.searchsorted(pd.Timestamp(since)):] if since is not None else days
+    else:
+        days = pd.DatetimeIndex(df_filtered['Date'].dropna().unique()).sort_values()
+    if len(days) <= MAX_POINTS_PER_TRACE:
+        return None
+    
+    first, last = days[0].date(), days[-1].date()
+    # The key follows the period so a stored range never falls outside the slider bounds
+    zoom = st.slider(
+        "🔍 Zoom daily charts (full resolution once the range fits the point budget)",
+        min_value=first, max_value=last, value=(first, last),
+        format="YYYY-MM-DD", key=f"daily_zoom_{first}_{last}"
+    )
+    return None if zoom == (first, last) else zoom
+
+
+def render_performance_trends(df_filtered, time_aggregation, cube=None, since=None, figure_key=None):
     """Render performance trends section"""
     st.markdown('<h2 class="section-header">📈 Performance Trends</h2>', unsafe_allow_html=True)
     
+    # Long daily histories are downsampled; zooming in re-slices the range at full resolution
+    zoom = render_daily_zoom(df_filtered, cube, since) if time_aggregation == "daily" else None
+    trend_key = None if figure_key is None else figure_key + (time_aggregation, zoom)
+    
     # Distance over time
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     st.markdown(f'<h3 class="chart-title">📏 Distance Over Time ({time_aggregation.title()})</h3>', unsafe_allow_html=True)
     
-    fig_distance = create_distance_chart(df_filtered, time_aggregation)
+    fig_distance = cached_figure("distance", trend_key, lambda: create_distance_chart(df_filtered, time_aggregation, cube, since, zoom))
     if fig_distance:
         st.plotly_chart(fig_distance, use_container_width=True, key="distance_chart")
     else:
@@ -211,7 +242,7 @@ def render_performance_trends(df_filtered, time_aggregation):
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown(f'<h3 class="chart-title">⚡ Pace Trends ({time_aggregation.title()})</h3>', unsafe_allow_html=True)
         
-        fig_pace = create_pace_trend_chart(df_filtered, time_aggregation)
+        fig_pace = cached_figure("pace_trend", trend_key, lambda: create_pace_trend_chart(df_filtered, time_aggregation, cube, since, zoom))
         if fig_pace:
             st.plotly_chart(fig_pace, use_container_width=True, key="pace_trend_chart")
         else:
@@ -222,13 +253,13 @@ def render_performance_trends(df_filtered, time_aggregation):
     with col2:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         
-        fig_hr = create_heart_rate_chart(df_filtered, time_aggregation)
+        fig_hr = cached_figure("heart_rate", trend_key, lambda: create_heart_rate_chart(df_filtered, time_aggregation, cube, since, zoom))
         if fig_hr:
             st.markdown(f'<h3 class="chart-title">❤️ Heart Rate Trends ({time_aggregation.title()})</h3>', unsafe_allow_html=True)
             st.plotly_chart(fig_hr, use_container_width=True, key="hr_chart")
         else:
             st.markdown('<h3 class="chart-title">📊 Pace Distribution</h3>', unsafe_allow_html=True)
-            fig_pace_dist = create_pace_distribution_chart(df_filtered)
+            fig_pace_dist = cached_figure("pace_distribution", figure_key, lambda: create_pace_distribution_chart(df_filtered))
             if fig_pace_dist:
                 st.plotly_chart(fig_pace_dist, use_container_width=True, key="pace_dist_chart")
             else:
@@ -243,7 +274,7 @@ def render_performance_trends(df_filtered, time_aggregation):
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown(f'<h3 class="chart-title">👟 Cadence Trends ({time_aggregation.title()})</h3>', unsafe_allow_html=True)
         
-        fig_cadence = create_cadence_chart(df_filtered, time_aggregation)
+        fig_cadence = cached_figure("cadence", trend_key, lambda: create_cadence_chart(df_filtered, time_aggregation, cube, since, zoom))
         if fig_cadence:
             st.plotly_chart(fig_cadence, use_container_width=True, key="cadence_chart")
         else:
@@ -255,7 +286,7 @@ def render_performance_trends(df_filtered, time_aggregation):
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown(f'<h3 class="chart-title">⛰️ Elevation Gain Trends ({time_aggregation.title()})</h3>', unsafe_allow_html=True)
         
-        fig_elevation = create_elevation_chart(df_filtered, time_aggregation)
+        fig_elevation = cached_figure("elevation", trend_key, lambda: create_elevation_chart(df_filtered, time_aggregation, cube, since, zoom))
         if fig_elevation:
             st.plotly_chart(fig_elevation, use_container_width=True, key="elevation_chart")
         else:
@@ -270,7 +301,7 @@ def render_performance_trends(df_filtered, time_aggregation):
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown(f'<h3 class="chart-title">⏱️ Elapsed Time Trends ({time_aggregation.title()})</h3>', unsafe_allow_html=True)
         
-        fig_time = create_elapsed_time_chart(df_filtered, time_aggregation)
+        fig_time = cached_figure("elapsed_time", trend_key, lambda: create_elapsed_time_chart(df_filtered, time_aggregation, cube, since, zoom))
         if fig_time:
             st.plotly_chart(fig_time, use_container_width=True, key="time_chart")
         else:
@@ -282,19 +313,24 @@ def render_performance_trends(df_filtered, time_aggregation):
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown('<h3 class="chart-title">🏃‍♂️ Run Frequency by Day</h3>', unsafe_allow_html=True)
         
-        fig_frequency = create_run_frequency_chart(df_filtered)
+        fig_frequency = cached_figure("run_frequency", figure_key, lambda: create_run_frequency_chart(df_filtered))
         if fig_frequency:
             st.plotly_chart(fig_frequency, use_container_width=True, key="run_frequency_chart")
         
         st.markdown('</div>', unsafe_allow_html=True)
 
 
-def render_yearly_cumulative(df, today):
+def render_yearly_cumulative(df, today, figure_key=None):
     """Render yearly cumulative distance chart"""
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     st.markdown('<h3 class="chart-title">📈 Distance per Year (Cumulative)</h3>', unsafe_allow_html=True)
     
-    fig_yearly = create_yearly_cumulative_chart(df, today)
+    goal_km = st.number_input(
+        "🎯 Yearly distance goal (km)", min_value=0, max_value=20000, step=100, key="yearly_distance_goal",
+        help="Adds the pace needed from today to reach the goal; 0 hides it"
+    )
+    yearly_key = None if figure_key is None else figure_key + (goal_km,)
+    fig_yearly = cached_figure("yearly_cumulative", yearly_key, lambda: create_yearly_cumulative_chart(df, today, goal_km or None))
     if fig_yearly:
         st.plotly_chart(fig_yearly, use_container_width=True, key="yearly_chart")
     else:
@@ -303,7 +339,7 @@ def render_yearly_cumulative(df, today):
     st.markdown('</div>', unsafe_allow_html=True)
 
 
-def render_advanced_analytics(df_filtered):
+def render_advanced_analytics(df_filtered, figure_key=None, zones=None, zone_totals=None):
     """Render advanced analytics section"""
     st.markdown('<h2 class="section-header">🔬 Advanced Analytics</h2>', unsafe_allow_html=True)
     
@@ -351,10 +387,10 @@ def render_advanced_analytics(df_filtered):
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown('<h3 class="chart-title">🎯 Distance vs Pace Correlation</h3>', unsafe_allow_html=True)
         
-        fig_dist_pace = create_correlation_chart(
+        fig_dist_pace = cached_figure("distance_pace", figure_key, lambda: create_correlation_chart(
             df_filtered, 'Distance (km)', 'pace_minutes', 
             'Distance vs Pace', 'Distance (km)', 'Pace'
-        )
+        ))
         if fig_dist_pace:
             st.plotly_chart(fig_dist_pace, use_container_width=True, key="scatter_chart")
         else:
@@ -365,13 +401,14 @@ def render_advanced_analytics(df_filtered):
     with col2:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         
-        fig_hr_zones = create_heart_rate_zones_chart(df_filtered)
+        zones_key = None if figure_key is None else figure_key + (zones,)
+        fig_hr_zones = cached_figure("heart_rate_zones", zones_key, lambda: create_heart_rate_zones_chart(df_filtered, zones, zone_totals))
         if fig_hr_zones:
             st.markdown('<h3 class="chart-title">❤️ Heart Rate Zones Distribution</h3>', unsafe_allow_html=True)
             st.plotly_chart(fig_hr_zones, use_container_width=True, key="zones_chart")
         else:
             st.markdown('<h3 class="chart-title">📊 Monthly Running Volume</h3>', unsafe_allow_html=True)
-            fig_monthly = create_monthly_volume_chart(df_filtered)
+            fig_monthly = cached_figure("monthly_volume", figure_key, lambda: create_monthly_volume_chart(df_filtered))
             if fig_monthly:
                 st.plotly_chart(fig_monthly, use_container_width=True, key="monthly_chart")
             else:
@@ -386,10 +423,10 @@ def render_advanced_analytics(df_filtered):
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown('<h3 class="chart-title">💓 Distance vs Heart Rate</h3>', unsafe_allow_html=True)
         
-        fig_dist_hr = create_correlation_chart(
+        fig_dist_hr = cached_figure("distance_hr", figure_key, lambda: create_correlation_chart(
             df_filtered, 'Distance (km)', 'Avg HR',
             'Distance vs Heart Rate', 'Distance (km)', 'Average Heart Rate (bpm)'
-        )
+        ))
         if fig_dist_hr:
             st.plotly_chart(fig_dist_hr, use_container_width=True, key="hr_distance_chart")
         else:
@@ -401,10 +438,10 @@ def render_advanced_analytics(df_filtered):
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown('<h3 class="chart-title">⚡💓 Pace vs Heart Rate</h3>', unsafe_allow_html=True)
         
-        fig_pace_hr = create_correlation_chart(
+        fig_pace_hr = cached_figure("pace_hr", figure_key, lambda: create_correlation_chart(
             df_filtered, 'pace_minutes', 'Avg HR',
             'Pace vs Heart Rate', 'Pace', 'Average Heart Rate (bpm)'
-        )
+        ))
         if fig_pace_hr:
             st.plotly_chart(fig_pace_hr, use_container_width=True, key="pace_hr_chart")
         else:
@@ -419,10 +456,10 @@ def render_advanced_analytics(df_filtered):
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown('<h3 class="chart-title">⛰️ Distance vs Elevation Gain</h3>', unsafe_allow_html=True)
         
-        fig_dist_elev = create_correlation_chart(
+        fig_dist_elev = cached_figure("distance_elevation", figure_key, lambda: create_correlation_chart(
             df_filtered, 'Distance (km)', 'Elevation Gain',
             'Distance vs Elevation', 'Distance (km)', 'Elevation Gain (m)'
-        )
+        ))
         if fig_dist_elev:
             st.plotly_chart(fig_dist_elev, use_container_width=True, key="elevation_correlation_chart")
         else:
@@ -434,10 +471,10 @@ def render_advanced_analytics(df_filtered):
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown('<h3 class="chart-title">🕐 Time vs Pace Efficiency</h3>', unsafe_allow_html=True)
         
-        fig_time_pace = create_correlation_chart(
+        fig_time_pace = cached_figure("time_pace", figure_key, lambda: create_correlation_chart(
             df_filtered, 'moving_time_minutes', 'pace_minutes',
             'Time vs Pace', 'Moving Time (minutes)', 'Pace'
-        )
+        ))
         if fig_time_pace:
             st.plotly_chart(fig_time_pace, use_container_width=True, key="time_pace_chart")
         else:
@@ -446,11 +483,12 @@ def render_advanced_analytics(df_filtered):
         st.markdown('</div>', unsafe_allow_html=True)
 
 
-def render_insights(df_filtered, time_period):
+def render_insights(df_filtered, time_period, insights=None):
     """Render insights and recommendations section"""
     st.markdown('<h2 class="section-header">💡 Insights & Recommendations</h2>', unsafe_allow_html=True)
     
-    insights = generate_insights(df_filtered, time_period)
+    if insights is None:
+        insights = generate_insights(df_filtered, time_period)
     
     if insights:
         for i, insight in enumerate(insights):
@@ -463,7 +501,7 @@ def render_insights(df_filtered, time_period):
         st.markdown(get_no_insights_message(), unsafe_allow_html=True)
 
 
-def render_statistics(df, today):
+def render_statistics(df, today, version=None):
     """Main function to render the statistics dashboard"""
     # Apply CSS styles
     st.markdown(get_statistics_css(), unsafe_allow_html=True)
@@ -493,6 +531,13 @@ def render_statistics(df, today):
     # Time controls
     render_time_controls()
     
+    # Figures, indexes and cubes are reused across reruns until the data, the day or the controls they depend on change
+    # (version is the data_version of build_activity_frame's report; hashed here only when not given)
+    if version is None:
+        version = data_version(df)
+    data_key = (version, today)
+    period_key = data_key + (st.session_state.time_period,)
+    
     # Filter data based on time period
     df_filtered = filter_data_by_time_period(df, st.session_state.time_period, today)
     
@@ -501,20 +546,32 @@ def render_statistics(df, today):
         st.warning(f"No data available for the selected period ({period_label})")
         return
     
-    # Calculate key metrics
-    metrics = calculate_key_metrics(df_filtered, st.session_state.time_period, today, df)
+    # Calculate key metrics (two binary searches per period on the cached prefix-sum index)
+    metrics = calculate_key_metrics(df_filtered, st.session_state.time_period, today, df, get_period_index(df, version))
     
     # Render metric cards
     render_metric_cards(metrics, st.session_state.time_period)
     
     # Render performance trends
-    render_performance_trends(df_filtered, st.session_state.time_aggregation)
+    # Trend charts slice the rollup cube of the full history instead of regrouping rows
+    render_performance_trends(
+        df_filtered, st.session_state.time_aggregation,
+        get_rollup_cube(df, version), get_period_start(st.session_state.time_period, today),
+        period_key
+    )
     
     # Render yearly cumulative chart
-    render_yearly_cumulative(df, today)
+    render_yearly_cumulative(df, today, data_key)
     
     # Render advanced analytics
-    render_advanced_analytics(df_filtered)
+    # HR zones come from the runner profile; per-period totals are read from the cached zone index
+    zones = profile_zones(st.session_state.get('user_info', {}).get('runner_profile', {}))
+    period_zone_totals = zone_totals(
+        get_zone_index(df, zones), get_period_start(st.session_state.time_period, today)
+    )
+    render_advanced_analytics(df_filtered, period_key, zones, period_zone_totals)
     
     # Render insights
-    render_insights(df_filtered, st.session_state.time_period) 
\ No newline at end of file
+    # Insights of every period button come from one pass over the history, cached per data version
+    period_insights = generate_period_insights(df, today, cache_key=data_key)
+    render_insights(df_filtered, st.session_state.time_period, period_insights.get(st.session_state.time_period)) 
\ No newline at end of file
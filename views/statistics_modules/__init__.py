@@ -6,11 +6,37 @@ Statistics modules package for running analytics dashboard
 from .data_processing import (
     preprocess_dataframe,
     filter_data_by_time_period,
+    get_period_start,
     calculate_key_metrics,
     detect_workout_type,
+    get_workout_types,
     get_workout_type_style
 )
 
+from .rollups import (
+    build_rollup_cube,
+    get_rollup_cube,
+    slice_rollup
+)
+
+from .period_index import (
+    build_period_index,
+    get_period_index,
+    window_metrics
+)
+
+from .downsampling import (
+    MAX_POINTS_PER_TRACE,
+    downsample_plot_frame,
+    lttb_indices
+)
+
+from .figure_cache import (
+    apply_stats_layout,
+    cached_figure,
+    get_figure_cache_stats
+)
+
 from .metric_cards import (
     create_metric_card,
     create_all_metric_cards,
@@ -35,7 +61,10 @@ from .chart_creators import (
 )
 
 from .insights import (
+    extract_insight_features,
+    evaluate_insights,
     generate_insights,
+    generate_period_insights,
     get_no_insights_message
 )
 
@@ -43,10 +72,32 @@ __all__ = [
     # Data processing
     'preprocess_dataframe',
     'filter_data_by_time_period',
+    'get_period_start',
     'calculate_key_metrics',
     'detect_workout_type',
+    'get_workout_types',
     'get_workout_type_style',
     
+    # Rollups
+    'build_rollup_cube',
+    'get_rollup_cube',
+    'slice_rollup',
+    
+    # Period index
+    'build_period_index',
+    'get_period_index',
+    'window_metrics',
+    
+    # Downsampling
+    'MAX_POINTS_PER_TRACE',
+    'downsample_plot_frame',
+    'lttb_indices',
+    
+    # Figure cache
+    'apply_stats_layout',
+    'cached_figure',
+    'get_figure_cache_stats',
+    
     # Metric cards
     'create_metric_card',
     'create_all_metric_cards',
@@ -70,6 +121,9 @@ __all__ = [
     'create_monthly_volume_chart',
     
     # Insights
+    'extract_insight_features',
+    'evaluate_insights',
     'generate_insights',
+    'generate_period_insights',
     'get_no_insights_message'
 ] 
\ No newline at end of file
@@ -10,31 +10,20 @@ from datetime import datetime, timedelta
 from .data_processing import (
     aggregate_data_by_time, 
     format_pace_to_min_sec, 
-    detect_workout_type, 
+    get_workout_types,
     get_workout_type_style
 )
+from utils.hr_zones import ZONE_COLORS, profile_zones, build_zone_index, zone_totals, zone_label
+from .rollups import get_yearly_cumulative
+from .figure_cache import apply_stats_layout
 
-# Cache for workout type detection to improve performance
-_workout_type_cache = {}
-
-def get_cached_workout_type(row_hash, row):
-    """Get workout type with caching for better performance"""
-    if row_hash not in _workout_type_cache:
-        _workout_type_cache[row_hash] = detect_workout_type(row)
-    return _workout_type_cache[row_hash]
-
-def clear_workout_type_cache():
-    """Clear the workout type cache"""
-    global _workout_type_cache
-    _workout_type_cache = {}
-
-def create_distance_chart(df_filtered, time_aggregation):
+def create_distance_chart(df_filtered, time_aggregation, cube=None, since=None, zoom=None):
     """Create distance over time chart"""
     if df_filtered.empty:
         return None
     
     df_plot, x_title, hover_template = aggregate_data_by_time(
-        df_filtered, time_aggregation, 'Distance (km)', 'sum'
+        df_filtered, time_aggregation, 'Distance (km)', 'sum', cube=cube, since=since, zoom=zoom
     )
     
     if df_plot.empty:
@@ -67,48 +56,21 @@ def create_distance_chart(df_filtered, time_aggregation):
         )
         fig.update_traces(hovertemplate=hover_template)
     
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(family="Inter, sans-serif", size=12, color="#374151"),
-        xaxis=dict(
-            showgrid=True, 
-            gridcolor='#f3f4f6', 
-            gridwidth=1,
-            title=x_title,
-            title_font=dict(size=14, color="#6b7280")
-        ),
-        yaxis=dict(
-            showgrid=True, 
-            gridcolor='#f3f4f6', 
-            gridwidth=1,
-            title="Distance (km)",
-            title_font=dict(size=14, color="#6b7280")
-        ),
-        margin=dict(l=0, r=0, t=20, b=0),
-        height=350,
-        hovermode='x unified'
-    )
+    apply_stats_layout(fig, x_title, "Distance (km)", height=350, hovermode='x unified')
     
     return fig
 
 
-def create_pace_trend_chart(df_filtered, time_aggregation):
+def create_pace_trend_chart(df_filtered, time_aggregation, cube=None, since=None, zoom=None):
     """Create pace trends chart"""
-    pace_data = df_filtered.dropna(subset=['pace_minutes']).copy()
-    if pace_data.empty:
-        return None
-    
-    # Filter out unrealistic values (pace is already in min/km)
-    pace_data = pace_data[pace_data['pace_minutes'] <= 12]
-    
-    if pace_data.empty:
-        return None
-    
+    # Paces above 12 min/km are dropped by the rollup (see rollups.TREND_METRICS)
     df_plot, x_title, hover_template = aggregate_data_by_time(
-        pace_data, time_aggregation, 'pace_minutes', 'mean'
+        df_filtered, time_aggregation, 'pace_minutes', 'mean', cube=cube, since=since, zoom=zoom
     )
     
+    if df_plot.empty:
+        return None
+    
     if time_aggregation == "daily":
         # Use line chart for daily data
         fig = px.line(
@@ -141,42 +103,23 @@ def create_pace_trend_chart(df_filtered, time_aggregation):
     y_tick_vals = [3, 4, 5, 6, 7, 8, 9, 10, 11, 12]
     y_tick_text = [format_pace_to_min_sec(val) for val in y_tick_vals]
     
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(family="Inter, sans-serif", size=12, color="#374151"),
-        xaxis=dict(
-            showgrid=True, 
-            gridcolor='#f3f4f6',
-            title=x_title,
-            title_font=dict(size=14, color="#6b7280")
-        ),
-        yaxis=dict(
-            showgrid=True, 
-            gridcolor='#f3f4f6',
-            title="Pace",
-            title_font=dict(size=14, color="#6b7280"),
-            range=[3, 12],  # Set reasonable y-axis range for running paces
-            tickvals=y_tick_vals,
-            ticktext=y_tick_text
-        ),
-        margin=dict(l=0, r=0, t=20, b=0),
-        height=300
+    apply_stats_layout(
+        fig, x_title, "Pace",
+        yaxis=dict(range=[3, 12], tickvals=y_tick_vals, ticktext=y_tick_text)  # Reasonable range for running paces
     )
     
     return fig
 
 
-def create_heart_rate_chart(df_filtered, time_aggregation):
+def create_heart_rate_chart(df_filtered, time_aggregation, cube=None, since=None, zoom=None):
     """Create heart rate trends chart"""
-    hr_data = df_filtered.dropna(subset=['Avg HR'])
-    if hr_data.empty:
-        return None
-    
     df_plot, x_title, hover_template = aggregate_data_by_time(
-        hr_data, time_aggregation, 'Avg HR', 'mean'
+        df_filtered, time_aggregation, 'Avg HR', 'mean', cube=cube, since=since, zoom=zoom
     )
     
+    if df_plot.empty:
+        return None
+    
     if time_aggregation == "daily":
         # Use line chart for daily data
         fig = px.line(
@@ -203,25 +146,7 @@ def create_heart_rate_chart(df_filtered, time_aggregation):
             hovertemplate=hover_template.replace(':.1f', ':.0f') + ' bpm'
         )
     
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(family="Inter, sans-serif", size=12, color="#374151"),
-        xaxis=dict(
-            showgrid=True, 
-            gridcolor='#f3f4f6',
-            title=x_title,
-            title_font=dict(size=14, color="#6b7280")
-        ),
-        yaxis=dict(
-            showgrid=True, 
-            gridcolor='#f3f4f6',
-            title="Heart Rate (bpm)",
-            title_font=dict(size=14, color="#6b7280")
-        ),
-        margin=dict(l=0, r=0, t=20, b=0),
-        height=300
-    )
+    apply_stats_layout(fig, x_title, "Heart Rate (bpm)")
     
     return fig
 
@@ -249,50 +174,24 @@ def create_pace_distribution_chart(df_filtered):
     x_tick_vals = [3, 4, 5, 6, 7, 8, 9, 10, 11, 12]
     x_tick_text = [format_pace_to_min_sec(val) for val in x_tick_vals]
     
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(family="Inter, sans-serif", size=12, color="#374151"),
-        xaxis=dict(
-            title="Pace", 
-            showgrid=True, 
-            gridcolor='#f3f4f6',
-            title_font=dict(size=14, color="#6b7280"),
-            range=[3, 12],  # Set reasonable x-axis range for running paces
-            tickvals=x_tick_vals,
-            ticktext=x_tick_text
-        ),
-        yaxis=dict(
-            title="Frequency", 
-            showgrid=True, 
-            gridcolor='#f3f4f6',
-            title_font=dict(size=14, color="#6b7280")
-        ),
-        margin=dict(l=0, r=0, t=20, b=0),
-        height=300
+    apply_stats_layout(
+        fig, "Pace", "Frequency",
+        xaxis=dict(range=[3, 12], tickvals=x_tick_vals, ticktext=x_tick_text)  # Reasonable range for running paces
     )
     
     return fig
 
 
-def create_cadence_chart(df_filtered, time_aggregation):
+def create_cadence_chart(df_filtered, time_aggregation, cube=None, since=None, zoom=None):
     """Create cadence trends chart"""
-    cadence_data = df_filtered.dropna(subset=['Cadence']).copy()
-    if cadence_data.empty:
-        return None
-    
-    # Convert cadence to numeric and filter out unrealistic values
-    cadence_data['Cadence'] = pd.to_numeric(cadence_data['Cadence'], errors='coerce')
-    cadence_data = cadence_data.dropna(subset=['Cadence'])
-    cadence_data = cadence_data[(cadence_data['Cadence'] >= 120) & (cadence_data['Cadence'] <= 220)]
-    
-    if cadence_data.empty:
-        return None
-    
+    # Non-numeric cadences and values outside 120-220 spm are dropped by the rollup
     df_plot, x_title, hover_template = aggregate_data_by_time(
-        cadence_data, time_aggregation, 'Cadence', 'mean'
+        df_filtered, time_aggregation, 'Cadence', 'mean', cube=cube, since=since, zoom=zoom
     )
     
+    if df_plot.empty:
+        return None
+    
     if time_aggregation == "daily":
         # Use line chart for daily data
         fig = px.line(
@@ -319,48 +218,21 @@ def create_cadence_chart(df_filtered, time_aggregation):
             hovertemplate=hover_template.replace(':.1f', ':.0f') + ' spm'
         )
     
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(family="Inter, sans-serif", size=12, color="#374151"),
-        xaxis=dict(
-            showgrid=True, 
-            gridcolor='#f3f4f6',
-            title=x_title,
-            title_font=dict(size=14, color="#6b7280")
-        ),
-        yaxis=dict(
-            showgrid=True, 
-            gridcolor='#f3f4f6',
-            title="Cadence (spm)",
-            title_font=dict(size=14, color="#6b7280"),
-            range=[120, 220]  # Set reasonable y-axis range for cadence
-        ),
-        margin=dict(l=0, r=0, t=20, b=0),
-        height=300
-    )
+    apply_stats_layout(fig, x_title, "Cadence (spm)", yaxis=dict(range=[120, 220]))  # Reasonable range for cadence
     
     return fig
 
 
-def create_elevation_chart(df_filtered, time_aggregation):
+def create_elevation_chart(df_filtered, time_aggregation, cube=None, since=None, zoom=None):
     """Create elevation gain trends chart"""
-    elevation_data = df_filtered.dropna(subset=['Elevation Gain']).copy()
-    if elevation_data.empty:
-        return None
-    
-    # Convert elevation to numeric and filter out negative values
-    elevation_data['Elevation Gain'] = pd.to_numeric(elevation_data['Elevation Gain'], errors='coerce')
-    elevation_data = elevation_data.dropna(subset=['Elevation Gain'])
-    elevation_data = elevation_data[elevation_data['Elevation Gain'] >= 0]  # Filter out negative values
-    
-    if elevation_data.empty:
-        return None
-    
+    # Non-numeric and negative elevation values are dropped by the rollup
     df_plot, x_title, hover_template = aggregate_data_by_time(
-        elevation_data, time_aggregation, 'Elevation Gain', 'sum'
+        df_filtered, time_aggregation, 'Elevation Gain', 'sum', cube=cube, since=since, zoom=zoom
     )
     
+    if df_plot.empty:
+        return None
+    
     if time_aggregation == "daily":
         # Use line chart for daily data
         fig = px.line(
@@ -387,39 +259,20 @@ def create_elevation_chart(df_filtered, time_aggregation):
             hovertemplate=hover_template.replace(':.1f', ':.0f') + ' m'
         )
     
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(family="Inter, sans-serif", size=12, color="#374151"),
-        xaxis=dict(
-            showgrid=True, 
-            gridcolor='#f3f4f6',
-            title=x_title,
-            title_font=dict(size=14, color="#6b7280")
-        ),
-        yaxis=dict(
-            showgrid=True, 
-            gridcolor='#f3f4f6',
-            title="Elevation Gain (m)",
-            title_font=dict(size=14, color="#6b7280")
-        ),
-        margin=dict(l=0, r=0, t=20, b=0),
-        height=300
-    )
+    apply_stats_layout(fig, x_title, "Elevation Gain (m)")
     
     return fig
 
 
-def create_elapsed_time_chart(df_filtered, time_aggregation):
+def create_elapsed_time_chart(df_filtered, time_aggregation, cube=None, since=None, zoom=None):
     """Create elapsed time trends chart"""
-    time_data = df_filtered.dropna(subset=['moving_time_minutes']).copy()
-    if time_data.empty:
-        return None
-    
     df_plot, x_title, hover_template = aggregate_data_by_time(
-        time_data, time_aggregation, 'moving_time_minutes', 'sum'
+        df_filtered, time_aggregation, 'moving_time_minutes', 'sum', cube=cube, since=since, zoom=zoom
     )
     
+    if df_plot.empty:
+        return None
+    
     # Convert minutes to hours for better readability in display
     df_plot['time_hours'] = df_plot['moving_time_minutes'] / 60
     
@@ -449,25 +302,7 @@ def create_elapsed_time_chart(df_filtered, time_aggregation):
             hovertemplate='<b>%{y:.1f} hrs</b><br>' + x_title.lower() + ' %{x}<extra></extra>'
         )
     
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(family="Inter, sans-serif", size=12, color="#374151"),
-        xaxis=dict(
-            showgrid=True, 
-            gridcolor='#f3f4f6',
-            title=x_title,
-            title_font=dict(size=14, color="#6b7280")
-        ),
-        yaxis=dict(
-            showgrid=True, 
-            gridcolor='#f3f4f6',
-            title="Elapsed Time (hours)",
-            title_font=dict(size=14, color="#6b7280")
-        ),
-        margin=dict(l=0, r=0, t=20, b=0),
-        height=300
-    )
+    apply_stats_layout(fig, x_title, "Elapsed Time (hours)")
     
     return fig
 
@@ -486,25 +321,7 @@ def create_run_frequency_chart(df_filtered):
         title="",
         color_discrete_sequence=['#10b981']
     )
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(family="Inter, sans-serif", size=12, color="#374151"),
-        xaxis=dict(
-            showgrid=True, 
-            gridcolor='#f3f4f6',
-            title="Day of Week",
-            title_font=dict(size=14, color="#6b7280")
-        ),
-        yaxis=dict(
-            showgrid=True, 
-            gridcolor='#f3f4f6',
-            title="Number of Runs",
-            title_font=dict(size=14, color="#6b7280")
-        ),
-        margin=dict(l=0, r=0, t=20, b=0),
-        height=300
-    )
+    apply_stats_layout(fig, "Day of Week", "Number of Runs")
     fig.update_traces(
         hovertemplate='<b>%{y} runs</b><br>%{x}<extra></extra>'
     )
@@ -512,37 +329,12 @@ def create_run_frequency_chart(df_filtered):
     return fig
 
 
-def create_yearly_cumulative_chart(df, today):
+def create_yearly_cumulative_chart(df, today, goal_km=None):
     """Create yearly cumulative distance chart"""
-    # Create yearly cumulative data
-    df_yearly = df.copy()  # Use full dataset for yearly view
-    df_yearly['Year'] = df_yearly['Date'].dt.year
-    
-    # Group by year and calculate cumulative distance by day of year
-    yearly_data = []
-    for year in sorted(df_yearly['Year'].unique()):
-        year_df = df_yearly[df_yearly['Year'] == year].copy()
-        year_df['DayOfYear'] = year_df['Date'].dt.dayofyear
-        year_df = year_df.sort_values('DayOfYear')
-        year_df['CumulativeDistance'] = year_df['Distance (km)'].cumsum()
-        
-        # Create a complete day range for the year
-        max_day = 366 if year % 4 == 0 else 365  # Handle leap years
-        complete_days = pd.DataFrame({
-            'DayOfYear': range(1, max_day + 1),
-            'Year': year
-        })
-        
-        # Merge and forward fill cumulative distance
-        year_complete = complete_days.merge(
-            year_df[['DayOfYear', 'CumulativeDistance']], 
-            on='DayOfYear', 
-            how='left'
-        )
-        year_complete['CumulativeDistance'] = year_complete['CumulativeDistance'].ffill().fillna(0)
-        yearly_data.append(year_complete)
-    
-    if not yearly_data:
+    # Full history, pivoted once per data version and day (see rollups.get_yearly_cumulative)
+    yearly = get_yearly_cumulative(df, today, goal_km)
+    years = yearly['years']
+    if len(years) == 0:
         return None
     
     # Create the plot
@@ -553,49 +345,51 @@ def create_yearly_cumulative_chart(df, today):
     
     # Get current date info
     current_year = today.year
-    current_day_of_year = today.timetuple().tm_yday
+    current_day_of_year = yearly['today_day']
     
-    for i, year_data in enumerate(yearly_data):
-        year = year_data['Year'].iloc[0]
+    for i, (year, cumulative) in enumerate(zip(years, yearly['cumulative'])):
         color = colors[i % len(colors)]
+        days = np.arange(1, 367)[~np.isnan(cumulative)]
+        cumulative = cumulative[~np.isnan(cumulative)]
         
         if year == current_year:
-            # For current year, split into past (solid) and future (dashed)
-            past_data = year_data[year_data['DayOfYear'] <= current_day_of_year]
-            future_data = year_data[year_data['DayOfYear'] > current_day_of_year]
+            # For current year, show actual distance (solid) and projections from today (dashed)
+            fig.add_trace(go.Scatter(
+                x=days[:current_day_of_year],
+                y=cumulative[:current_day_of_year],
+                mode='lines',
+                name=f'{year} (actual)',
+                line=dict(width=4, color=color),
+                hovertemplate=f'<b>{year}</b><br>Day %{{x}}<br><b>%{{y:.1f}} km total</b><extra></extra>'
+            ))
             
-            # Add past data (solid line)
-            if not past_data.empty:
+            if yearly['projection'] is not None:
+                projection_days, projection = yearly['projection']
                 fig.add_trace(go.Scatter(
-                    x=past_data['DayOfYear'],
-                    y=past_data['CumulativeDistance'],
+                    x=projection_days,
+                    y=projection,
                     mode='lines',
-                    name=f'{year} (actual)',
-                    line=dict(width=4, color=color),
-                    hovertemplate=f'<b>{year}</b><br>Day %{{x}}<br><b>%{{y:.1f}} km total</b><extra></extra>'
+                    name=f'{year} (projection)',
+                    line=dict(width=3, color=color, dash='dash'),
+                    hovertemplate=f'<b>{year} (projected at current pace)</b><br>Day %{{x}}<br><b>%{{y:.1f}} km total</b><extra></extra>',
+                    opacity=0.6
                 ))
             
-            # Add future projection (dashed line)
-            if not future_data.empty and not past_data.empty:
-                # Connect the last actual point to future projection
-                last_actual = past_data.iloc[-1]['CumulativeDistance']
-                future_data_copy = future_data.copy()
-                future_data_copy['CumulativeDistance'] = last_actual  # Flat projection
-                
+            if yearly['goal'] is not None:
+                goal_days, goal_line, weekly_km = yearly['goal']
                 fig.add_trace(go.Scatter(
-                    x=future_data_copy['DayOfYear'],
-                    y=future_data_copy['CumulativeDistance'],
+                    x=goal_days,
+                    y=goal_line,
                     mode='lines',
-                    name=f'{year} (projection)',
-                    line=dict(width=3, color=color, dash='dash'),
-                    hovertemplate=f'<b>{year} (projected)</b><br>Day %{{x}}<br><b>%{{y:.1f}} km total</b><extra></extra>',
-                    opacity=0.6
+                    name=f'{year} (goal pace)',
+                    line=dict(width=2, color='#6b7280', dash='dot'),
+                    hovertemplate=f'<b>{year} goal pace ({weekly_km:.1f} km/week)</b><br>Day %{{x}}<br><b>%{{y:.1f}} km total</b><extra></extra>'
                 ))
         else:
             # For other years, show complete data
             fig.add_trace(go.Scatter(
-                x=year_data['DayOfYear'],
-                y=year_data['CumulativeDistance'],
+                x=days,
+                y=cumulative,
                 mode='lines',
                 name=f'{year}',
                 line=dict(width=3, color=color),
@@ -603,8 +397,7 @@ def create_yearly_cumulative_chart(df, today):
             ))
     
     # Add vertical line for "today"
-    if current_year in [year_data['Year'].iloc[0] for year_data in yearly_data]:
-        max_distance = max([year_data['CumulativeDistance'].max() for year_data in yearly_data])
+    if current_year in years:
         fig.add_vline(
             x=current_day_of_year,
             line=dict(color="red", width=3, dash="solid"),
@@ -618,24 +411,9 @@ def create_yearly_cumulative_chart(df, today):
             )
         )
     
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(family="Inter, sans-serif", size=12, color="#374151"),
-        xaxis=dict(
-            title="Day of Year",
-            showgrid=True,
-            gridcolor='#f3f4f6',
-            title_font=dict(size=14, color="#6b7280"),
-            range=[1, 365]
-        ),
-        yaxis=dict(
-            title="Cumulative Distance (km)",
-            showgrid=True,
-            gridcolor='#f3f4f6',
-            title_font=dict(size=14, color="#6b7280")
-        ),
-        margin=dict(l=0, r=0, t=20, b=0),
+    apply_stats_layout(
+        fig, "Day of Year", "Cumulative Distance (km)",
+        xaxis=dict(range=[1, 365]),
         height=400,
         hovermode='x unified',
         legend=dict(
@@ -658,7 +436,7 @@ def create_correlation_chart(df_filtered, x_col, y_col, title, x_label, y_label,
     
     # Add workout type detection
     valid_data = valid_data.copy()
-    valid_data['workout_type'] = valid_data.apply(detect_workout_type, axis=1)
+    valid_data['workout_type'] = get_workout_types(valid_data)
     
     # For pace data, filter out unrealistic values (pace is already in min/km)
     if 'pace' in x_col.lower() and 'minutes' in x_col.lower():
@@ -702,18 +480,8 @@ def create_correlation_chart(df_filtered, x_col, y_col, title, x_label, y_label,
     pace_tick_vals = [3, 4, 5, 6, 7, 8, 9, 10, 11, 12]
     pace_tick_text = [format_pace_to_min_sec(val) for val in pace_tick_vals]
     
-    xaxis_config = dict(
-        title=x_label, 
-        showgrid=True, 
-        gridcolor='#f3f4f6',
-        title_font=dict(size=14, color="#6b7280")
-    )
-    yaxis_config = dict(
-        title=y_label, 
-        showgrid=True, 
-        gridcolor='#f3f4f6',
-        title_font=dict(size=14, color="#6b7280")
-    )
+    xaxis_config = {}
+    yaxis_config = {}
     
     # Set reasonable axis ranges and custom ticks for pace charts
     if 'pace' in x_label.lower():
@@ -729,61 +497,46 @@ def create_correlation_chart(df_filtered, x_col, y_col, title, x_label, y_label,
             'ticktext': pace_tick_text
         })
     
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(family="Inter, sans-serif", size=12, color="#374151"),
-        xaxis=xaxis_config,
-        yaxis=yaxis_config,
-        margin=dict(l=0, r=0, t=20, b=0),
-        height=300,
+    apply_stats_layout(
+        fig, x_label, y_label, xaxis=xaxis_config, yaxis=yaxis_config,
         showlegend=False  # Hide legend since we have the workout type legend above
     )
     
     return fig
 
 
-def create_heart_rate_zones_chart(df_filtered):
-    """Create heart rate zones distribution pie chart"""
-    hr_data = df_filtered['Avg HR'].dropna()
-    if hr_data.empty or len(hr_data) <= 5:
+def create_heart_rate_zones_chart(df_filtered, zones=None, totals=None):
+    """Create heart rate zones distribution pie chart
+
+    `zones` come from the runner profile (utils.hr_zones.profile_zones; the
+    max HR estimate when not given). `totals` are the period's precomputed
+    utils.hr_zones.zone_totals(); otherwise they are computed from df_filtered.
+    """
+    if zones is None:
+        zones = profile_zones()
+    if totals is None:
+        totals = zone_totals(build_zone_index(df_filtered, zones))
+    if totals['hr_runs'] <= 5:
         return None
     
-    # Define HR zones based on common training zones
-    max_hr_estimate = 220 - 30  # Assume average age of 30 for estimation
-    zones = {
-        'Zone 1 (Recovery)\n{:.0f}-{:.0f} bpm'.format(max_hr_estimate * 0.5, max_hr_estimate * 0.6): (max_hr_estimate * 0.5, max_hr_estimate * 0.6),
-        'Zone 2 (Aerobic)\n{:.0f}-{:.0f} bpm'.format(max_hr_estimate * 0.6, max_hr_estimate * 0.7): (max_hr_estimate * 0.6, max_hr_estimate * 0.7),
-        'Zone 3 (Tempo)\n{:.0f}-{:.0f} bpm'.format(max_hr_estimate * 0.7, max_hr_estimate * 0.8): (max_hr_estimate * 0.7, max_hr_estimate * 0.8),
-        'Zone 4 (Threshold)\n{:.0f}-{:.0f} bpm'.format(max_hr_estimate * 0.8, max_hr_estimate * 0.9): (max_hr_estimate * 0.8, max_hr_estimate * 0.9),
-        'Zone 5 (VO2 Max)\n{:.0f}+ bpm'.format(max_hr_estimate * 0.9): (max_hr_estimate * 0.9, 220)
-    }
-    
-    zone_counts = []
-    zone_names = []
-    zone_colors = ['#22c55e', '#84cc16', '#eab308', '#f97316', '#ef4444']
-    
-    for i, (zone_name, (min_hr, max_hr)) in enumerate(zones.items()):
-        count = len(hr_data[(hr_data >= min_hr) & (hr_data <= max_hr)])
-        if count > 0:  # Only include zones with data
-            zone_counts.append(count)
-            zone_names.append(zone_name)
-    
-    if not zone_counts:
+    # Only include zones with data
+    present = np.flatnonzero(totals['runs'])
+    if not len(present):
         return None
     
+    zone_counts = totals['runs'][present]
+    zone_names = [zone_label(zones[i]) for i in present]
+    zone_hours = totals['minutes'][present] / 60
+    
     fig = px.pie(
         values=zone_counts,
         names=zone_names,
         title="",
-        color_discrete_sequence=zone_colors[:len(zone_counts)]
+        color_discrete_sequence=[ZONE_COLORS[i] for i in present]
     )
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(family="Inter, sans-serif", size=10, color="#374151"),
-        margin=dict(l=0, r=0, t=20, b=0),
-        height=300,
+    apply_stats_layout(
+        fig,
+        font=dict(size=10),
         showlegend=True,
         legend=dict(
             orientation="v",
@@ -798,7 +551,8 @@ def create_heart_rate_zones_chart(df_filtered):
         textposition='inside',
         textinfo='percent',
         textfont=dict(size=12),
-        hovertemplate='<b>%{label}</b><br>%{value} runs (%{percent})<extra></extra>'
+        customdata=zone_hours,
+        hovertemplate='<b>%{label}</b><br>%{value} runs (%{percent})<br>%{customdata:.1f} h in zone<extra></extra>'
     )
     
     return fig
@@ -825,25 +579,7 @@ def create_monthly_volume_chart(df_filtered):
         title="",
         color_discrete_sequence=['#8b5cf6']
     )
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(family="Inter, sans-serif", size=12, color="#374151"),
-        xaxis=dict(
-            title="Month", 
-            showgrid=True, 
-            gridcolor='#f3f4f6',
-            title_font=dict(size=14, color="#6b7280")
-        ),
-        yaxis=dict(
-            title="Distance (km)", 
-            showgrid=True, 
-            gridcolor='#f3f4f6',
-            title_font=dict(size=14, color="#6b7280")
-        ),
-        margin=dict(l=0, r=0, t=20, b=0),
-        height=300
-    )
+    apply_stats_layout(fig, "Month", "Distance (km)")
     fig.update_traces(
         hovertemplate='<b>%{y:.1f} km</b><br>%{x}<extra></extra>'
     )
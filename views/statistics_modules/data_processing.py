@@ -5,59 +5,17 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
-
-def parse_time_to_minutes(time_str):
-    """Convert time string to minutes
-    
-    Handles multiple formats:
-    - MM:SS:00 (minutes:seconds:centiseconds) - common in running data
-    - HH:MM:SS (hours:minutes:seconds) - for very long activities
-    - MM:SS (minutes:seconds)
-    - Numeric values (already in minutes)
-    """
-    if pd.isna(time_str) or time_str == '' or time_str == '-':
-        return None
-    try:
-        if isinstance(time_str, str):
-            parts = time_str.split(':')
-            if len(parts) == 3:
-                # Check if this looks like MM:SS:00 format (common in running data)
-                # If first part > 24, it's likely minutes, not hours
-                first_part = int(parts[0])
-                if first_part > 24:  # Likely MM:SS:00 format
-                    return first_part + int(parts[1]) / 60 + int(parts[2]) / 3600
-                else:  # Traditional HH:MM:SS format
-                    return first_part * 60 + int(parts[1]) + int(parts[2]) / 60
-            elif len(parts) == 2:  # MM:SS
-                return int(parts[0]) + int(parts[1]) / 60
-        return float(time_str)
-    except:
-        return None
-
-
-def parse_pace_to_minutes(pace_input):
-    """Convert pace input to minutes per km (handles both min:sec and decimal formats)
-    
-    Input formats supported:
-    - "5:30" -> 5.5 minutes
-    - "6:15" -> 6.25 minutes  
-    - 5.5 -> 5.5 minutes (decimal)
-    - 6.25 -> 6.25 minutes (decimal)
-    """
-    if pd.isna(pace_input) or pace_input == '' or pace_input == '-':
-        return None
-    try:
-        if isinstance(pace_input, str) and ':' in pace_input:
-            # Handle min:sec format (e.g., "5:30")
-            parts = pace_input.split(':')
-            minutes = int(parts[0])
-            seconds = int(parts[1])
-            return minutes + seconds / 60.0
-        else:
-            # Handle decimal format (e.g., 5.5) or numeric input
-            return float(pace_input)
-    except:
-        return None
+from utils.activity_frame import is_activity_frame
+from utils.workout_classifier import classify_workout_types
+from utils.duration_parser import (
+    parse_time_to_minutes,
+    parse_pace_to_minutes,
+    parse_time_series_to_minutes,
+    parse_pace_series_to_minutes,
+)
+from .rollups import GRANULARITIES, TREND_METRICS, build_rollup_cube, slice_rollup
+from .period_index import build_period_index, window_metrics
+from .downsampling import MAX_POINTS_PER_TRACE, downsample_plot_frame
 
 
 def format_pace_to_min_sec(minutes):
@@ -100,7 +58,8 @@ def calculate_training_load_score(df):
     # Simple formula: distance * intensity factor (based on pace)
     # Faster paces get higher intensity multiplier
     df_calc = df.copy()
-    df_calc['pace_minutes'] = df_calc['Pace (min/km)'].apply(parse_pace_to_minutes)
+    if 'pace_minutes' not in df_calc.columns:
+        df_calc['pace_minutes'] = parse_pace_series_to_minutes(df_calc['Pace (min/km)'])
     
     # Normalize pace to intensity (faster = higher intensity)
     if df_calc['pace_minutes'].notna().any():
@@ -222,6 +181,19 @@ def detect_workout_type(row):
     return 'Default'
 
 
+def get_workout_types(df):
+    """Get the workout type of every activity (same labels as detect_workout_type)"""
+    # The activity frame already carries the labels, computed once at ingest
+    if 'detected_workout_type' in df.columns:
+        workout_types = df['detected_workout_type']
+    else:
+        workout_types = classify_workout_types(df)
+    if isinstance(workout_types.dtype, pd.CategoricalDtype):
+        # Keep value_counts()/unique() limited to the types actually present
+        workout_types = workout_types.cat.remove_unused_categories()
+    return workout_types
+
+
 def get_workout_type_style(workout_type):
     """Get color and symbol for workout type"""
     styles = {
@@ -238,13 +210,17 @@ def get_workout_type_style(workout_type):
 
 def preprocess_dataframe(df):
     """Preprocess the dataframe with all necessary data transformations"""
+    if is_activity_frame(df):
+        # Already typed and parsed at ingest (utils.activity_frame); only drop invalid rows
+        return df[df['Distance (km)'] > 0]
+
     df = df.copy()
     df['Date'] = pd.to_datetime(df['Date'])
     df['Distance (km)'] = pd.to_numeric(df['Distance (km)'], errors='coerce')
-    df['moving_time_minutes'] = df['Moving Time'].apply(parse_time_to_minutes)
+    df['moving_time_minutes'] = parse_time_series_to_minutes(df['Moving Time'])
     
     # Parse pace data (handles both min:sec and decimal formats)
-    df['pace_minutes'] = df['Pace (min/km)'].apply(parse_pace_to_minutes)
+    df['pace_minutes'] = parse_pace_series_to_minutes(df['Pace (min/km)'])
     
     df['Avg HR'] = pd.to_numeric(df['Avg HR'], errors='coerce')
     df['Elevation Gain'] = pd.to_numeric(df['Elevation Gain'], errors='coerce')
@@ -255,92 +231,85 @@ def preprocess_dataframe(df):
     return df
 
 
+def get_period_start(time_period, today):
+    """First date included in the time period (None for all time)"""
+    if time_period:
+        return today - timedelta(days=time_period)
+    return None
+
+
 def filter_data_by_time_period(df, time_period, today):
     """Filter dataframe based on time period"""
-    if time_period:
-        cutoff_date = today - timedelta(days=time_period)
+    cutoff_date = get_period_start(time_period, today)
+    if cutoff_date is not None:
         return df[df['Date'] >= cutoff_date]
     return df
 
 
-def calculate_key_metrics(df_filtered, time_period, today, df_full):
-    """Calculate all key metrics for the dashboard"""
-    total_distance = df_filtered['Distance (km)'].sum()
-    total_runs = len(df_filtered)
-    total_time = df_filtered['moving_time_minutes'].sum()
-    avg_distance = df_filtered['Distance (km)'].mean()
-    avg_pace_minutes = df_filtered['pace_minutes'].mean()
-    avg_hr = df_filtered['Avg HR'].mean()
-    total_elevation = df_filtered['Elevation Gain'].sum()
-    training_load = calculate_training_load_score(df_filtered)
+def calculate_key_metrics(df_filtered, time_period, today, df_full, period_index=None):
+    """Calculate all key metrics for the dashboard
+
+    The current and previous period metrics come from the prefix-sum index of
+    `df_full` (see period_index.get_period_index; built here when not given),
+    so `df_filtered` is not scanned again.
+    """
+    if period_index is None:
+        period_index = build_period_index(df_full)
+    cutoff_date = get_period_start(time_period, today)
+    metrics = window_metrics(period_index, start=cutoff_date)
     
     # Calculate previous period for comparison
     distance_change = 0
     runs_change = 0
     
     if time_period:
-        cutoff_date = today - timedelta(days=time_period)
         prev_start = cutoff_date - timedelta(days=time_period)
-        prev_end = cutoff_date
-        df_prev = df_full[(df_full['Date'] >= prev_start) & (df_full['Date'] < prev_end)]
+        prev = window_metrics(period_index, start=prev_start, end=cutoff_date)
         
-        prev_distance = df_prev['Distance (km)'].sum() if not df_prev.empty else 0
-        prev_runs = len(df_prev)
+        prev_distance = prev['total_distance']
+        prev_runs = prev['total_runs']
+        total_distance = metrics['total_distance']
+        total_runs = metrics['total_runs']
         
         distance_change = ((total_distance - prev_distance) / prev_distance * 100) if prev_distance > 0 else 0
         runs_change = ((total_runs - prev_runs) / prev_runs * 100) if prev_runs > 0 else 0
     
-    return {
-        'total_distance': total_distance,
-        'total_runs': total_runs,
-        'total_time': total_time,
-        'avg_distance': avg_distance,
-        'avg_pace_minutes': avg_pace_minutes,
-        'avg_hr': avg_hr,
-        'total_elevation': total_elevation,
-        'training_load': training_load,
-        'distance_change': distance_change,
-        'runs_change': runs_change
-    }
+    metrics['distance_change'] = distance_change
+    metrics['runs_change'] = runs_change
+    return metrics
 
 
-def aggregate_data_by_time(df, time_aggregation, value_column, agg_method='sum'):
-    """Aggregate data based on time aggregation setting"""
-    df_agg = df.copy()
-    
-    if time_aggregation == "daily":
-        if agg_method == 'sum':
-            df_plot = df_agg.groupby('Date')[value_column].sum().reset_index()
-        else:
-            df_plot = df_agg.groupby('Date')[value_column].mean().reset_index()
+def aggregate_data_by_time(df, time_aggregation, value_column, agg_method='sum', cube=None, since=None,
+                           zoom=None, max_points=MAX_POINTS_PER_TRACE):
+    """Aggregate data based on time aggregation setting
+
+    Slices `cube` (see rollups.get_rollup_cube) when given, keeping activities
+    from `since` on; otherwise rolls up `df` itself. Unrealistic values are
+    dropped as defined in rollups.TREND_METRICS. Daily data is limited to the
+    `zoom` date range and downsampled to `max_points` (see downsampling).
+    """
+    granularity = time_aggregation if time_aggregation in GRANULARITIES else 'yearly'
+    if cube is None:
+        cube = build_rollup_cube(df, {value_column: TREND_METRICS.get(value_column)})
+    series = slice_rollup(cube, granularity, value_column, agg_method, since)
+
+    if granularity == "daily":
+        df_plot = pd.DataFrame({'Date': series.index, value_column: series.to_numpy()})
+        df_plot = downsample_plot_frame(df_plot, value_column, max_points, zoom)
         x_title = "Date"
         hover_template = f'<b>%{{y:.1f}}</b><br>%{{x}}<extra></extra>'
-    elif time_aggregation == "weekly":
-        df_agg['Week'] = df_agg['Date'].dt.to_period('W').dt.start_time
-        if agg_method == 'sum':
-            df_plot = df_agg.groupby('Week')[value_column].sum().reset_index()
-        else:
-            df_plot = df_agg.groupby('Week')[value_column].mean().reset_index()
-        df_plot.rename(columns={'Week': 'Date'}, inplace=True)
+    elif granularity == "weekly":
+        df_plot = pd.DataFrame({'Date': series.index, value_column: series.to_numpy()})
         x_title = "Week"
         hover_template = f'<b>%{{y:.1f}}</b><br>Week of %{{x}}<extra></extra>'
-    elif time_aggregation == "monthly":
-        df_agg['Month'] = df_agg['Date'].dt.to_period('M').dt.start_time
-        if agg_method == 'sum':
-            df_plot = df_agg.groupby('Month')[value_column].sum().reset_index()
-        else:
-            df_plot = df_agg.groupby('Month')[value_column].mean().reset_index()
-        df_plot.rename(columns={'Month': 'Date'}, inplace=True)
+    elif granularity == "monthly":
+        df_plot = pd.DataFrame({'Date': series.index, value_column: series.to_numpy()})
         x_title = "Month"
         hover_template = f'<b>%{{y:.1f}}</b><br>%{{x|%B %Y}}<extra></extra>'
     else:  # yearly
-        df_agg['Year'] = df_agg['Date'].dt.year
-        if agg_method == 'sum':
-            df_plot = df_agg.groupby('Year')[value_column].sum().reset_index()
-        else:
-            df_plot = df_agg.groupby('Year')[value_column].mean().reset_index()
-        df_plot['Date'] = pd.to_datetime(df_plot['Year'], format='%Y')
+        df_plot = pd.DataFrame({'Year': series.index, value_column: series.to_numpy()})
+        df_plot['Date'] = pd.to_datetime(df_plot['Year'].astype(str), format='%Y')
         x_title = "Year"
         hover_template = f'<b>%{{y:.1f}}</b><br>%{{x|%Y}}<extra></extra>'
     
-    return df_plot, x_title, hover_template 
\ No newline at end of file
+    return df_plot, x_title, hover_template 
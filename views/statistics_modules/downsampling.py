@@ -0,0 +1,83 @@
+"""
+Point budget for daily trend charts.
+
+Daily charts over a long history have one point per activity date. Before
+they are sent to the browser, downsample_plot_frame() reduces them to at most
+MAX_POINTS_PER_TRACE points with LTTB (largest triangle three buckets).
+LTTB keeps the first and last points, and from every bucket the point that
+spans the largest triangle with its neighbours. Isolated peaks such as race
+days therefore survive, and the line keeps its shape.
+
+A zoom range restricts the data first. A narrow range fits the budget and is
+drawn at full resolution.
+"""
+import numpy as np
+import pandas as pd
+
+MAX_POINTS_PER_TRACE = 1000
+
+
+def lttb_indices(x, y, max_points):
+    """
+    Positions of the points LTTB keeps.
+
+    Args:
+        x: Increasing numeric x values
+        y: Values (no NaN)
+        max_points: Point budget (at least 3)
+
+    Returns:
+        Sorted integer array of kept positions
+    """
+    n = len(x)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    # Bucket edges over the points between the fixed first and last ones
+    edges = np.floor(np.arange(max_points - 1) * (n - 2) / (max_points - 2)).astype(int) + 1
+    edges[-1] = n - 1
+    counts = np.diff(edges)
+    # Mean of every bucket (the last "next bucket" is the final point itself)
+    mean_x = np.append(np.add.reduceat(x[:-1], edges[:-1]) / counts, x[-1])
+    mean_y = np.append(np.add.reduceat(y[:-1], edges[:-1]) / counts, y[-1])
+
+    kept = np.empty(max_points, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_x, next_y = mean_x[bucket + 1], mean_y[bucket + 1]
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        kept[bucket + 1] = previous
+    return kept
+
+
+def downsample_plot_frame(df_plot, value_column, max_points=MAX_POINTS_PER_TRACE, zoom=None, x_column='Date'):
+    """
+    Restrict a chart frame to the zoom range and cap its number of points.
+
+    Args:
+        df_plot: Chart frame sorted by x_column
+        value_column: Plotted column
+        max_points: Point budget (None keeps every point)
+        zoom: Optional (start, end) dates, both included
+        x_column: Datetime x column
+
+    Returns:
+        Frame with at most max_points rows
+    """
+    if zoom is not None:
+        start, end = pd.Timestamp(zoom[0]), pd.Timestamp(zoom[1]) + pd.Timedelta(days=1)
+        df_plot = df_plot[(df_plot[x_column] >= start) & (df_plot[x_column] < end)]
+    if max_points is None or len(df_plot) <= max_points:
+        return df_plot
+
+    x = df_plot[x_column].to_numpy(dtype='datetime64[ns]').astype('int64')
+    kept = lttb_indices(x, df_plot[value_column].to_numpy(), max_points)
+    return df_plot.iloc[kept]
@@ -0,0 +1,79 @@
+"""
+Shared chart theme and figure cache for the statistics dashboard.
+
+STATS_TEMPLATE is the dashboard theme (transparent background, Inter font,
+light grid, muted axis titles) built once on top of Plotly's default template.
+apply_stats_layout() puts it on a figure together with the chart's own
+settings, in a single update_layout call.
+
+Built figures are kept in a bounded LRU keyed by (chart id, data version,
+time period, aggregation, day, ...). A rerun that does not change a chart's
+inputs (any unrelated widget click) reuses the figure instead of rebuilding
+it. Cached figures are shared, so callers must not modify them.
+"""
+import copy
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from utils.lru_cache import BoundedLRUCache
+
+FIGURE_CACHE_SIZE = 64
+
+AXIS_THEME = dict(
+    showgrid=True,
+    gridcolor='#f3f4f6',
+    title=dict(font=dict(size=14, color="#6b7280")),
+)
+STATS_MARGIN = dict(l=0, r=0, t=20, b=0)
+
+STATS_TEMPLATE = go.layout.Template(copy.deepcopy(pio.templates['plotly']))
+STATS_TEMPLATE.layout.update(
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)',
+    font=dict(family="Inter, sans-serif", size=12, color="#374151"),
+    xaxis=AXIS_THEME,
+    yaxis=AXIS_THEME,
+    margin=STATS_MARGIN,
+)
+
+_figure_cache = BoundedLRUCache(maxsize=FIGURE_CACHE_SIZE)
+
+
+def apply_stats_layout(fig, x_title=None, y_title=None, xaxis=None, yaxis=None, height=300, **layout):
+    """Apply the dashboard theme plus chart-specific layout settings to `fig`."""
+    xaxis = dict(xaxis or {})
+    yaxis = dict(yaxis or {})
+    if x_title is not None:
+        xaxis['title'] = x_title
+    if y_title is not None:
+        yaxis['title'] = y_title
+    # Plotly Express sets its own top margin explicitly, so the margin is not left to the template
+    fig.update_layout(
+        template=STATS_TEMPLATE, margin=STATS_MARGIN, height=height,
+        xaxis=xaxis, yaxis=yaxis, **layout
+    )
+    return fig
+
+
+def cached_figure(chart_id, figure_key, build):
+    """
+    Return the figure for `chart_id`, building it only on a cache miss.
+
+    Args:
+        chart_id: Name of the chart
+        figure_key: Tuple of everything else the chart depends on (data
+            version, controls, ...); None disables caching
+        build: Callable returning the figure (or None when there is no data)
+
+    Returns:
+        The cached or newly built figure
+    """
+    if figure_key is None:
+        return build()
+    return _figure_cache.get_or_compute((chart_id,) + tuple(figure_key), build)
+
+
+def get_figure_cache_stats():
+    """Return size and hit/miss counters of the figure cache."""
+    return _figure_cache.stats()
@@ -1,20 +1,136 @@
 """
 Insights and recommendations generator for running statistics
+
+The insight rules read a small feature dict per time period (totals, means,
+first/last runs, training load, workout type counts). extract_insight_features()
+builds those dicts for several periods in one pass: the activities are sorted
+by date once, and every period ending today is a slice of the sorted arrays.
+The insights of every period button are therefore computed together and cached
+per data version.
 """
+import numpy as np
 import pandas as pd
 
+from utils.lru_cache import BoundedLRUCache
+from .data_processing import get_period_start, get_workout_types
 
-def generate_insights(df_filtered, time_period):
-    """Generate personalized insights and recommendations based on running data"""
+INSIGHT_PERIODS = [7, 30, 90, 365, None]     # the time period buttons (None = all time)
+INSIGHTS_CACHE_SIZE = 8
+MIN_RUNS = 5
+TREND_RUNS = 5                               # runs averaged at each end of a trend
+
+_insights_cache = BoundedLRUCache(maxsize=INSIGHTS_CACHE_SIZE)
+
+
+def _numeric(df, col, order):
+    if col not in df.columns:
+        return np.full(len(order), np.nan)
+    return pd.to_numeric(df[col], errors='coerce').to_numpy(dtype='float64')[order]
+
+
+def _mean(values):
+    """Mean of the non-NaN values, as pandas' mean() (NaN when there are none)."""
+    values = values[~np.isnan(values)]
+    return values.mean() if len(values) else np.nan
+
+
+def _window_features(columns, type_codes, type_labels, lo, hi):
+    """Feature dict of the sorted activities in [lo, hi)."""
+    distance = columns['distance'][lo:hi]
+    pace = columns['pace'][lo:hi]
+    paced = pace[~np.isnan(pace)]
+    hr = columns['hr'][lo:hi]
+    hr = hr[~np.isnan(hr)]
+    elevation = columns['elevation'][lo:hi]
+    elevation = elevation[~np.isnan(elevation)]
+    cadence = columns['cadence'][lo:hi]
+    cadence = cadence[~np.isnan(cadence)]
+
+    # Training load as in calculate_training_load_score(): faster than the window's slowest pace = more intense
+    if len(paced):
+        slowest = paced.max()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            intensity = (slowest - pace) / slowest + 0.5
+        intensity = np.where(np.isnan(intensity), 0.7, intensity)
+    else:
+        intensity = np.full(len(distance), 0.7)
+
+    workout_types = None
+    if type_codes is not None:
+        counts = np.bincount(type_codes[lo:hi][type_codes[lo:hi] >= 0], minlength=len(type_labels))
+        order = np.argsort(-counts, kind='stable')
+        workout_types = {type_labels[code]: int(counts[code]) for code in order if counts[code]}
+
+    return {
+        'runs': hi - lo,
+        'total_distance': np.nansum(distance),
+        'earlier_distance': _mean(distance[:TREND_RUNS]),
+        'recent_distance': _mean(distance[-TREND_RUNS:]),
+        'pace_count': len(paced),
+        'pace_mean': _mean(paced),
+        'pace_std': paced.std(ddof=1) if len(paced) > 1 else np.nan,
+        'earlier_pace': _mean(paced[:TREND_RUNS]),
+        'recent_pace': _mean(paced[-TREND_RUNS:]),
+        'hr_mean': _mean(hr),
+        'elevation_count': len(elevation),
+        'total_elevation': elevation.sum(),
+        'cadence_mean': _mean(cadence),
+        'training_load': np.nansum(distance * intensity),
+        'workout_types': workout_types,
+    }
+
+
+def extract_insight_features(df, starts=(None,)):
+    """
+    Insight features of several periods of `df` in one pass.
+
+    Args:
+        df: Preprocessed activity frame
+        starts: First date of every period (None for all activities, undated ones included)
+
+    Returns:
+        List of feature dicts, aligned with starts
+    """
+    dates = pd.to_datetime(df['Date']).to_numpy(dtype='datetime64[ns]')
+    # NaT sorts last, so every dated period is one contiguous slice
+    order = np.argsort(dates, kind='stable')
+    dates = dates[order]
+    dated = int((~np.isnat(dates)).sum())
+
+    columns = {
+        'distance': _numeric(df, 'Distance (km)', order),
+        'pace': _numeric(df, 'pace_minutes', order),
+        'hr': _numeric(df, 'Avg HR', order),
+        'elevation': _numeric(df, 'Elevation Gain', order),
+        'cadence': _numeric(df, 'Cadence', order),
+    }
+    type_codes, type_labels = None, None
+    if 'Name' in df.columns or 'Activity Name' in df.columns:
+        type_codes, type_labels = pd.factorize(get_workout_types(df).astype(object))
+        type_codes = type_codes[order]
+
+    features = []
+    for start in starts:
+        if start is None:
+            lo, hi = 0, len(order)
+        else:
+            lo, hi = int(dates[:dated].searchsorted(np.datetime64(pd.Timestamp(start), 'ns'))), dated
+        features.append(_window_features(columns, type_codes, type_labels, lo, hi))
+    return features
+
+
+def evaluate_insights(features, time_period):
+    """Generate personalized insights and recommendations from a feature dict of extract_insight_features()"""
     insights = []
+    total_runs = features['runs']
     
-    if len(df_filtered) < 5:
+    if total_runs < MIN_RUNS:
         return insights
     
     # Pace consistency analysis
-    if not df_filtered['pace_minutes'].dropna().empty:
-        pace_std = df_filtered['pace_minutes'].std()
-        pace_mean = df_filtered['pace_minutes'].mean()
+    if features['pace_count']:
+        pace_std = features['pace_std']
+        pace_mean = features['pace_mean']
         cv = (pace_std / pace_mean) * 100 if pace_mean > 0 else 0
         
         if cv < 10:
@@ -25,8 +141,7 @@ def generate_insights(df_filtered, time_period):
             insights.append("⚠️ **Variable pacing** - Consider focusing on consistent effort levels and using a GPS watch or app for better pace feedback.")
     
     # Volume analysis with specific recommendations
-    total_distance = df_filtered['Distance (km)'].sum()
-    total_runs = len(df_filtered)
+    total_distance = features['total_distance']
     
     if time_period == 7:
         weekly_distance = total_distance
@@ -39,24 +154,23 @@ def generate_insights(df_filtered, time_period):
         else:
             insights.append("✅ **Healthy weekly volume** - Good foundation. Perfect range for steady improvement and injury prevention.")
     
-    # Distance progression analysis
-    if len(df_filtered) >= 5:
-        recent_distances = df_filtered.tail(5)['Distance (km)'].mean()
-        earlier_distances = df_filtered.head(5)['Distance (km)'].mean()
-        progression = ((recent_distances - earlier_distances) / earlier_distances * 100) if earlier_distances > 0 else 0
-        
-        if progression > 15:
-            insights.append("📊 **Strong distance progression** - Your average run distance has increased significantly. Great for building endurance!")
-        elif progression > 5:
-            insights.append("📈 **Positive distance trend** - Gradual increase in run length shows smart progression and reduced injury risk.")
-        elif progression < -15:
-            insights.append("📉 **Decreasing distance trend** - Consider if this aligns with your goals. Recovery phases are normal in training cycles.")
-        else:
-            insights.append("🔄 **Stable distance pattern** - Consistent run lengths are great for building aerobic base and establishing routine.")
+    # Distance progression analysis (first vs last runs by date)
+    recent_distances = features['recent_distance']
+    earlier_distances = features['earlier_distance']
+    progression = ((recent_distances - earlier_distances) / earlier_distances * 100) if earlier_distances > 0 else 0
+    
+    if progression > 15:
+        insights.append("📊 **Strong distance progression** - Your average run distance has increased significantly. Great for building endurance!")
+    elif progression > 5:
+        insights.append("📈 **Positive distance trend** - Gradual increase in run length shows smart progression and reduced injury risk.")
+    elif progression < -15:
+        insights.append("📉 **Decreasing distance trend** - Consider if this aligns with your goals. Recovery phases are normal in training cycles.")
+    else:
+        insights.append("🔄 **Stable distance pattern** - Consistent run lengths are great for building aerobic base and establishing routine.")
     
     # Heart rate analysis with training zones
-    if not df_filtered['Avg HR'].dropna().empty:
-        avg_hr_value = df_filtered['Avg HR'].mean()
+    avg_hr_value = features['hr_mean']
+    if not np.isnan(avg_hr_value):
         if avg_hr_value > 170:
             insights.append("🔥 **High intensity focus** - Most runs are at high intensity. Consider adding easy aerobic runs for better recovery.")
         elif avg_hr_value > 150:
@@ -79,24 +193,21 @@ def generate_insights(df_filtered, time_period):
             insights.append("👌 **Good frequency** - 3-4 runs per week provides solid fitness gains while allowing adequate recovery.")
     
     # Performance trend analysis
-    if len(df_filtered) >= 10:
-        pace_data = df_filtered.dropna(subset=['pace_minutes']).sort_values('Date')
-        if len(pace_data) >= 10:
-            recent_pace = pace_data.tail(5)['pace_minutes'].mean()
-            earlier_pace = pace_data.head(5)['pace_minutes'].mean()
-            pace_improvement = ((earlier_pace - recent_pace) / earlier_pace * 100) if earlier_pace > 0 else 0
-            
-            if pace_improvement > 5:
-                insights.append("🚀 **Improving pace** - Your speed has increased significantly! Your training is paying off.")
-            elif pace_improvement > 2:
-                insights.append("📈 **Gradual pace improvement** - Steady progress is sustainable progress. Keep up the consistent training!")
-            elif pace_improvement < -5:
-                insights.append("🔄 **Pace variation** - Consider if recent runs included more hills, weather challenges, or recovery runs.")
+    if total_runs >= 10 and features['pace_count'] >= 10:
+        recent_pace = features['recent_pace']
+        earlier_pace = features['earlier_pace']
+        pace_improvement = ((earlier_pace - recent_pace) / earlier_pace * 100) if earlier_pace > 0 else 0
+        
+        if pace_improvement > 5:
+            insights.append("🚀 **Improving pace** - Your speed has increased significantly! Your training is paying off.")
+        elif pace_improvement > 2:
+            insights.append("📈 **Gradual pace improvement** - Steady progress is sustainable progress. Keep up the consistent training!")
+        elif pace_improvement < -5:
+            insights.append("🔄 **Pace variation** - Consider if recent runs included more hills, weather challenges, or recovery runs.")
     
     # Elevation analysis
-    if not df_filtered['Elevation Gain'].dropna().empty:
-        total_elevation = df_filtered['Elevation Gain'].sum()
-        avg_elevation_per_run = total_elevation / total_runs if total_runs > 0 else 0
+    if features['elevation_count']:
+        avg_elevation_per_run = features['total_elevation'] / total_runs
         
         if avg_elevation_per_run > 100:
             insights.append("⛰️ **Hill training champion** - Great elevation gain! Hills build strength and improve running economy.")
@@ -106,22 +217,18 @@ def generate_insights(df_filtered, time_period):
             insights.append("🏃‍♀️ **Flat terrain runner** - Consider adding some hill training to improve strength and power.")
     
     # Cadence analysis
-    if not df_filtered['Cadence'].dropna().empty:
-        cadence_data = pd.to_numeric(df_filtered['Cadence'], errors='coerce').dropna()
-        if not cadence_data.empty:
-            avg_cadence = cadence_data.mean()
-            if avg_cadence > 180:
-                insights.append("👟 **Optimal cadence** - Your step rate is in the ideal range for efficient running form.")
-            elif avg_cadence > 170:
-                insights.append("🦵 **Good cadence** - Slightly increasing your step rate could improve efficiency and reduce injury risk.")
-            elif avg_cadence < 160:
-                insights.append("⏰ **Low cadence** - Consider working on quicker, shorter steps to improve running efficiency.")
+    avg_cadence = features['cadence_mean']
+    if not np.isnan(avg_cadence):
+        if avg_cadence > 180:
+            insights.append("👟 **Optimal cadence** - Your step rate is in the ideal range for efficient running form.")
+        elif avg_cadence > 170:
+            insights.append("🦵 **Good cadence** - Slightly increasing your step rate could improve efficiency and reduce injury risk.")
+        elif avg_cadence < 160:
+            insights.append("⏰ **Low cadence** - Consider working on quicker, shorter steps to improve running efficiency.")
     
     # Training load analysis
     if time_period and time_period >= 14:  # At least 2 weeks of data
-        from .data_processing import calculate_training_load_score
-        training_load = calculate_training_load_score(df_filtered)
-        load_per_week = training_load / (time_period / 7)
+        load_per_week = features['training_load'] / (time_period / 7)
         
         if load_per_week > 200:
             insights.append("🔥 **High training load** - Monitor fatigue levels and ensure adequate recovery between hard sessions.")
@@ -131,20 +238,14 @@ def generate_insights(df_filtered, time_period):
             insights.append("📊 **Conservative training load** - Room to gradually increase either volume or intensity for faster progress.")
     
     # Workout type diversity analysis
-    if 'Name' in df_filtered.columns or 'Activity Name' in df_filtered.columns:
-        from .data_processing import detect_workout_type
-        df_with_types = df_filtered.copy()
-        df_with_types['workout_type'] = df_with_types.apply(detect_workout_type, axis=1)
-        workout_types = df_with_types['workout_type'].value_counts()
-        
-        if len(workout_types) == 1 and workout_types.index[0] == 'Default':
+    workout_types = features['workout_types']
+    if workout_types is not None:
+        if list(workout_types) == ['Default']:
             insights.append("🎯 **Training variety opportunity** - Consider adding different workout types like tempo runs, intervals, or long runs.")
-        elif 'Race' in workout_types.index:
-            race_count = workout_types['Race']
-            if race_count >= 2:
-                insights.append("🏆 **Active racer** - Great job participating in races! They're excellent for motivation and performance testing.")
+        elif workout_types.get('Race', 0) >= 2:
+            insights.append("🏆 **Active racer** - Great job participating in races! They're excellent for motivation and performance testing.")
         
-        if 'Long Run' in workout_types.index:
+        if 'Long Run' in workout_types:
             long_run_percentage = (workout_types['Long Run'] / total_runs) * 100
             if long_run_percentage > 30:
                 insights.append("🏃‍♂️ **Long run focused** - Excellent endurance building! Make sure to include some speed work for balanced training.")
@@ -154,6 +255,35 @@ def generate_insights(df_filtered, time_period):
     return insights
 
 
+def generate_insights(df_filtered, time_period):
+    """Generate personalized insights and recommendations based on running data"""
+    if len(df_filtered) < MIN_RUNS:
+        return []
+    return evaluate_insights(extract_insight_features(df_filtered)[0], time_period)
+
+
+def generate_period_insights(df, today, periods=INSIGHT_PERIODS, cache_key=None):
+    """
+    Insights of every time period at once.
+
+    Args:
+        df: Preprocessed activity frame (full history)
+        today: Reference date; period N covers the activities from today - N days
+        periods: Time periods (None = all time)
+        cache_key: Data version key; None disables caching
+
+    Returns:
+        Dict of time period -> list of insights
+    """
+    def build():
+        features = extract_insight_features(df, [get_period_start(period, today) for period in periods])
+        return {period: evaluate_insights(values, period) for period, values in zip(periods, features)}
+
+    if cache_key is None:
+        return build()
+    return _insights_cache.get_or_compute((cache_key, tuple(periods)), build)
+
+
 def get_no_insights_message():
     """Return message when there's insufficient data for insights"""
     return """
@@ -2,7 +2,7 @@
 Metric cards and trend indicators for running statistics
 """
 import pandas as pd
-from .data_processing import format_time_from_minutes, format_pace_to_min_sec, format_number_with_commas, detect_workout_type
+from .data_processing import format_time_from_minutes, format_pace_to_min_sec, format_number_with_commas, get_workout_types
 
 
 def get_trend_indicator(change):
@@ -66,7 +66,7 @@ def create_training_diversity_card(df_filtered):
     
     # Calculate workout type diversity
     df_with_types = df_filtered.copy()
-    df_with_types['workout_type'] = df_with_types.apply(detect_workout_type, axis=1)
+    df_with_types['workout_type'] = get_workout_types(df_with_types)
     workout_types = df_with_types['workout_type'].value_counts()
     
     # Calculate diversity score (number of different workout types)
@@ -0,0 +1,153 @@
+"""
+Prefix-sum index for the key metrics of any date window.
+
+The activities are sorted by date once per data version, with cumulative sums
+of distance, moving time, elevation, pace and HR (and non-empty counts for the
+averages). The metrics of a [start, end) window then come from two binary
+searches and a few subtractions, whatever the length of the history. The
+training load needs the slowest pace in the window, which comes from a sparse
+table of range maxima.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.activity_frame import data_version
+from utils.lru_cache import BoundedLRUCache
+
+# Summed metric -> column
+SUM_COLUMNS = {
+    'distance': 'Distance (km)',
+    'time': 'moving_time_minutes',
+    'elevation': 'Elevation Gain',
+    'pace': 'pace_minutes',
+    'hr': 'Avg HR',
+}
+DEFAULT_INTENSITY = 0.7          # training load intensity of runs without a pace
+PERIOD_INDEX_CACHE_SIZE = 8
+
+_index_cache = BoundedLRUCache(maxsize=PERIOD_INDEX_CACHE_SIZE)
+
+
+def _prefix(values):
+    return np.concatenate(([0.0], np.cumsum(values, dtype='float64')))
+
+
+def _column(df, col, order):
+    if col not in df.columns:
+        return np.full(len(order), np.nan)
+    return pd.to_numeric(df[col], errors='coerce').to_numpy(dtype='float64')[order]
+
+
+def _max_table(values):
+    """Sparse table: row k holds the max of every window of 2**k values."""
+    table = [values]
+    width = 1
+    while width * 2 <= len(values):
+        previous = table[-1]
+        table.append(np.maximum(previous[:-width], previous[width:]))
+        width *= 2
+    return table
+
+
+def build_period_index(df):
+    """
+    Build the period index of a preprocessed activity frame.
+
+    Args:
+        df: Activity frame with a datetime 'Date' column
+
+    Returns:
+        Dict with the sorted dates, prefix sums and the pace max table
+    """
+    dates = pd.to_datetime(df['Date']).to_numpy(dtype='datetime64[ns]')
+    # NaT sorts last; undated activities only count towards all-time metrics
+    order = np.argsort(dates, kind='stable')
+    dates = dates[order]
+    dated = int((~np.isnat(dates)).sum())
+
+    prefix = {}
+    values = {}
+    for name, col in SUM_COLUMNS.items():
+        values[name] = _column(df, col, order)
+        present = ~np.isnan(values[name])
+        prefix[f'{name}_sum'] = _prefix(np.where(present, values[name], 0.0))
+        prefix[f'{name}_count'] = _prefix(present)
+
+    # Training load = sum(distance * (1.5 - pace / slowest pace)), 0.7 * distance without a pace
+    distance = np.nan_to_num(values['distance'])
+    has_pace = ~np.isnan(values['pace'])
+    prefix['paced_distance'] = _prefix(np.where(has_pace, distance, 0.0))
+    prefix['distance_x_pace'] = _prefix(np.where(has_pace, distance * np.nan_to_num(values['pace']), 0.0))
+    prefix['unpaced_distance'] = _prefix(np.where(has_pace, 0.0, distance))
+
+    return {
+        'dates': dates[:dated],
+        'size': len(order),
+        'prefix': prefix,
+        'pace_max': _max_table(np.where(has_pace, values['pace'], -np.inf)),
+    }
+
+
+def get_period_index(df, version=None):
+    """Period index of `df`, built once per data version (a hash of the indexed columns unless `version` is given)."""
+    key = version if version is not None else data_version(df, ['Date'] + list(SUM_COLUMNS.values()))
+    return _index_cache.get_or_compute(key, lambda: build_period_index(df))
+
+
+def _range_max(table, start, end):
+    level = int(end - start).bit_length() - 1
+    return max(table[level][start], table[level][end - (1 << level)])
+
+
+def _window_sum(index, name, lo, hi):
+    prefix = index['prefix'][name]
+    return prefix[hi] - prefix[lo]
+
+
+def _window_mean(index, name, lo, hi):
+    count = _window_sum(index, f'{name}_count', lo, hi)
+    return _window_sum(index, f'{name}_sum', lo, hi) / count if count else np.nan
+
+
+def _training_load(index, lo, hi):
+    """calculate_training_load_score() of the window, from prefix sums and the slowest pace."""
+    paced = _window_sum(index, 'paced_distance', lo, hi)
+    unpaced = _window_sum(index, 'unpaced_distance', lo, hi)
+    slowest = _range_max(index['pace_max'], lo, hi)
+    if not np.isfinite(slowest) or slowest == 0:
+        return DEFAULT_INTENSITY * (paced + unpaced)
+    return 1.5 * paced - _window_sum(index, 'distance_x_pace', lo, hi) / slowest + DEFAULT_INTENSITY * unpaced
+
+
+def window_metrics(index, start=None, end=None):
+    """
+    Key metrics of the activities dated in [start, end).
+
+    Args:
+        index: Result of build_period_index()
+        start: First date included (None for no lower bound)
+        end: First date excluded (None for no upper bound)
+
+    Returns:
+        Dict with total_distance, total_runs, total_time, avg_distance,
+        avg_pace_minutes, avg_hr, total_elevation and training_load; with no
+        bounds at all, undated activities are included too
+    """
+    dates = index['dates']
+    if start is None and end is None:
+        lo, hi = 0, index['size']
+    else:
+        lo = 0 if start is None else int(dates.searchsorted(np.datetime64(pd.Timestamp(start), 'ns')))
+        hi = len(dates) if end is None else int(dates.searchsorted(np.datetime64(pd.Timestamp(end), 'ns')))
+        hi = max(lo, hi)
+
+    return {
+        'total_distance': _window_sum(index, 'distance_sum', lo, hi),
+        'total_runs': hi - lo,
+        'total_time': _window_sum(index, 'time_sum', lo, hi),
+        'avg_distance': _window_mean(index, 'distance', lo, hi),
+        'avg_pace_minutes': _window_mean(index, 'pace', lo, hi),
+        'avg_hr': _window_mean(index, 'hr', lo, hi),
+        'total_elevation': _window_sum(index, 'elevation_sum', lo, hi),
+        'training_load': _training_load(index, lo, hi) if hi > lo else 0,
+    }
@@ -0,0 +1,226 @@
+"""
+Precomputed time rollups for the performance trend charts.
+
+A rollup cube holds sum, count, min and max (mean = sum / count) of every trend
+metric at daily, weekly, monthly and yearly granularity. It is built once per
+data version from the full preprocessed frame. The charts slice it instead of
+regrouping raw rows, so switching aggregation or time period is O(buckets).
+
+Daily buckets are the exact 'Date' values, as `groupby('Date')` produced
+them. A time period that starts inside a week, month or year gets that first
+partial bucket recombined from the daily buckets it covers, so every slice
+equals grouping the filtered rows directly.
+
+The yearly cumulative chart gets the same treatment: a (year x day of year)
+pivot of cumulative distance from one groupby and one cumsum, cached by data
+version and today's date.
+"""
+import calendar
+
+import numpy as np
+import pandas as pd
+
+from utils.activity_frame import data_version
+from utils.lru_cache import BoundedLRUCache
+
+GRANULARITIES = ['daily', 'weekly', 'monthly', 'yearly']
+ROLLUP_CACHE_SIZE = 8
+
+
+def _valid_pace(values):
+    return values <= 12             # unrealistic paces are dropped
+
+
+def _valid_cadence(values):
+    return (values >= 120) & (values <= 220)
+
+
+def _valid_elevation(values):
+    return values >= 0
+
+
+# Metric column -> filter of realistic values (NaN is always dropped)
+TREND_METRICS = {
+    'Distance (km)': None,
+    'pace_minutes': _valid_pace,
+    'Avg HR': None,
+    'Cadence': _valid_cadence,
+    'Elevation Gain': _valid_elevation,
+    'moving_time_minutes': None,
+}
+
+_cube_cache = BoundedLRUCache(maxsize=ROLLUP_CACHE_SIZE)
+_yearly_cache = BoundedLRUCache(maxsize=ROLLUP_CACHE_SIZE)
+
+
+def _bucket_keys(dates, granularity):
+    """Bucket of every date: the period start, or the year for yearly buckets."""
+    if granularity == 'weekly':
+        return dates.to_period('W').start_time
+    if granularity == 'monthly':
+        return dates.to_period('M').start_time
+    return dates.year
+
+
+def _metric_values(df, metrics):
+    """Metric columns as float64, NaN where a value is missing or filtered out."""
+    values = {}
+    for metric, is_valid in metrics.items():
+        if metric not in df.columns:
+            continue
+        column = pd.to_numeric(df[metric], errors='coerce').astype('float64')
+        if is_valid is not None:
+            column = column.where(is_valid(column))
+        values[metric] = column
+    return pd.DataFrame(values, index=df.index)
+
+
+def _reduce_at(stats, starts):
+    """Combine consecutive runs of finer buckets beginning at `starts`: sums and counts add up, min of mins, max of maxes."""
+    return {
+        'sum': np.add.reduceat(stats['sum'], starts),
+        'count': np.add.reduceat(stats['count'], starts),
+        'min': np.fmin.reduceat(stats['min'], starts),
+        'max': np.fmax.reduceat(stats['max'], starts),
+    }
+
+
+def build_rollup_cube(df, metrics=TREND_METRICS):
+    """
+    Build the rollup cube of a preprocessed activity frame.
+
+    Args:
+        df: Activity frame with a datetime 'Date' column and the trend metric columns
+        metrics: Metric column -> filter of valid values (None keeps every number)
+
+    Returns:
+        Dict per granularity with the sorted bucket 'keys', the 'bucket' of
+        every daily bucket (coarser granularities only) and per-metric arrays
+        of sum, count, min and max
+    """
+    values = _metric_values(df, metrics)
+    dates = pd.DatetimeIndex(df['Date'])
+    valid = ~dates.isna()
+    grouped = values[valid].groupby(dates[valid], sort=True)
+    daily_stats = {'sum': grouped.sum(), 'count': grouped.count(), 'min': grouped.min(), 'max': grouped.max()}
+    daily_keys = daily_stats['sum'].index
+
+    daily = {'keys': daily_keys}
+    for metric in values.columns:
+        daily[metric] = {stat: frame[metric].to_numpy(dtype='float64') for stat, frame in daily_stats.items()}
+    cube = {'daily': daily}
+
+    for granularity in GRANULARITIES[1:]:
+        codes, keys = pd.factorize(_bucket_keys(daily_keys, granularity), sort=True)
+        # Daily keys are sorted, so each coarser bucket is one run of days
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=int)
+        level = {'keys': keys, 'bucket': codes}
+        for metric in values.columns:
+            level[metric] = _reduce_at(daily[metric], starts) if len(starts) else daily[metric]
+        cube[granularity] = level
+    return cube
+
+
+def get_rollup_cube(df, version=None):
+    """Rollup cube of `df`, built once per data version (a hash of the rolled-up columns unless `version` is given)."""
+    key = version if version is not None else data_version(df, ['Date'] + list(TREND_METRICS))
+    return _cube_cache.get_or_compute(key, lambda: build_rollup_cube(df))
+
+
+def slice_rollup(cube, granularity, metric, agg_method='sum', since=None):
+    """
+    Aggregated metric series from a rollup cube.
+
+    Args:
+        cube: Result of build_rollup_cube()
+        granularity: 'daily', 'weekly', 'monthly' or 'yearly'
+        metric: One of TREND_METRICS
+        agg_method: 'sum' or 'mean' ('count', 'min' and 'max' also work)
+        since: Only include activities on or after this date (None for all time)
+
+    Returns:
+        Series indexed by bucket (sorted), without buckets that have no valid values
+    """
+    level = cube[granularity]
+    if metric not in level:
+        return pd.Series(dtype='float64')
+    keys, stats = level['keys'], level[metric]
+
+    if since is not None:
+        first_day = cube['daily']['keys'].searchsorted(pd.Timestamp(since))
+        if granularity == 'daily':
+            keys, stats = keys[first_day:], {stat: values[first_day:] for stat, values in stats.items()}
+        elif first_day == len(level['bucket']):
+            keys, stats = keys[:0], {stat: values[:0] for stat, values in stats.items()}
+        else:
+            # Buckets after the one containing `since` are whole; that one is rebuilt from its days on or after `since`
+            first_bucket = level['bucket'][first_day]
+            last_day = level['bucket'].searchsorted(first_bucket, side='right')
+            days = {stat: values[first_day:last_day] for stat, values in cube['daily'][metric].items()}
+            partial = _reduce_at(days, [0])
+            keys = keys[first_bucket:]
+            stats = {stat: np.r_[partial[stat], values[first_bucket + 1:]] for stat, values in stats.items()}
+
+    present = stats['count'] > 0
+    if agg_method == 'mean':
+        values = stats['sum'][present] / stats['count'][present]
+    else:
+        values = stats[agg_method][present]
+    return pd.Series(values, index=keys[present])
+
+
+def _days_in_year(year):
+    return 366 if calendar.isleap(year) else 365
+
+
+def build_yearly_cumulative(df, today, goal_km=None):
+    """
+    Cumulative distance by day of year for every year, plus the current year's projections.
+
+    Args:
+        df: Activity frame with 'Date' and 'Distance (km)'
+        today: Reference date; splits the current year into actual and projected
+        goal_km: Optional distance goal for the current year
+
+    Returns:
+        Dict with 'years' (sorted), 'cumulative' (years x 366 array, NaN past the
+        last day of a year), 'today_day', and for the current year 'projection'
+        (days, km at the year-to-date pace) and 'goal' (days, km at the pace
+        needed from today to reach goal_km, and that pace in km/week); None
+        when they do not apply
+    """
+    dates = pd.to_datetime(df['Date'])
+    dated = dates.notna()
+    distance = pd.to_numeric(df['Distance (km)'], errors='coerce')[dated]
+    dates = dates[dated]
+
+    # One groupby into a (year x day of year) grid, then one cumsum along the days
+    daily = distance.groupby([dates.dt.year.rename('year'), dates.dt.dayofyear.rename('day')]).sum()
+    grid = daily.unstack(fill_value=0).reindex(columns=range(1, 367), fill_value=0)
+    years = grid.index.to_numpy()
+    cumulative = grid.to_numpy(dtype='float64').cumsum(axis=1)
+    cumulative[[_days_in_year(year) == 365 for year in years], 365] = np.nan
+
+    today = pd.Timestamp(today)
+    today_day = today.dayofyear
+    result = {'years': years, 'cumulative': cumulative, 'today_day': today_day, 'projection': None, 'goal': None}
+    if today.year not in years:
+        return result
+
+    row = cumulative[list(years).index(today.year)]
+    done = row[today_day - 1]
+    days = np.arange(today_day, _days_in_year(today.year) + 1)
+    if len(days) > 1:
+        result['projection'] = (days, done + done / today_day * (days - today_day))
+        if goal_km:
+            per_day = max(goal_km - done, 0) / (days[-1] - today_day)
+            result['goal'] = (days, done + per_day * (days - today_day), per_day * 7)
+    return result
+
+
+def get_yearly_cumulative(df, today, goal_km=None, version=None):
+    """build_yearly_cumulative(), cached by data version, today's date and goal."""
+    if version is None:
+        version = data_version(df, ['Date', 'Distance (km)'])
+    key = (version, pd.Timestamp(today).date(), goal_km)
+    return _yearly_cache.get_or_compute(key, lambda: build_yearly_cumulative(df, today, goal_km))